@@ -1,103 +1,185 @@
 """
 Authentication management
 """
+import base64
 import bcrypt
-import jwt
+import hashlib
+import hmac
+import json
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Tuple
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from sqlalchemy import bindparam, lambda_stmt, select
 from sqlalchemy.orm import Session
 
-from app.core.database import User, SessionLocal, init_database
+from app.core.database import User, SessionScoped, init_database
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# bcrypt releases the GIL while hashing, so threads verify independent
+# hashes in parallel. One pool serves every AuthManager.
+VERIFY_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+_verify_pool = ThreadPoolExecutor(max_workers=VERIFY_WORKERS, thread_name_prefix="bcrypt-verify")
+
+# Token lifetime in seconds; PyJWT accepts an integer 'exp' claim
+TOKEN_EXPIRE_SECONDS = settings.TOKEN_EXPIRE_HOURS * 3600
+
+# last_login is informational; skip the UPDATE if it was written recently
+LAST_LOGIN_WRITE_INTERVAL = 60  # seconds
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url, as used by JWT"""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Tokens are always HS256 with the same key, so the header segment and the
+# keyed HMAC state are built once and copied per token
+_JWT_HEADER_B64 = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+_JWT_HMAC = hmac.new(settings.SECRET_KEY.encode('utf-8'), digestmod=hashlib.sha256)
+
+# bcrypt's radix-64 alphabet; bit order matches standard base64
+_BCRYPT_B64 = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/",
+    b"./ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+)
+
+
+class _SaltPool:
+    """Hands out bcrypt salts sliced from one larger os.urandom() read"""
+
+    BUFFER_SIZE = 4096
+    SALT_SIZE = 16
+
+    def __init__(self):
+        self._reset()
+        # A forked child must not hand out the parent's remaining bytes
+        os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._pos = 0
+
+    def gensalt(self, rounds: int = 12) -> bytes:
+        """Return a '$2b$' salt equivalent to bcrypt.gensalt(rounds)"""
+        with self._lock:
+            if self._pos + self.SALT_SIZE > len(self._buffer):
+                self._buffer = os.urandom(self.BUFFER_SIZE)
+                self._pos = 0
+            raw = self._buffer[self._pos:self._pos + self.SALT_SIZE]
+            self._pos += self.SALT_SIZE
+
+        encoded = base64.b64encode(raw)[:22].translate(_BCRYPT_B64)
+        return b"$2b$%02d$%s" % (rounds, encoded)
+
+
+_salt_pool = _SaltPool()
+
+# User lookup by name; lambda_stmt caches the compiled SQL across calls
+_USER_BY_USERNAME = lambda_stmt(
+    lambda: select(User).where(User.username == bindparam("username"))
+)
+
 class AuthManager:
     """Handles user authentication"""
+
+    # Once a user exists the platform can never be in first-boot state again
+    _users_exist = False
     
     def __init__(self):
         init_database()
     
     def hash_password(self, password: str) -> str:
         """Hash a password"""
-        salt = bcrypt.gensalt()
+        salt = _salt_pool.gensalt()
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
     
     def verify_password(self, password: str, password_hash: str) -> bool:
         """Verify a password against its hash"""
         return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
-    
+
+    def verify_password_batch(self, items: List[Tuple[str, str]]) -> List[bool]:
+        """Verify several (password, hash) pairs, preserving input order"""
+        if len(items) < 2:
+            return [self.verify_password(pw, pw_hash) for pw, pw_hash in items]
+
+        return list(_verify_pool.map(lambda item: self.verify_password(*item), items))
+
     def create_token(self, user_id: int) -> str:
         """Create JWT token"""
         payload = {
             'user_id': user_id,
-            'exp': datetime.utcnow() + timedelta(hours=settings.TOKEN_EXPIRE_HOURS)
+            'exp': int(time.time()) + TOKEN_EXPIRE_SECONDS
         }
-        return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256')
+        signing_input = (
+            _JWT_HEADER_B64 + b"." +
+            _b64url(json.dumps(payload, separators=(",", ":")).encode('utf-8'))
+        )
+        signature = _JWT_HMAC.copy()
+        signature.update(signing_input)
+        return (signing_input + b"." + _b64url(signature.digest())).decode('ascii')
     
     def register(self, username: str, password: str) -> Tuple[bool, str]:
         """Register a new user"""
         logger.info(f"Registration attempt for username: {username}")
-        db = SessionLocal()
-
-        try:
-            # Check if user exists
-            existing_user = db.query(User).filter(User.username == username).first()
-            if existing_user:
-                logger.warning(f"Registration failed: Username '{username}' already exists")
-                return False, "Username already exists"
-
-            # Create user
-            password_hash = self.hash_password(password)
-            user = User(username=username, password_hash=password_hash)
-            db.add(user)
-            db.commit()
-
-            logger.info(f"User '{username}' registered successfully")
-            return True, "User registered successfully"
-
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Registration failed for '{username}': {e}")
-            return False, f"Registration failed: {str(e)}"
-        finally:
-            db.close()
+
+        with SessionScoped() as db:
+            try:
+                # Check if user exists
+                existing_user = db.execute(
+                    _USER_BY_USERNAME, {"username": username}
+                ).scalar_one_or_none()
+                if existing_user:
+                    logger.warning(f"Registration failed: Username '{username}' already exists")
+                    return False, "Username already exists"
+
+                # Create user
+                password_hash = self.hash_password(password)
+                user = User(username=username, password_hash=password_hash)
+                db.add(user)
+                db.commit()
+                AuthManager._users_exist = True
+
+                logger.info(f"User '{username}' registered successfully")
+                return True, "User registered successfully"
+
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Registration failed for '{username}': {e}")
+                return False, f"Registration failed: {str(e)}"
     
     def authenticate(self, username: str, password: str) -> Optional[User]:
         """Authenticate a user"""
         logger.info(f"Authentication attempt for username: {username}")
-        db = SessionLocal()
 
-        try:
-            user = db.query(User).filter(User.username == username).first()
+        with SessionScoped() as db:
+            user = db.execute(_USER_BY_USERNAME, {"username": username}).scalar_one_or_none()
 
             if user and self.verify_password(password, user.password_hash):
-                # Update last login
-                user.last_login = datetime.utcnow()
-                db.commit()
-
-                # Eagerly load attributes needed by GUI before session closes
-                # This prevents DetachedInstanceError when accessing attributes later
-                _ = user.id
-                _ = user.username
-                _ = user.created_at
-                _ = user.last_login
+                # Update last login; the scoped session does not expire
+                # attributes on commit, so the returned user stays usable
+                now = datetime.now(timezone.utc).replace(tzinfo=None)
+                if (not user.last_login or
+                        (now - user.last_login).total_seconds() > LAST_LOGIN_WRITE_INTERVAL):
+                    user.last_login = now
+                    db.commit()
 
                 logger.info(f"Authentication successful for user: {username} (id={user.id})")
                 return user
 
             logger.warning(f"Authentication failed for username: {username}")
             return None
-
-        finally:
-            db.close()
     
     def is_first_boot(self) -> bool:
         """Check if this is the first boot (no users exist)"""
-        db = SessionLocal()
-        try:
-            user_count = db.query(User).count()
-            return user_count == 0
-        finally:
-            db.close()
\ No newline at end of file
+        if AuthManager._users_exist:
+            return False
+
+        with SessionScoped() as db:
+            AuthManager._users_exist = db.query(db.query(User.id).exists()).scalar()
+        return not AuthManager._users_exist
\ No newline at end of file
@@ -1,12 +1,21 @@
 """
 Database models and initialization
 """
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Table
+from sqlalchemy import (
+    create_engine, text, Column, Integer, String, DateTime, Text, Boolean, ForeignKey, Table, Index,
+    bindparam, inspect, select, update
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, scoped_session, defer
 from datetime import datetime
+import logging
+
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 Base = declarative_base()
 
 # Association tables for many-to-many relationships
@@ -34,8 +43,8 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_login = Column(DateTime)
     
-    # Relationships
-    scans = relationship("Scan", back_populates="user")
+    # Relationships; load explicitly with selectinload(User.scans)
+    scans = relationship("Scan", back_populates="user", lazy="raise_on_sql")
 
 class Scan(Base):
     """Scan/Workflow execution model"""
@@ -50,6 +59,11 @@ class Scan(Base):
     completed_at = Column(DateTime)
     results = Column(Text)  # JSON string
     report_path = Column(String(500))
+
+    # Dashboard history pages through a user's scans newest first
+    __table_args__ = (
+        Index("ix_scans_user_started", user_id, started_at.desc()),
+    )
     
     # Relationships
     user = relationship("User", back_populates="scans")
@@ -75,6 +89,9 @@ class Task(Base):
 class Subdomain(Base):
     """Subdomain model - tracks discovered subdomains"""
     __tablename__ = "subdomains"
+    __table_args__ = (
+        Index("ix_subdomains_scan_name", "scan_id", "name", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     scan_id = Column(Integer, ForeignKey("scans.id"))
@@ -90,6 +107,9 @@ class Subdomain(Base):
 class IP(Base):
     """IP address model - tracks IP addresses"""
     __tablename__ = "ips"
+    __table_args__ = (
+        Index("ix_ips_scan_address", "scan_id", "address", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     scan_id = Column(Integer, ForeignKey("scans.id"))
@@ -104,6 +124,9 @@ class IP(Base):
 class Port(Base):
     """Port model - tracks open ports on IPs"""
     __tablename__ = "ports"
+    __table_args__ = (
+        Index("ix_ports_ip_port_protocol", "ip_id", "port_number", "protocol", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     ip_id = Column(Integer, ForeignKey("ips.id"))
@@ -122,6 +145,9 @@ class Port(Base):
 class ASN(Base):
     """ASN model - tracks Autonomous System Numbers"""
     __tablename__ = "asns"
+    __table_args__ = (
+        Index("ix_asns_scan_asn", "scan_id", "asn_number", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     scan_id = Column(Integer, ForeignKey("scans.id"))
@@ -134,13 +160,98 @@ class ASN(Base):
     subdomains = relationship("Subdomain", secondary=subdomain_asn_association, back_populates="asns")
 
 # Create engine and session
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+if settings.DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(settings.DATABASE_URL)
+else:
+    # LIFO keeps a few hot connections busy instead of rotating through the
+    # whole pool; pre-ping/recycle drop connections the server closed
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_use_lifo=True,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        pool_size=10,
+        max_overflow=20
+    )
+# Committed objects stay loaded so callers can keep reading them without
+# another SELECT
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+# Thread-local session for short, frequent calls (authentication). Objects
+# stay loaded after commit so they can be returned to callers.
+SessionScoped = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
 
 def init_database():
     """Initialize database"""
     Base.metadata.create_all(bind=engine)
 
+    # create_all() skips tables that already exist, so databases created
+    # before the indexes were added get them here
+    for index in Scan.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    # Migration relies on these to skip rows that already exist. Older
+    # databases may hold duplicates, which must go before the index builds.
+    # Ports come last: merging duplicate IPs can leave duplicate ports.
+    existing = {
+        table.name: {index["name"] for index in inspect(engine).get_indexes(table.name)}
+        for table in (Subdomain.__table__, IP.__table__, ASN.__table__, Port.__table__)
+    }
+    for model in (Subdomain, IP, ASN, Port):
+        table = model.__table__
+        for index in table.indexes:
+            if index.unique and index.name not in existing[table.name]:
+                with engine.begin() as conn:
+                    _merge_duplicate_rows(conn, table, list(index.columns))
+                index.create(bind=engine)
+
+def _merge_duplicate_rows(conn, table, key_columns):
+    """Delete rows repeating another row's key, keeping the lowest id
+
+    Rows in other tables that reference a deleted row are pointed at the
+    kept one. Links that would then repeat an existing link are dropped.
+    """
+    keep_ids = {}
+    remap = []
+    for row_id, *key in conn.execute(select(table.c.id, *key_columns).order_by(table.c.id)):
+        keep_id = keep_ids.setdefault(tuple(key), row_id)
+        if keep_id != row_id:
+            remap.append({"dup_id": row_id, "keep_id": keep_id})
+    if not remap:
+        return
+
+    for referencing in Base.metadata.tables.values():
+        for fk in referencing.foreign_keys:
+            if fk.column is not table.c.id:
+                continue
+            repoint = (
+                update(referencing)
+                .where(fk.parent == bindparam("dup_id"))
+                .values({fk.parent.name: bindparam("keep_id")})
+            )
+            if len(referencing.primary_key.columns):
+                conn.execute(repoint, remap)
+                continue
+
+            # Association tables have no key to dedupe on later, so drop a
+            # link before repointing it onto one that already exists
+            linked = referencing.alias()
+            same_link = select(linked).where(
+                linked.c[fk.parent.name] == bindparam("keep_id"),
+                *(linked.c[column.name] == column
+                  for column in referencing.columns if column is not fk.parent)
+            )
+            drop = referencing.delete().where(
+                fk.parent == bindparam("dup_id"), same_link.exists()
+            )
+            # One pair at a time: a later duplicate must see earlier repoints
+            for pair in remap:
+                conn.execute(drop, pair)
+                conn.execute(repoint, pair)
+    conn.execute(table.delete().where(table.c.id == bindparam("dup_id")), remap)
+
+    logger.info("Merged %d duplicate rows in %s", len(remap), table.name)
+
 def get_db():
     """Get database session"""
     db = SessionLocal()
@@ -160,14 +271,20 @@ def migrate_existing_scans():
     db = SessionLocal()
 
     try:
-        # Get all scans with results
-        scans = db.query(Scan).filter(Scan.results.isnot(None)).all()
-
+        # Stream scans with results in batches; the results blob itself is
+        # only read on dialects without JSON functions
+        scans = (
+            db.query(Scan)
+            .options(defer(Scan.results))
+            .filter(Scan.results.isnot(None))
+            .yield_per(50)
+        )
+
+        # Each scan runs in its own savepoint so a failure only discards that
+        # scan; committing mid-iteration would close the streaming cursor
         for scan in scans:
+            savepoint = db.begin_nested()
             try:
-                # Parse results JSON
-                results = json.loads(scan.results) if isinstance(scan.results, str) else scan.results
-
                 # Also try to read from subdomains.json file if it exists
                 domain = scan.target.replace("http://", "").replace("https://", "").split("/")[0].split(":")[0]
                 subdomains_file = Path("data/scans") / domain / "final" / "subdomains.json"
@@ -179,27 +296,22 @@ def migrate_existing_scans():
                     with open(subdomains_file, 'r') as f:
                         subdomain_data = json.load(f)
                 else:
-                    # Fallback to parsing from task results
-                    for task_id, task_result in results.items():
-                        if isinstance(task_result, dict) and "output" in task_result:
-                            output = task_result["output"]
-                            if "subdomains" in output:
-                                subdomain_data.extend(output["subdomains"])
-                            elif "merged_data" in output:
-                                subdomain_data.extend(output["merged_data"])
+                    # Fallback to extracting from task results
+                    subdomain_data = _subdomain_items_from_results(db, scan)
 
                 # Process subdomain data
                 if subdomain_data:
                     _process_subdomain_data(db, scan.id, subdomain_data)
 
-                db.commit()
+                savepoint.commit()
                 print(f"Migrated scan {scan.id}: {scan.workflow_name} - {scan.target}")
 
             except Exception as e:
                 print(f"Error migrating scan {scan.id}: {e}")
-                db.rollback()
+                savepoint.rollback()
                 continue
 
+        db.commit()
         print("Migration completed successfully")
 
     except Exception as e:
@@ -208,8 +320,97 @@ def migrate_existing_scans():
     finally:
         db.close()
 
+# Subdomain entries from each task's output.subdomains (or merged_data),
+# extracted by the database so the full results blob is never loaded
+_SUBDOMAIN_ITEMS_SQL = {
+    "sqlite": text("""
+        SELECT item.value
+        FROM scans,
+             json_each(scans.results) AS task,
+             json_each(
+                 CASE
+                     WHEN task.type != 'object' THEN '[]'
+                     WHEN json_type(task.value, '$.output.subdomains') = 'array'
+                         THEN json_extract(task.value, '$.output.subdomains')
+                     WHEN json_type(task.value, '$.output.merged_data') = 'array'
+                         THEN json_extract(task.value, '$.output.merged_data')
+                     ELSE '[]'
+                 END
+             ) AS item
+        WHERE scans.id = :scan_id AND item.type = 'object'
+    """),
+    "postgresql": text("""
+        SELECT item.value::text
+        FROM scans,
+             jsonb_each(scans.results::jsonb) AS task,
+             jsonb_array_elements(
+                 CASE
+                     WHEN jsonb_typeof(task.value -> 'output' -> 'subdomains') = 'array'
+                         THEN task.value -> 'output' -> 'subdomains'
+                     WHEN jsonb_typeof(task.value -> 'output' -> 'merged_data') = 'array'
+                         THEN task.value -> 'output' -> 'merged_data'
+                     ELSE '[]'::jsonb
+                 END
+             ) AS item
+        WHERE scans.id = :scan_id AND jsonb_typeof(item.value) = 'object'
+    """),
+}
+
+def _subdomain_items_from_results(db, scan):
+    """Return subdomain dicts recorded in a scan's task results"""
+    import json
+
+    stmt = _SUBDOMAIN_ITEMS_SQL.get(db.get_bind().dialect.name)
+    if stmt is not None:
+        return [json.loads(value) for (value,) in db.execute(stmt, {"scan_id": scan.id})]
+
+    # Other databases: parse the whole blob in Python
+    results = json.loads(scan.results) if isinstance(scan.results, str) else scan.results
+    subdomain_data = []
+    for task_id, task_result in results.items():
+        if isinstance(task_result, dict) and "output" in task_result:
+            output = task_result["output"]
+            if "subdomains" in output:
+                subdomain_data.extend(output["subdomains"])
+            elif "merged_data" in output:
+                subdomain_data.extend(output["merged_data"])
+    return subdomain_data
+
+# Dialects with INSERT ... ON CONFLICT DO NOTHING
+_CONFLICT_INSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+def _insert_ignore(db, model, rows):
+    """Bulk INSERT rows, skipping any that collide with a unique index"""
+    if not rows:
+        return
+    insert = _CONFLICT_INSERTS.get(db.get_bind().dialect.name)
+    if insert is not None:
+        db.execute(insert(model.__table__).on_conflict_do_nothing(), rows)
+        return
+
+    # Other databases: drop rows whose key is already stored
+    index = next(index for index in model.__table__.indexes if index.unique)
+    key_columns = list(index.columns)
+    first = key_columns[0]
+    stored = {
+        tuple(key) for key in db.execute(
+            select(*key_columns).where(first.in_({row[first.name] for row in rows}))
+        )
+    }
+    rows = [row for row in rows if tuple(row[column.name] for column in key_columns) not in stored]
+    if rows:
+        db.execute(model.__table__.insert(), rows)
+
 def _process_subdomain_data(db, scan_id, subdomain_data):
     """Helper function to process subdomain data and populate tables"""
+    # Normalize input and collect one row per unique subdomain, IP and ASN
+    items = []
+    subdomain_rows = {}
+    ip_rows = {}
+    asn_rows = {}
 
     for item in subdomain_data:
         if not isinstance(item, dict):
@@ -219,106 +420,102 @@ def _process_subdomain_data(db, scan_id, subdomain_data):
         if not subdomain_name:
             continue
 
-        # Check if subdomain already exists for this scan
-        existing_subdomain = db.query(Subdomain).filter(
-            Subdomain.scan_id == scan_id,
-            Subdomain.name == subdomain_name
-        ).first()
-
-        if existing_subdomain:
-            subdomain = existing_subdomain
-        else:
-            # Create subdomain
-            subdomain = Subdomain(
-                scan_id=scan_id,
-                name=subdomain_name,
-                source=item.get("source", "unknown")
-            )
-            db.add(subdomain)
-            db.flush()  # Get the subdomain ID
+        if subdomain_name not in subdomain_rows:
+            subdomain_rows[subdomain_name] = {
+                "scan_id": scan_id,
+                "name": subdomain_name,
+                "source": item.get("source", "unknown")
+            }
 
-        # Process IPs
         ips = item.get("ips", [])
         if not isinstance(ips, list):
             ips = [ips] if ips else []
-
+        ips = [ip_addr for ip_addr in ips if ip_addr]
         for ip_addr in ips:
-            if not ip_addr:
-                continue
+            ip_rows.setdefault(ip_addr, {"scan_id": scan_id, "address": ip_addr})
 
-            # Check if IP already exists for this scan
-            existing_ip = db.query(IP).filter(
-                IP.scan_id == scan_id,
-                IP.address == ip_addr
-            ).first()
-
-            if existing_ip:
-                ip_obj = existing_ip
-            else:
-                ip_obj = IP(
-                    scan_id=scan_id,
-                    address=ip_addr
-                )
-                db.add(ip_obj)
-                db.flush()
-
-            # Associate subdomain with IP
-            if ip_obj not in subdomain.ips:
-                subdomain.ips.append(ip_obj)
-
-        # Process ASNs
         asns = item.get("asns", [])
         if not isinstance(asns, list):
             asns = [asns] if asns else []
+        asns = [asn_num for asn_num in asns if asn_num]
+        for asn_num in asns:
+            asn_rows.setdefault(asn_num, {"scan_id": scan_id, "asn_number": asn_num})
+
+        items.append((subdomain_name, ips, asns, item.get("ports", {})))
+
+    # Rows already stored for this scan hit the unique composite indexes and
+    # are skipped by the database, so no existence SELECT is needed first
+    _insert_ignore(db, Subdomain, list(subdomain_rows.values()))
+    _insert_ignore(db, IP, list(ip_rows.values()))
+    _insert_ignore(db, ASN, list(asn_rows.values()))
+
+    subdomain_ids = dict(
+        db.query(Subdomain.name, Subdomain.id).filter(Subdomain.scan_id == scan_id)
+    )
+    ip_ids = dict(db.query(IP.address, IP.id).filter(IP.scan_id == scan_id))
+    asn_ids = dict(db.query(ASN.asn_number, ASN.id).filter(ASN.scan_id == scan_id))
+
+    # Association tables have no unique key, so load existing links once
+    sub_ip_pairs = set(
+        db.query(subdomain_ip_association.c.subdomain_id, subdomain_ip_association.c.ip_id)
+        .join(Subdomain, Subdomain.id == subdomain_ip_association.c.subdomain_id)
+        .filter(Subdomain.scan_id == scan_id)
+    )
+    sub_asn_pairs = set(
+        db.query(subdomain_asn_association.c.subdomain_id, subdomain_asn_association.c.asn_id)
+        .join(Subdomain, Subdomain.id == subdomain_asn_association.c.subdomain_id)
+        .filter(Subdomain.scan_id == scan_id)
+    )
+
+    new_ip_links = []
+    new_asn_links = []
+    for subdomain_name, ips, asns, _ in items:
+        subdomain_id = subdomain_ids[subdomain_name]
+
+        for ip_addr in ips:
+            pair = (subdomain_id, ip_ids[ip_addr])
+            if pair not in sub_ip_pairs:
+                sub_ip_pairs.add(pair)
+                new_ip_links.append({"subdomain_id": pair[0], "ip_id": pair[1]})
 
         for asn_num in asns:
-            if not asn_num:
-                continue
+            pair = (subdomain_id, asn_ids[asn_num])
+            if pair not in sub_asn_pairs:
+                sub_asn_pairs.add(pair)
+                new_asn_links.append({"subdomain_id": pair[0], "asn_id": pair[1]})
+
+    if new_ip_links:
+        db.execute(subdomain_ip_association.insert(), new_ip_links)
+    if new_asn_links:
+        db.execute(subdomain_asn_association.insert(), new_asn_links)
+
+    # Ports attach to every IP associated with the subdomain
+    ips_by_subdomain = {}
+    for subdomain_id, ip_id in sub_ip_pairs:
+        ips_by_subdomain.setdefault(subdomain_id, []).append(ip_id)
+
+    port_rows = {}
+    for subdomain_name, _, _, ports in items:
+        if not isinstance(ports, dict):
+            continue
 
-            # Check if ASN already exists for this scan
-            existing_asn = db.query(ASN).filter(
-                ASN.scan_id == scan_id,
-                ASN.asn_number == asn_num
-            ).first()
-
-            if existing_asn:
-                asn_obj = existing_asn
-            else:
-                asn_obj = ASN(
-                    scan_id=scan_id,
-                    asn_number=asn_num
-                )
-                db.add(asn_obj)
-                db.flush()
-
-            # Associate subdomain with ASN
-            if asn_obj not in subdomain.asns:
-                subdomain.asns.append(asn_obj)
-
-        # Process ports
-        ports = item.get("ports", {})
-        if isinstance(ports, dict):
-            for port_num, service_desc in ports.items():
-                # Find the IP object for this subdomain
-                for ip_obj in subdomain.ips:
-                    # Check if port already exists
-                    existing_port = db.query(Port).filter(
-                        Port.ip_id == ip_obj.id,
-                        Port.port_number == int(port_num)
-                    ).first()
-
-                    if not existing_port:
-                        # Parse service description
-                        service_parts = service_desc.split(" ", 1)
-                        service_name = service_parts[0] if service_parts else service_desc
-                        service_version = service_parts[1] if len(service_parts) > 1 else ""
-
-                        port_obj = Port(
-                            ip_id=ip_obj.id,
-                            scan_id=scan_id,
-                            port_number=int(port_num),
-                            service=service_name,
-                            version=service_version,
-                            state="open"
-                        )
-                        db.add(port_obj)
\ No newline at end of file
+        for port_num, service_desc in ports.items():
+            port_number = int(port_num)
+
+            # Parse service description
+            service_parts = service_desc.split(" ", 1)
+            service_name = service_parts[0] if service_parts else service_desc
+            service_version = service_parts[1] if len(service_parts) > 1 else ""
+
+            for ip_id in ips_by_subdomain.get(subdomain_ids[subdomain_name], ()):
+                port_rows.setdefault((ip_id, port_number), {
+                    "ip_id": ip_id,
+                    "scan_id": scan_id,
+                    "port_number": port_number,
+                    "protocol": "tcp",
+                    "service": service_name,
+                    "version": service_version,
+                    "state": "open"
+                })
+
+    _insert_ignore(db, Port, list(port_rows.values()))
@@ -1,10 +1,13 @@
 """
 Centralized logging configuration for the Offensive Security Platform
 """
+import atexit
+import functools
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 from app.core.config import settings
@@ -18,14 +21,18 @@ class ContextLogger(logging.LoggerAdapter):
 
     def process(self, msg, kwargs):
         """Add context to log message"""
-        # Merge extra context
-        if 'extra' in kwargs:
-            kwargs['extra'] = {**self.extra, **kwargs['extra']}
-        else:
-            kwargs['extra'] = self.extra
+        # Only merge when the call site passed its own extra fields
+        extra = kwargs.get('extra')
+        kwargs['extra'] = self.extra if extra is None else {**self.extra, **extra}
         return msg, kwargs
 
 
+@functools.lru_cache(maxsize=1024)
+def _cached_logger(name: str, context_items: frozenset) -> ContextLogger:
+    """Return a shared ContextLogger for a (name, context) pair"""
+    return ContextLogger(logging.getLogger(name), extra=dict(context_items))
+
+
 class LoggingConfig:
     """Centralized logging configuration"""
 
@@ -40,6 +47,12 @@ class LoggingConfig:
 
     DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
+    # Loggers whose records get their own log file, by name prefix
+    ROUTED_LOGGERS = ('workflows', 'tools')
+
+    # Background listeners that perform the actual handler I/O
+    _listeners: List[logging.handlers.QueueListener] = []
+
     @staticmethod
     def setup_logging(level: int = logging.INFO):
         """
@@ -71,14 +84,16 @@ class LoggingConfig:
         root_logger = logging.getLogger()
         root_logger.setLevel(level)
 
-        # Remove existing handlers
+        # Remove existing handlers and stop listeners from a previous call
         root_logger.handlers.clear()
+        for name in LoggingConfig.ROUTED_LOGGERS:
+            logging.getLogger(name).handlers.clear()
+        LoggingConfig.shutdown_logging()
 
         # Console handler (simple format)
         console_handler = logging.StreamHandler()
         console_handler.setLevel(level)
         console_handler.setFormatter(simple_formatter)
-        root_logger.addHandler(console_handler)
 
         # Platform log file (rotating, 10MB max, keep 5 backups)
         platform_log = settings.LOGS_DIR / "platform.log"
@@ -90,7 +105,6 @@ class LoggingConfig:
         )
         platform_handler.setLevel(level)
         platform_handler.setFormatter(simple_formatter)
-        root_logger.addHandler(platform_handler)
 
         # Workflow-specific log file (detailed format with context)
         workflow_log = settings.LOGS_DIR / "workflows.log"
@@ -102,8 +116,6 @@ class LoggingConfig:
         )
         workflow_handler.setLevel(logging.DEBUG)
         workflow_handler.setFormatter(detailed_formatter)
-        workflow_handler.addFilter(lambda record: hasattr(record, 'scan_id'))
-        root_logger.addHandler(workflow_handler)
 
         # Tool execution log file
         tools_log = settings.LOGS_DIR / "tools.log"
@@ -115,13 +127,42 @@ class LoggingConfig:
         )
         tools_handler.setLevel(logging.DEBUG)
         tools_handler.setFormatter(detailed_formatter)
-        tools_handler.addFilter(lambda record: getattr(record, 'tool', 'N/A') != 'N/A')
-        root_logger.addHandler(tools_handler)
+
+        # Callers only enqueue records; listener threads format and write
+        # them, so file writes and rollovers never block the logging thread.
+        # Workflow and tool records are routed by logger name and still
+        # propagate to the root handlers, so no per-record filter is needed.
+        LoggingConfig._attach_listener(root_logger, console_handler, platform_handler)
+        LoggingConfig._attach_listener(logging.getLogger('workflows'), workflow_handler)
+        LoggingConfig._attach_listener(logging.getLogger('tools'), tools_handler)
 
         # Log startup message
         logging.info(f"Logging initialized - Level: {logging.getLevelName(level)}")
         logging.info(f"Log directory: {settings.LOGS_DIR}")
 
+    @staticmethod
+    def _attach_listener(logger: logging.Logger, *handlers: logging.Handler):
+        """Queue the logger's records to a listener thread running handlers"""
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        listener.start()
+        LoggingConfig._listeners.append(listener)
+
+    @staticmethod
+    def shutdown_logging():
+        """Flush queued records and close handlers owned by the listeners"""
+        listeners = LoggingConfig._listeners
+        LoggingConfig._listeners = []
+
+        for listener in listeners:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
     @staticmethod
     def get_logger(name: str, **context) -> ContextLogger:
         """
@@ -134,8 +175,14 @@ class LoggingConfig:
         Returns:
             ContextLogger with attached context
         """
-        logger = logging.getLogger(name)
-        return ContextLogger(logger, extra=context)
+        try:
+            return _cached_logger(name, frozenset(context.items()))
+        except TypeError:
+            # Unhashable context values cannot be cached
+            return ContextLogger(logging.getLogger(name), extra=context)
+
+
+atexit.register(LoggingConfig.shutdown_logging)
 
 
 def get_workflow_logger(
@@ -3,13 +3,132 @@ Main dashboard widget
 """
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QScrollArea, QFrame, QGridLayout, QMessageBox
+    QScrollArea, QFrame, QGridLayout, QMessageBox, QListView,
+    QStyledItemDelegate, QStyleOptionViewItem, QStyle
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QIcon
+from PyQt5.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, QTimer, QAbstractListModel, QModelIndex,
+    QPoint, QRect, QSize, pyqtSignal, pyqtSlot
+)
+from PyQt5.QtGui import QColor, QFont, QIcon, QPainter, QPalette
 from datetime import datetime
+from typing import List, Tuple
+import functools
+import logging
+import time
+
+from sqlalchemy import func, select
+
+from app.core.database import SessionScoped, Scan
+
+# Fonts are built once and shared by every widget instance
+TITLE_FONT = QFont("Arial", 18, QFont.Bold)
+H2_FONT = QFont("Arial", 16, QFont.Bold)
+CARD_TITLE_FONT = QFont("Arial", 14, QFont.Bold)
+ITEM_FONT = QFont("Arial", 11, QFont.Bold)
+
+# Card styles, set once on DashboardWidget and matched by type selector so
+# each card does not parse its own stylesheet
+DASHBOARD_STYLESHEET = """
+    WorkflowCard {
+        background-color: #2b2b2b;
+        border: 2px solid #444;
+        border-radius: 8px;
+        padding: 15px;
+    }
+    WorkflowCard:hover {
+        border-color: #00ff00;
+    }
+"""
+
+# Workflow cards on the dashboard: (workflow_id, title, description)
+WORKFLOW_CARDS = (
+    ("web_app_full", "Full Web Application Scan",
+     "Complete assessment from reconnaissance to exploitation"),
+    ("subdomain_enum", "Subdomain Enumeration", "Discover and enumerate all subdomains"),
+    ("port_scan", "Port Scanning", "Comprehensive port and service detection"),
+    ("vuln_scan", "Vulnerability Scanning", "Automated vulnerability assessment"),
+)
+
+# Seconds a cached page of scan history may be shown before it is re-queried
+HISTORY_CACHE_TTL = 5
+
+
+@functools.lru_cache(maxsize=64)
+def _fetch_recent_scans(user_id: int, page: int, page_size: int,
+                        epoch: int, ttl_bucket: int) -> Tuple:
+    """
+    Fetch one page of a user's scans, newest first
+
+    epoch and ttl_bucket only take part in the cache key: bumping the epoch
+    or moving into the next TTL window forces a fresh query. Only the
+    rendered columns are selected, plus one extra row that tells whether a
+    next page exists. Rows are plain named tuples, so cached pages do not
+    pin a session.
+    """
+    # Each pool thread keeps its own session between refreshes
+    db = SessionScoped()
+    try:
+        return tuple(db.execute(
+            select(
+                Scan.id, Scan.workflow_name, Scan.target, Scan.status,
+                _started_str(db.get_bind().dialect.name)
+            ).where(
+                Scan.user_id == user_id
+            ).order_by(
+                Scan.started_at.desc()
+            ).offset(page * page_size).limit(page_size + 1)
+        ).all())
+    finally:
+        # End the read transaction so no connection (or SQLite read lock)
+        # is held until the next refresh
+        db.rollback()
+
+
+def _started_str(dialect_name: str):
+    """Scan.started_at formatted as 'YYYY-MM-DD HH:MM' by the database"""
+    if dialect_name == "postgresql":
+        column = func.to_char(Scan.started_at, 'YYYY-MM-DD HH24:MI')
+    else:
+        column = func.strftime('%Y-%m-%d %H:%M', Scan.started_at)
+    return column.label("started_str")
+
+
+class _ScanFetcherSignals(QObject):
+    """Signals for _ScanFetcher (QRunnable is not a QObject)"""
+
+    loaded = pyqtSignal(int, int, object)  # request_id, page, rows
+    failed = pyqtSignal(int, str)  # request_id, error
+
+
+class _ScanFetcher(QRunnable):
+    """Runs the history query on the global thread pool"""
+
+    def __init__(self, request_id: int, user_id: int, page: int, page_size: int):
+        super().__init__()
+        self.request_id = request_id
+        self.user_id = user_id
+        self.page = page
+        self.page_size = page_size
+        self.signals = _ScanFetcherSignals()
+
+    def run(self):
+        """Fetch the page and hand the rows back to the GUI thread"""
+        try:
+            scans = _fetch_recent_scans(
+                self.user_id,
+                self.page,
+                self.page_size,
+                DashboardWidget._cache_epoch,
+                int(time.monotonic() // HISTORY_CACHE_TTL)
+            )
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Failed to load recent scans: {e}")
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+
+        self.signals.loaded.emit(self.request_id, self.page, scans)
 
-from app.core.database import SessionLocal, Scan
 
 class WorkflowCard(QFrame):
     """Card widget for a workflow option"""
@@ -34,8 +153,7 @@ class WorkflowCard(QFrame):
         
         # Title
         title_label = QLabel(title)
-        title_font = QFont("Arial", 14, QFont.Bold)
-        title_label.setFont(title_font)
+        title_label.setFont(CARD_TITLE_FONT)
         layout.addWidget(title_label)
         
         # Description
@@ -50,79 +168,117 @@ class WorkflowCard(QFrame):
         launch_btn.setMinimumHeight(35)
         launch_btn.clicked.connect(lambda: self.clicked.emit(self.workflow_id))
         layout.addWidget(launch_btn)
-        
-        self.setStyleSheet("""
-            WorkflowCard {
-                background-color: #2b2b2b;
-                border: 2px solid #444;
-                border-radius: 8px;
-                padding: 15px;
-            }
-            WorkflowCard:hover {
-                border-color: #00ff00;
-            }
-        """)
-
-class ScanHistoryItem(QFrame):
-    """Item widget for scan history"""
-    
-    view_clicked = pyqtSignal(int)  # scan_id
-    
-    def __init__(self, scan: Scan):
-        super().__init__()
-        self.scan = scan
-        self.setup_ui()
-        
-    def setup_ui(self):
-        """Setup the item UI"""
-        self.setFrameStyle(QFrame.Box)
-        self.setMaximumHeight(80)
-        
-        layout = QHBoxLayout(self)
-        
-        # Status indicator
-        status_color = {
+
+class ScanListModel(QAbstractListModel):
+    """List model over history rows from _fetch_recent_scans"""
+
+    # Role returning the whole history row
+    RowRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[Tuple] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return row.workflow_name
+        if role == Qt.ToolTipRole:
+            return row.target
+        if role == Qt.UserRole:
+            return row.id
+        if role == self.RowRole:
+            return row
+        return None
+
+    def rows(self) -> List[Tuple]:
+        """Rows currently shown"""
+        return self._rows
+
+    def set_rows(self, rows):
+        """Replace the shown rows"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+
+class ScanDelegate(QStyledItemDelegate):
+    """Paints one history row: status dot, name, target, start time"""
+
+    ROW_HEIGHT = 80
+
+    # Status dot colors, built once per status
+    STATUS_COLORS = {
+        status: QColor(color)
+        for status, color in {
             "completed": "#00ff00",
             "running": "#ffaa00",
             "failed": "#ff0000",
             "pending": "#888888"
-        }.get(self.scan.status, "#888888")
-        
-        status_label = QLabel("●")
-        status_label.setStyleSheet(f"color: {status_color}; font-size: 24px;")
-        layout.addWidget(status_label)
-        
-        # Info
-        info_layout = QVBoxLayout()
-        
-        name_label = QLabel(f"{self.scan.workflow_name}")
-        name_label.setFont(QFont("Arial", 11, QFont.Bold))
-        info_layout.addWidget(name_label)
-        
-        target_label = QLabel(f"Target: {self.scan.target}")
-        info_layout.addWidget(target_label)
-        
-        time_label = QLabel(f"Started: {self.scan.started_at.strftime('%Y-%m-%d %H:%M')}")
-        time_label.setStyleSheet("color: #888;")
-        info_layout.addWidget(time_label)
-        
-        layout.addLayout(info_layout)
-        layout.addStretch()
-        
-        # View button (only for completed scans)
-        if self.scan.status == "completed":
-            view_btn = QPushButton("View Report")
-            view_btn.clicked.connect(lambda: self.view_clicked.emit(self.scan.id))
-            layout.addWidget(view_btn)
-        
-        self.setStyleSheet("""
-            ScanHistoryItem {
-                background-color: #2b2b2b;
-                border: 1px solid #444;
-                border-radius: 5px;
-                margin: 2px;
-            }
-        """)
+        }.items()
+    }
+
+    BACKGROUND = QColor("#2b2b2b")
+    BORDER = QColor("#444")
+    MUTED = QColor("#888")
+    LINK = QColor("#00ff00")
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        row = index.data(ScanListModel.RowRole)
+        rect = option.rect.adjusted(2, 2, -2, -2)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card
+        painter.setPen(self.LINK if option.state & QStyle.State_MouseOver else self.BORDER)
+        painter.setBrush(self.BACKGROUND)
+        painter.drawRoundedRect(rect, 5, 5)
+
+        # Status dot
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(self.STATUS_COLORS.get(row.status, self.STATUS_COLORS["pending"]))
+        painter.drawEllipse(QPoint(rect.left() + 20, rect.center().y()), 7, 7)
+
+        # Name, target and start time
+        text_rect = rect.adjusted(40, 8, -10, -8)
+        line_height = text_rect.height() // 3
+
+        painter.setPen(option.palette.color(QPalette.Text))
+        painter.setFont(ITEM_FONT)
+        painter.drawText(
+            QRect(text_rect.left(), text_rect.top(), text_rect.width(), line_height),
+            Qt.AlignLeft | Qt.AlignVCenter, f"{row.workflow_name}"
+        )
+
+        painter.setFont(option.font)
+        painter.drawText(
+            QRect(text_rect.left(), text_rect.top() + line_height, text_rect.width(), line_height),
+            Qt.AlignLeft | Qt.AlignVCenter, f"Target: {row.target}"
+        )
+
+        painter.setPen(self.MUTED)
+        painter.drawText(
+            QRect(text_rect.left(), text_rect.top() + 2 * line_height,
+                  text_rect.width(), line_height),
+            Qt.AlignLeft | Qt.AlignVCenter, f"Started: {row.started_str}"
+        )
+
+        # Completed scans open their report when clicked
+        if row.status == "completed":
+            painter.setPen(self.LINK)
+            painter.drawText(text_rect, Qt.AlignRight | Qt.AlignVCenter, "View Report ›")
+
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
 
 class DashboardWidget(QWidget):
     """Main dashboard widget"""
@@ -132,21 +288,34 @@ class DashboardWidget(QWidget):
     reports_requested = pyqtSignal()
     report_requested = pyqtSignal(int)  # scan_id
     logout_requested = pyqtSignal()
+
+    # Scans shown per page of the history list
+    PAGE_SIZE = 10
+
+    # Bumped whenever scans may have changed, invalidating cached pages
+    _cache_epoch = 0
     
     def __init__(self):
         super().__init__()
         self.current_user = None
+        self.page = 0
+        # Only the latest history request is rendered
+        self._request_id = 0
+        # Set when the history may be stale; cleared once a reload starts
+        self._scans_dirty = True
         self.init_ui()
         
     def init_ui(self):
         """Initialize UI"""
+        self.setStyleSheet(DASHBOARD_STYLESHEET)
+
         layout = QVBoxLayout(self)
         
         # Header
         header_layout = QHBoxLayout()
         
         title = QLabel("OFFENSIVE SECURITY PLATFORM")
-        title.setFont(QFont("Arial", 18, QFont.Bold))
+        title.setFont(TITLE_FONT)
         header_layout.addWidget(title)
         
         header_layout.addStretch()
@@ -177,7 +346,7 @@ class DashboardWidget(QWidget):
         left_layout = QVBoxLayout(left_panel)
         
         workflows_label = QLabel("Available Workflows")
-        workflows_label.setFont(QFont("Arial", 16, QFont.Bold))
+        workflows_label.setFont(H2_FONT)
         left_layout.addWidget(workflows_label)
         
         # Scroll area for workflow cards
@@ -188,20 +357,16 @@ class DashboardWidget(QWidget):
         workflow_container = QWidget()
         workflow_grid = QGridLayout(workflow_container)
         
-        # Add workflow cards
-        workflows = [
-            ("web_app_full", "Full Web Application Scan", "Complete assessment from reconnaissance to exploitation"),
-            ("subdomain_enum", "Subdomain Enumeration", "Discover and enumerate all subdomains"),
-            ("port_scan", "Port Scanning", "Comprehensive port and service detection"),
-            ("vuln_scan", "Vulnerability Scanning", "Automated vulnerability assessment"),
-        ]
-        
-        for idx, (wf_id, title, desc) in enumerate(workflows):
+        # Add workflow cards with updates off, then lay the grid out once
+        workflow_container.setUpdatesEnabled(False)
+        for idx, (wf_id, title, desc) in enumerate(WORKFLOW_CARDS):
             card = WorkflowCard(wf_id, title, desc)
             card.clicked.connect(self.on_workflow_clicked)
             workflow_grid.addWidget(card, idx // 2, idx % 2)
         
         workflow_grid.setRowStretch(workflow_grid.rowCount(), 1)
+        workflow_grid.activate()
+        workflow_container.setUpdatesEnabled(True)
         scroll.setWidget(workflow_container)
         left_layout.addWidget(scroll)
         
@@ -212,20 +377,50 @@ class DashboardWidget(QWidget):
         right_layout = QVBoxLayout(right_panel)
         
         history_label = QLabel("Recent Scans")
-        history_label.setFont(QFont("Arial", 16, QFont.Bold))
+        history_label.setFont(H2_FONT)
         right_layout.addWidget(history_label)
         
-        # Scroll area for history
-        self.history_scroll = QScrollArea()
-        self.history_scroll.setWidgetResizable(True)
-        self.history_scroll.setMinimumWidth(400)
-        
-        self.history_container = QWidget()
-        self.history_layout = QVBoxLayout(self.history_container)
-        self.history_layout.addStretch()
-        
-        self.history_scroll.setWidget(self.history_container)
-        right_layout.addWidget(self.history_scroll)
+        self.no_scans_label = QLabel("No scans yet. Launch a workflow to get started!")
+        self.no_scans_label.setAlignment(Qt.AlignCenter)
+        self.no_scans_label.setStyleSheet("color: #888; padding: 20px;")
+        self.no_scans_label.setVisible(False)
+        right_layout.addWidget(self.no_scans_label)
+
+        self.loading_label = QLabel("Loading…")
+        self.loading_label.setAlignment(Qt.AlignCenter)
+        self.loading_label.setStyleSheet("color: #888; padding: 20px;")
+        self.loading_label.setVisible(False)
+        right_layout.addWidget(self.loading_label)
+
+        # History list; the delegate paints only the visible rows
+        self.history_model = ScanListModel(self)
+        self.history_delegate = ScanDelegate(self)
+
+        self.history_view = QListView()
+        self.history_view.setModel(self.history_model)
+        self.history_view.setItemDelegate(self.history_delegate)
+        self.history_view.setUniformItemSizes(True)
+        self.history_view.setMouseTracking(True)
+        self.history_view.setMinimumWidth(400)
+        self.history_view.clicked.connect(self.on_history_clicked)
+        right_layout.addWidget(self.history_view)
+
+        # Pager
+        pager_layout = QHBoxLayout()
+
+        self.prev_btn = QPushButton("Prev")
+        self.prev_btn.clicked.connect(lambda: self.load_recent_scans(self.page - 1))
+        pager_layout.addWidget(self.prev_btn)
+
+        self.page_label = QLabel("")
+        self.page_label.setAlignment(Qt.AlignCenter)
+        pager_layout.addWidget(self.page_label)
+
+        self.next_btn = QPushButton("Next")
+        self.next_btn.clicked.connect(lambda: self.load_recent_scans(self.page + 1))
+        pager_layout.addWidget(self.next_btn)
+
+        right_layout.addLayout(pager_layout)
         
         content_layout.addWidget(right_panel)
         
@@ -233,36 +428,79 @@ class DashboardWidget(QWidget):
         
     def load_user_data(self, user):
         """Load data for the logged-in user"""
+        if self.current_user is None or self.current_user.id != user.id:
+            self._scans_dirty = True
+
         self.current_user = user
         self.user_label.setText(f"User: {user.username}")
-        self.load_recent_scans()
-        
-    def load_recent_scans(self):
-        """Load recent scans from database"""
-        # Clear existing items
-        while self.history_layout.count() > 1:
-            item = self.history_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Load scans
-        db = SessionLocal()
-        scans = db.query(Scan).filter(
-            Scan.user_id == self.current_user.id
-        ).order_by(Scan.started_at.desc()).limit(10).all()
-        db.close()
-        
-        if not scans:
-            no_scans_label = QLabel("No scans yet. Launch a workflow to get started!")
-            no_scans_label.setAlignment(Qt.AlignCenter)
-            no_scans_label.setStyleSheet("color: #888; padding: 20px;")
-            self.history_layout.insertWidget(0, no_scans_label)
-        else:
-            for scan in scans:
-                item = ScanHistoryItem(scan)
-                item.view_clicked.connect(self.on_view_report)
-                self.history_layout.insertWidget(self.history_layout.count() - 1, item)
-        
+
+        # Unchanged history is not re-queried; a hidden dashboard reloads
+        # from showEvent once it is shown
+        if self._scans_dirty and self.isVisible():
+            self.load_recent_scans()
+
+    def showEvent(self, event):
+        """Reload stale history once the dashboard becomes visible"""
+        super().showEvent(event)
+        if self._scans_dirty and self.current_user is not None:
+            QTimer.singleShot(0, self._reload_if_dirty)
+
+    def _reload_if_dirty(self):
+        """Reload the history unless another call already did"""
+        if self._scans_dirty and self.current_user is not None:
+            self.load_recent_scans()
+        
+    def load_recent_scans(self, page: int = 0):
+        """
+        Load one page of recent scans from database
+
+        The query runs on the global thread pool; the current items stay in
+        place until on_scans_loaded renders the result.
+        """
+        self._request_id += 1
+        self._scans_dirty = False
+
+        fetcher = _ScanFetcher(self._request_id, self.current_user.id, max(page, 0), self.PAGE_SIZE)
+        fetcher.signals.loaded.connect(self.on_scans_loaded)
+        fetcher.signals.failed.connect(self.on_scans_failed)
+
+        self.no_scans_label.setVisible(False)
+        self.loading_label.setVisible(True)
+        QThreadPool.globalInstance().start(fetcher)
+
+    @pyqtSlot(int, str)
+    def on_scans_failed(self, request_id: int, error: str):
+        """Clear the loading placeholder when the history query fails"""
+        if request_id == self._request_id:
+            self.loading_label.setVisible(False)
+            self._scans_dirty = True
+
+    @pyqtSlot(int, int, object)
+    def on_scans_loaded(self, request_id: int, page: int, scans: Tuple):
+        """Render a page of history rows fetched by _ScanFetcher"""
+        # A newer request supersedes this one
+        if request_id != self._request_id:
+            return
+
+        self.loading_label.setVisible(False)
+
+        has_next = len(scans) > self.PAGE_SIZE
+        scans = scans[:self.PAGE_SIZE]
+        self.page = page
+
+        self.history_model.set_rows(scans)
+
+        self.no_scans_label.setVisible(not scans and page == 0)
+
+        self.prev_btn.setEnabled(page > 0)
+        self.next_btn.setEnabled(has_next)
+        self.page_label.setText(f"Page {page + 1}")
+        
+    def invalidate_scan_cache(self):
+        """Drop cached history pages once a workflow starts or finishes"""
+        DashboardWidget._cache_epoch += 1
+        self._scans_dirty = True
+
     def on_workflow_clicked(self, workflow_id: str):
         """Handle workflow card click"""
         # Show target input dialog
@@ -278,6 +516,12 @@ class DashboardWidget(QWidget):
         if ok and target:
             self.workflow_selected.emit(f"{workflow_id}:{target}")
         
+    def on_history_clicked(self, index: QModelIndex):
+        """Open the report of a completed scan clicked in the history list"""
+        row = index.data(ScanListModel.RowRole)
+        if row is not None and row.status == "completed":
+            self.on_view_report(row.id)
+
     def on_view_report(self, scan_id: int):
         """Handle view report click - emit signal for main window"""
         self.report_requested.emit(scan_id)
\ No newline at end of file
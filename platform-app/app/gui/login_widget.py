@@ -7,6 +7,9 @@ from PyQt5.QtGui import QFont, QPixmap
 
 from app.core.auth import AuthManager
 
+# Fonts are built once and shared by every widget instance
+LOGIN_TITLE_FONT = QFont("Arial", 24, QFont.Bold)
+
 class LoginWidget(QWidget):
     """Login and registration widget"""
     
@@ -26,8 +29,7 @@ class LoginWidget(QWidget):
         # Logo/Title
         title = QLabel("OFFENSIVE SECURITY PLATFORM")
         title.setAlignment(Qt.AlignCenter)
-        title_font = QFont("Arial", 24, QFont.Bold)
-        title.setFont(title_font)
+        title.setFont(LOGIN_TITLE_FONT)
         layout.addWidget(title)
         
         layout.addSpacing(30)
@@ -1,8 +1,9 @@
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QStackedWidget, QMessageBox, QApplication
+    QStackedWidget, QMessageBox, QApplication, QDialog, QLabel,
+    QCheckBox, QDialogButtonBox
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QCoreApplication
 from PyQt5.QtGui import QKeySequence
 
 from .login_widget import LoginWidget
@@ -11,6 +12,38 @@ from .workflow_widget import WorkflowWidget
 from .terminal_widget import TerminalWidget
 from .report_widget import ReportWidget
 
+class EmergencyExitDialog(QDialog):
+    """Single exit confirmation; Exit stays disabled until acknowledged"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Emergency Exit")
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+
+        message = QLabel(
+            "Are you sure you want to exit the platform?\n"
+            "This will close the application completely."
+        )
+        layout.addWidget(message)
+
+        self.acknowledge = QCheckBox("I understand, exit anyway")
+        layout.addWidget(self.acknowledge)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Cancel)
+        self.exit_btn = buttons.addButton("Exit", QDialogButtonBox.AcceptRole)
+        self.exit_btn.setEnabled(False)
+        self.acknowledge.toggled.connect(self.exit_btn.setEnabled)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def exec_(self) -> int:
+        """Show the dialog with the acknowledgement cleared"""
+        self.acknowledge.setChecked(False)
+        return super().exec_()
+
 class MainWindow(QMainWindow):
     """Main application window"""
     
@@ -18,6 +51,7 @@ class MainWindow(QMainWindow):
         super().__init__()
         
         self.current_user = None
+        self._exit_dialog = None
         self.init_ui()
         self.setup_shortcuts()
         
@@ -38,34 +72,66 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         layout.addWidget(self.stacked_widget)
         
-        # Create pages
+        # Only the login page is built up front; the others are created on
+        # first use by _page()
+        self._pages = {}
         self.login_page = LoginWidget()
-        self.dashboard_page = DashboardWidget()
-        self.workflow_page = WorkflowWidget()
-        self.terminal_page = TerminalWidget()
-        self.report_page = ReportWidget()
-        
-        # Add pages to stack
         self.stacked_widget.addWidget(self.login_page)
-        self.stacked_widget.addWidget(self.dashboard_page)
-        self.stacked_widget.addWidget(self.workflow_page)
-        self.stacked_widget.addWidget(self.terminal_page)
-        self.stacked_widget.addWidget(self.report_page)
-        
-        # Connect signals
         self.login_page.login_successful.connect(self.on_login_success)
-        self.dashboard_page.workflow_selected.connect(self.launch_workflow)
-        self.dashboard_page.terminal_requested.connect(self.show_terminal)
-        self.dashboard_page.reports_requested.connect(self.show_reports)
-        self.dashboard_page.report_requested.connect(self.show_report)
-        self.dashboard_page.logout_requested.connect(self.logout)
         
         # Show login page
         self.show_login()
         
+    def _page(self, name: str) -> QWidget:
+        """Return a page, building and wiring it on first access"""
+        page = self._pages.get(name)
+        if page is not None:
+            return page
+
+        if name == "dashboard":
+            page = DashboardWidget()
+            page.workflow_selected.connect(self.launch_workflow)
+            page.terminal_requested.connect(self.show_terminal)
+            page.reports_requested.connect(self.show_reports)
+            page.report_requested.connect(self.show_report)
+            page.logout_requested.connect(self.logout)
+        elif name == "workflow":
+            page = WorkflowWidget()
+            page.workflow_finished.connect(self.dashboard_page.invalidate_scan_cache)
+        elif name == "terminal":
+            page = TerminalWidget()
+        elif name == "report":
+            page = ReportWidget()
+        else:
+            raise ValueError(f"Unknown page: {name}")
+
+        self._pages[name] = page
+        self.stacked_widget.addWidget(page)
+        return page
+
+    @property
+    def dashboard_page(self) -> DashboardWidget:
+        """Dashboard page, built on first access"""
+        return self._page("dashboard")
+
+    @property
+    def workflow_page(self) -> WorkflowWidget:
+        """Workflow execution page, built on first access"""
+        return self._page("workflow")
+
+    @property
+    def terminal_page(self) -> TerminalWidget:
+        """Terminal page, built on first access"""
+        return self._page("terminal")
+
+    @property
+    def report_page(self) -> ReportWidget:
+        """Reports page, built on first access"""
+        return self._page("report")
+
     def setup_shortcuts(self):
         """Setup keyboard shortcuts"""
-        # Emergency exit: Ctrl+Alt+Q (triple confirmation required)
+        # Emergency exit: Ctrl+Alt+Q (confirmation required)
         from PyQt5.QtWidgets import QShortcut
         
         exit_shortcut = QShortcut(QKeySequence("Ctrl+Alt+Q"), self)
@@ -73,28 +139,12 @@ class MainWindow(QMainWindow):
         
     def emergency_exit(self):
         """Emergency exit with confirmation"""
-        reply = QMessageBox.question(
-            self,
-            'Emergency Exit',
-            'Are you sure you want to exit the platform?\n'
-            'This will close the application completely.',
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No
-        )
-        
-        if reply == QMessageBox.Yes:
-            # Second confirmation
-            reply2 = QMessageBox.warning(
-                self,
-                'Confirm Exit',
-                'This action cannot be undone.\n'
-                'Exit anyway?',
-                QMessageBox.Yes | QMessageBox.No,
-                QMessageBox.No
-            )
-            
-            if reply2 == QMessageBox.Yes:
-                QApplication.quit()
+        # Built once and reused for later exit attempts
+        if self._exit_dialog is None:
+            self._exit_dialog = EmergencyExitDialog(self)
+
+        if self._exit_dialog.exec_() == QDialog.Accepted:
+            QCoreApplication.quit()
     
     def show_login(self):
         """Show login page"""
@@ -102,8 +152,11 @@ class MainWindow(QMainWindow):
         
     def show_dashboard(self):
         """Show dashboard page"""
-        self.dashboard_page.load_user_data(self.current_user)
+        # Switch first and load on the next event-loop pass, so the page is
+        # painted before the data work starts
+        user = self.current_user
         self.stacked_widget.setCurrentWidget(self.dashboard_page)
+        QTimer.singleShot(0, lambda: self.dashboard_page.load_user_data(user))
         
     def show_terminal(self):
         """Show terminal page"""
@@ -112,9 +165,10 @@ class MainWindow(QMainWindow):
         
     def show_reports(self):
         """Show reports page"""
-        self.report_page.load_reports(self.current_user)
+        user = self.current_user
         self.stacked_widget.setCurrentWidget(self.report_page)
         self.report_page.set_return_callback(self.show_dashboard)
+        QTimer.singleShot(0, lambda: self.report_page.load_reports(user))
 
     def show_report(self, scan_id: int):
         """Show report for given scan_id"""
@@ -127,9 +181,11 @@ class MainWindow(QMainWindow):
 
     def launch_workflow(self, workflow_id):
         """Launch a workflow"""
-        self.workflow_page.start_workflow(workflow_id, self.current_user)
+        self.dashboard_page.invalidate_scan_cache()
+        user = self.current_user
         self.stacked_widget.setCurrentWidget(self.workflow_page)
         self.workflow_page.set_return_callback(self.show_dashboard)
+        QTimer.singleShot(0, lambda: self.workflow_page.start_workflow(workflow_id, user))
         
     def on_login_success(self, user):
         """Handle successful login"""
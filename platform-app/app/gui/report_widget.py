@@ -11,6 +11,9 @@ from PyQt5.QtGui import QFont
 from app.core.database import SessionLocal, Scan
 import json
 
+# Fonts are built once and shared by every widget instance
+TITLE_FONT = QFont("Arial", 18, QFont.Bold)
+
 class ReportWidget(QWidget):
     """Widget for viewing scan reports"""
     
@@ -28,7 +31,7 @@ class ReportWidget(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("Scan Reports")
-        title.setFont(QFont("Arial", 18, QFont.Bold))
+        title.setFont(TITLE_FONT)
         header_layout.addWidget(title)
         
         header_layout.addStretch()
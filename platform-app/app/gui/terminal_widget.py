@@ -1,19 +1,80 @@
 """
 Embedded terminal widget
 """
+import codecs
+import shlex
+from typing import List, Optional
+
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTextEdit, QLineEdit
 )
-from PyQt5.QtCore import Qt, QProcess, pyqtSignal
-from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtCore import QProcess, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+
+# Fonts are built once and shared by every widget instance
+TITLE_FONT = QFont("Arial", 18, QFont.Bold)
+
+# Characters that need a real shell (pipes, redirects, expansion, globs, ...)
+_SHELL_METACHARS = frozenset('|&;<>()$`\\*?[]{}~!#\n')
+
+# Commands that only exist inside a shell
+_SHELL_BUILTINS = frozenset({
+    ".", ":", "[", "alias", "bg", "builtin", "case", "cd", "command",
+    "declare", "dirs", "eval", "exec", "exit", "export", "fg", "for",
+    "function", "hash", "history", "if", "jobs", "let", "local", "popd",
+    "pushd", "read", "readonly", "select", "set", "shopt", "source", "time",
+    "trap", "type", "typeset", "ulimit", "umask", "unalias", "unset", "until",
+    "wait", "while"
+})
+
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """
+    Split a simple command into argv so it can run without bash
+
+    Returns None when the command needs a shell: metacharacters, builtins,
+    variable assignments or malformed quoting.
+    """
+    if any(char in _SHELL_METACHARS for char in command):
+        return None
+
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0]:
+        return None
+    return argv
+
 
 class TerminalWidget(QWidget):
     """Embedded terminal emulator"""
+
+    # Process output is repainted at most this often (ms)
+    FLUSH_INTERVAL = 50
+
+    # Oldest lines are dropped beyond this many
+    MAX_LINES = 5000
     
     def __init__(self):
         super().__init__()
         self.process = None
         self.return_callback = None
+
+        # (text, color) chunks waiting for the next flush, in arrival order
+        self._pending_output = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self._flush_output)
+
+        # Output formats are built once rather than copied per insert
+        self._fmt_green = QTextCharFormat()
+        self._fmt_green.setForeground(QColor("#00ff00"))
+        self._fmt_red = QTextCharFormat()
+        self._fmt_red.setForeground(QColor("#ff0000"))
+
         self.init_ui()
         
     def init_ui(self):
@@ -24,7 +85,7 @@ class TerminalWidget(QWidget):
         header_layout = QHBoxLayout()
         
         title = QLabel("System Terminal")
-        title.setFont(QFont("Arial", 18, QFont.Bold))
+        title.setFont(TITLE_FONT)
         header_layout.addWidget(title)
         
         header_layout.addStretch()
@@ -54,6 +115,11 @@ class TerminalWidget(QWidget):
                 padding: 10px;
             }
         """)
+        # Bound the document and skip the undo stack for long tool output;
+        # output is inserted as plain text and never parsed as HTML
+        self.terminal_display.document().setMaximumBlockCount(self.MAX_LINES)
+        self.terminal_display.setUndoRedoEnabled(False)
+        self.terminal_display.setAcceptRichText(False)
         layout.addWidget(self.terminal_display)
         
         # Input area
@@ -63,11 +129,11 @@ class TerminalWidget(QWidget):
         prompt_label.setStyleSheet("color: #00ff00; font-family: 'Courier New'; font-size: 14px;")
         input_layout.addWidget(prompt_label)
         
-        self.command_input = QTextEdit()
+        self.command_input = QLineEdit()
         self.command_input.setMaximumHeight(40)
         self.command_input.setPlaceholderText("Enter command...")
         self.command_input.setStyleSheet("""
-            QTextEdit {
+            QLineEdit {
                 background-color: #1a1a1a;
                 color: #00ff00;
                 font-family: 'Courier New', monospace;
@@ -76,7 +142,7 @@ class TerminalWidget(QWidget):
                 padding: 5px;
             }
         """)
-        self.command_input.textChanged.connect(self.on_text_changed)
+        self.command_input.returnPressed.connect(self.execute_command)
         input_layout.addWidget(self.command_input)
         
         execute_btn = QPushButton("Execute")
@@ -88,7 +154,7 @@ class TerminalWidget(QWidget):
         
         # Instructions
         instructions = QLabel(
-            "Type commands and press Execute. Press Ctrl+Return to execute. "
+            "Type commands and press Execute. Press Enter to execute. "
             "Common commands: ls, cd, pwd, nmap, subfinder, etc."
         )
         instructions.setStyleSheet("color: #888; font-size: 10px; padding: 5px;")
@@ -110,18 +176,19 @@ class TerminalWidget(QWidget):
         self.process.readyReadStandardOutput.connect(self.on_stdout)
         self.process.readyReadStandardError.connect(self.on_stderr)
         self.process.finished.connect(self.on_process_finished)
-        
-    def on_text_changed(self):
-        """Handle text changed in input"""
-        # Check for Ctrl+Return
-        text = self.command_input.toPlainText()
-        if text.endswith('\n'):
-            self.command_input.setPlainText(text.rstrip('\n'))
-            self.execute_command()
+        self.process.errorOccurred.connect(self.on_process_error)
+
+        # One incremental decoder per channel, so a UTF-8 sequence split
+        # across two reads is decoded intact
+        self._stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+        # Command started without bash, retried through bash if it fails to start
+        self._direct_command = None
         
     def execute_command(self):
         """Execute the entered command"""
-        command = self.command_input.toPlainText().strip()
+        command = self.command_input.text().strip()
         
         if not command:
             return
@@ -146,37 +213,99 @@ class TerminalWidget(QWidget):
             return
         
         # Start process
-        self.process.start("bash", ["-c", command])
+        self._stdout_decoder.reset()
+        self._stderr_decoder.reset()
+
+        # Simple commands are run directly, saving the intermediate bash
+        argv = _direct_argv(command)
+        if argv is not None:
+            self._direct_command = command
+            self.process.start(argv[0], argv[1:])
+        else:
+            self._direct_command = None
+            self.process.start("bash", ["-c", command])
         
     def on_stdout(self):
         """Handle stdout from process"""
-        data = self.process.readAllStandardOutput()
-        text = bytes(data).decode('utf-8', errors='ignore')
-        self.append_output(text)
+        text = self._stdout_decoder.decode(self.process.readAllStandardOutput().data())
+        if text:
+            self._queue_output(text)
         
     def on_stderr(self):
         """Handle stderr from process"""
-        data = self.process.readAllStandardError()
-        text = bytes(data).decode('utf-8', errors='ignore')
-        self.append_output(f"[ERROR] {text}", color="red")
+        text = self._stderr_decoder.decode(self.process.readAllStandardError().data())
+        if text:
+            self._queue_output(f"[ERROR] {text}", color="red")
         
     def on_process_finished(self, exit_code, exit_status):
         """Handle process finished"""
+        # Emit any trailing bytes of an incomplete UTF-8 sequence
+        tail = self._stdout_decoder.decode(b"", final=True)
+        if tail:
+            self._queue_output(tail)
+        tail = self._stderr_decoder.decode(b"", final=True)
+        if tail:
+            self._queue_output(f"[ERROR] {tail}", color="red")
+
         if exit_code != 0:
             self.append_output(f"\nProcess exited with code {exit_code}", color="red")
         self.append_output("")
         
+    def on_process_error(self, error):
+        """Report commands that could not be started"""
+        # Other errors are followed by finished() and reported there
+        if error == QProcess.FailedToStart:
+            command, self._direct_command = self._direct_command, None
+            if command is not None:
+                # Not an executable; bash may still know it (a builtin or
+                # function) and reports it otherwise. QProcess cannot be
+                # restarted from inside its own error signal.
+                QTimer.singleShot(0, lambda: self.process.start("bash", ["-c", command]))
+                return
+            self.append_output(f"{self.process.program()}: command not found", color="red")
+            self.append_output("")
+
     def append_output(self, text: str, color: str = "#00ff00"):
-        """Append text to terminal display"""
+        """Append a line of text to terminal display"""
+        self._queue_output(text + "\n", color)
+        self._flush_output()
+
+    def _queue_output(self, text: str, color: str = "#00ff00"):
+        """Buffer raw output for the next flush instead of repainting per chunk"""
+        self._pending_output.append((text, color))
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_output(self):
+        """Write buffered output with one insert per color run"""
+        self._flush_timer.stop()
+        if not self._pending_output:
+            return
+
+        pending = self._pending_output
+        self._pending_output = []
+
         cursor = self.terminal_display.textCursor()
         cursor.movePosition(QTextCursor.End)
-        
-        format = cursor.charFormat()
-        format.setForeground(Qt.GlobalColor.green if color == "#00ff00" else Qt.GlobalColor.red)
-        
-        cursor.insertText(text + "\n", format)
+        cursor.beginEditBlock()
+
+        run_color = pending[0][1]
+        run = []
+        for text, color in pending:
+            if color != run_color:
+                cursor.insertText("".join(run), self._format_for(run_color))
+                run_color = color
+                run = []
+            run.append(text)
+        cursor.insertText("".join(run), self._format_for(run_color))
+
+        cursor.endEditBlock()
         self.terminal_display.setTextCursor(cursor)
         self.terminal_display.ensureCursorVisible()
+
+    def _format_for(self, color: str) -> QTextCharFormat:
+        """Cached char format for a terminal color"""
+        return self._fmt_green if color == "#00ff00" else self._fmt_red
         
     def show_help(self):
         """Show help information"""
@@ -2,83 +2,157 @@
 Workflow execution widget
 """
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QProgressBar, QTextEdit, QScrollArea, QFrame, QListWidget, QListWidgetItem
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar,
+    QPlainTextEdit, QListView, QStyledItemDelegate, QStyleOptionViewItem
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-from PyQt5.QtGui import QFont, QTextCursor
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QAbstractListModel, QModelIndex, QSize
+from PyQt5.QtGui import QColor, QFont, QPainter, QPalette, QTextCursor
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from app.workflows.engine import WorkflowWorker
-from app.workflows.prebuilt.web_app_scan import create_web_app_workflow
 from app.workflows.prebuilt import WorkflowFactory
 
-class TaskItem(QFrame):
-    """Widget representing a single task"""
-    
-    def __init__(self, task_id: str, task_name: str):
-        super().__init__()
-        self.task_id = task_id
-        self.task_name = task_name
-        self.setup_ui()
-        
-    def setup_ui(self):
-        """Setup UI"""
-        self.setFrameStyle(QFrame.Box)
-        self.setMaximumHeight(60)
-        
-        layout = QHBoxLayout(self)
-        
-        # Status indicator
-        self.status_label = QLabel("⏳")
-        self.status_label.setStyleSheet("font-size: 24px;")
-        layout.addWidget(self.status_label)
-        
+# Fonts are built once and shared by every widget instance
+TITLE_FONT = QFont("Arial", 18, QFont.Bold)
+SECTION_FONT = QFont("Arial", 14, QFont.Bold)
+TASK_NAME_FONT = QFont("Arial", 11)
+ICON_FONT = QFont("Arial", 18)
+
+class TaskListModel(QAbstractListModel):
+    """List model over the tasks of the running workflow"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    # Role returning the task status
+    StatusRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[list] = []  # [task_id, name, status, error]
+        self._row_by_id: Dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        task_id, name, status, error = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return name
+        if role == Qt.ToolTipRole:
+            return error
+        if role == Qt.UserRole:
+            return task_id
+        if role == self.StatusRole:
+            return status
+        return None
+
+    def set_tasks(self, tasks: Iterable[Tuple[str, str]]):
+        """Replace the shown tasks with (task_id, name) pairs, all pending"""
+        self.beginResetModel()
+        self._rows = [[task_id, name, self.PENDING, None] for task_id, name in tasks]
+        self._row_by_id = {row[0]: i for i, row in enumerate(self._rows)}
+        self.endResetModel()
+
+    def set_task_status(self, task_id: str, status: str, error: str = None) -> bool:
+        """Update one task's status; False if the task is not shown"""
+        row = self._row_by_id.get(task_id)
+        if row is None:
+            return False
+
+        self._rows[row][2] = status
+        self._rows[row][3] = error
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.StatusRole, Qt.ToolTipRole])
+        return True
+
+    def task_status(self, task_id: str) -> Optional[str]:
+        """Status of a shown task"""
+        row = self._row_by_id.get(task_id)
+        return None if row is None else self._rows[row][2]
+
+
+class TaskDelegate(QStyledItemDelegate):
+    """Paints one task row: status icon, name and status pill"""
+
+    ROW_HEIGHT = 56
+
+    # Icon, label and color per status
+    STATUS_STYLES = {
+        TaskListModel.PENDING: ("⏳", "Pending", None),
+        TaskListModel.RUNNING: ("⚙️", "Running...", QColor("#ffaa00")),
+        TaskListModel.COMPLETED: ("✅", "Completed", QColor("#00ff00")),
+        TaskListModel.FAILED: ("❌", "Failed", QColor("#ff0000")),
+    }
+
+    BACKGROUND = QColor("#2b2b2b")
+    BORDER = QColor("#444")
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        icon, label, color = self.STATUS_STYLES[index.data(TaskListModel.StatusRole)]
+        rect = option.rect.adjusted(2, 2, -2, -2)
+        text_color = option.palette.color(QPalette.Text)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Card
+        painter.setPen(self.BORDER)
+        painter.setBrush(self.BACKGROUND)
+        painter.drawRoundedRect(rect, 5, 5)
+
+        text_rect = rect.adjusted(10, 0, -10, 0)
+
+        # Status icon
+        painter.setPen(text_color)
+        painter.setFont(ICON_FONT)
+        painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, icon)
+
         # Task name
-        name_label = QLabel(self.task_name)
-        name_label.setFont(QFont("Arial", 11))
-        layout.addWidget(name_label)
-        
-        layout.addStretch()
-        
+        painter.setFont(TASK_NAME_FONT)
+        painter.drawText(
+            text_rect.adjusted(44, 0, 0, 0), Qt.AlignLeft | Qt.AlignVCenter, index.data()
+        )
+
         # Status text
-        self.status_text = QLabel("Pending")
-        layout.addWidget(self.status_text)
-        
-        self.setStyleSheet("""
-            TaskItem {
-                background-color: #2b2b2b;
-                border: 1px solid #444;
-                border-radius: 5px;
-                margin: 2px;
-            }
-        """)
-    
-    def set_running(self):
-        """Mark task as running"""
-        self.status_label.setText("⚙️")
-        self.status_text.setText("Running...")
-        self.status_text.setStyleSheet("color: #ffaa00;")
-        
-    def set_completed(self):
-        """Mark task as completed"""
-        self.status_label.setText("✅")
-        self.status_text.setText("Completed")
-        self.status_text.setStyleSheet("color: #00ff00;")
-        
-    def set_failed(self, error: str):
-        """Mark task as failed"""
-        self.status_label.setText("❌")
-        self.status_text.setText("Failed")
-        self.status_text.setStyleSheet("color: #ff0000;")
+        painter.setFont(option.font)
+        painter.setPen(color or text_color)
+        painter.drawText(text_rect, Qt.AlignRight | Qt.AlignVCenter, label)
+
+        painter.restore()
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
 
 class WorkflowWidget(QWidget):
     """Widget for executing and monitoring workflows"""
+
+    workflow_finished = pyqtSignal()  # worker thread exited
+
+    # Oldest log lines are dropped beyond this many
+    MAX_LOG_LINES = 5000
+
+    # Log lines are written at most this often (ms)
+    LOG_FLUSH_INTERVAL = 50
     
     def __init__(self):
         super().__init__()
         self.workflow_worker = None
         self.return_callback = None
-        self.task_widgets = {}
+        self._completed_count = 0  # tasks that completed or failed
+
+        # Log lines waiting for the next flush
+        self._pending_log: List[str] = []
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+
         self.init_ui()
         
     def init_ui(self):
@@ -89,7 +163,7 @@ class WorkflowWidget(QWidget):
         header_layout = QHBoxLayout()
         
         self.title_label = QLabel("Workflow Execution")
-        self.title_label.setFont(QFont("Arial", 18, QFont.Bold))
+        self.title_label.setFont(TITLE_FONT)
         header_layout.addWidget(self.title_label)
         
         header_layout.addStretch()
@@ -110,20 +184,19 @@ class WorkflowWidget(QWidget):
         left_layout = QVBoxLayout(left_panel)
         
         tasks_label = QLabel("Tasks")
-        tasks_label.setFont(QFont("Arial", 14, QFont.Bold))
+        tasks_label.setFont(SECTION_FONT)
         left_layout.addWidget(tasks_label)
         
-        # Scroll area for tasks
-        task_scroll = QScrollArea()
-        task_scroll.setWidgetResizable(True)
-        task_scroll.setMinimumWidth(400)
-        
-        self.task_container = QWidget()
-        self.task_layout = QVBoxLayout(self.task_container)
-        self.task_layout.addStretch()
-        
-        task_scroll.setWidget(self.task_container)
-        left_layout.addWidget(task_scroll)
+        # Task list; rows are painted by TaskDelegate
+        self.task_model = TaskListModel(self)
+        self.task_delegate = TaskDelegate(self)
+        self.task_view = QListView()
+        self.task_view.setModel(self.task_model)
+        self.task_view.setItemDelegate(self.task_delegate)
+        self.task_view.setUniformItemSizes(True)
+        self.task_view.setSelectionMode(QListView.NoSelection)
+        self.task_view.setMinimumWidth(400)
+        left_layout.addWidget(self.task_view)
         
         # Overall progress
         progress_layout = QVBoxLayout()
@@ -143,14 +216,19 @@ class WorkflowWidget(QWidget):
         right_layout = QVBoxLayout(right_panel)
         
         output_label = QLabel("Execution Log")
-        output_label.setFont(QFont("Arial", 14, QFont.Bold))
+        output_label.setFont(SECTION_FONT)
         right_layout.addWidget(output_label)
         
-        self.output_text = QTextEdit()
+        # Plain-text log capped at MAX_LOG_LINES; no rich-text layout or undo
+        self.output_text = QPlainTextEdit()
         self.output_text.setReadOnly(True)
         self.output_text.setMinimumWidth(500)
+        self.output_text.setMaximumBlockCount(self.MAX_LOG_LINES)
+        self.output_text.setCenterOnScroll(True)
+        self.output_text.setUndoRedoEnabled(False)
+        self.output_text.setLineWrapMode(QPlainTextEdit.NoWrap)
         self.output_text.setStyleSheet("""
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #1a1a1a;
                 color: #00ff00;
                 font-family: 'Courier New', monospace;
@@ -178,31 +256,15 @@ class WorkflowWidget(QWidget):
             self.log_output(f"Error: {str(e)}")
             return
         
-        # Create workflow definition
-        if workflow_id == "web_app_full":
-            workflow = create_web_app_workflow(target)
-        else:
-            self.log_output(f"Unknown workflow: {workflow_id}")
-            return
-        
         self.title_label.setText(f"{workflow.name} - {target}")
         
-        # Clear previous tasks
-        while self.task_layout.count() > 1:
-            item = self.task_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        self.task_widgets.clear()
-        
-        # Create task widgets
-        for task in workflow.tasks:
-            task_widget = TaskItem(task.task_id, task.name)
-            self.task_widgets[task.task_id] = task_widget
-            self.task_layout.insertWidget(self.task_layout.count() - 1, task_widget)
+        # Replace previous tasks
+        self.task_model.set_tasks((task.task_id, task.name) for task in workflow.tasks)
+        self._completed_count = 0
         
         # Reset progress
         self.progress_bar.setValue(0)
+        self._pending_log.clear()
         self.output_text.clear()
         
         # Create and start worker
@@ -211,6 +273,7 @@ class WorkflowWidget(QWidget):
         self.workflow_worker.task_completed.connect(self.on_task_completed)
         self.workflow_worker.task_failed.connect(self.on_task_failed)
         self.workflow_worker.workflow_completed.connect(self.on_workflow_completed)
+        self.workflow_worker.finished.connect(self.workflow_finished.emit)
         
         self.log_output(f"Starting workflow: {workflow.name}")
         self.log_output(f"Target: {target}")
@@ -220,33 +283,33 @@ class WorkflowWidget(QWidget):
         
     def on_task_started(self, task_id: str, task_name: str):
         """Handle task started"""
-        if task_id in self.task_widgets:
-            self.task_widgets[task_id].set_running()
+        self.task_model.set_task_status(task_id, TaskListModel.RUNNING)
         
         self.log_output(f"\n[STARTED] {task_name}")
         
     def on_task_completed(self, task_id: str, result: dict):
         """Handle task completed"""
-        if task_id in self.task_widgets:
-            self.task_widgets[task_id].set_completed()
-        
-        # Update progress
-        completed = sum(1 for w in self.task_widgets.values() 
-                       if w.status_text.text() in ["Completed", "Failed"])
-        progress = int((completed / len(self.task_widgets)) * 100)
-        self.progress_bar.setValue(progress)
+        if self.task_model.set_task_status(task_id, TaskListModel.COMPLETED):
+            self._advance_progress()
         
         self.log_output(f"[COMPLETED] {task_id}")
         if result.get("data"):
             import json
-            self.log_output(f"Results: {json.dumps(result['data'], indent=2)}")
+            lines = json.dumps(result['data'], indent=2).splitlines()
+            lines[0] = f"Results: {lines[0]}"
+            self.log_output_block(lines)
         
     def on_task_failed(self, task_id: str, error: str):
         """Handle task failed"""
-        if task_id in self.task_widgets:
-            self.task_widgets[task_id].set_failed(error)
+        if self.task_model.set_task_status(task_id, TaskListModel.FAILED, error):
+            self._advance_progress()
         
         self.log_output(f"[FAILED] {task_id}: {error}")
+
+    def _advance_progress(self):
+        """Count one more finished task and update the progress bar"""
+        self._completed_count += 1
+        self.progress_bar.setValue(self._completed_count * 100 // self.task_model.rowCount())
         
     def on_workflow_completed(self, results: dict):
         """Handle workflow completion"""
@@ -260,8 +323,43 @@ class WorkflowWidget(QWidget):
         
     def log_output(self, message: str):
         """Add message to output log"""
-        self.output_text.append(message)
-        self.output_text.moveCursor(QTextCursor.End)
+        self._pending_log.append(message)
+        self._schedule_log_flush()
+
+    def log_output_block(self, lines: List[str]):
+        """Add several lines to output log"""
+        self._pending_log.extend(lines)
+        self._schedule_log_flush()
+
+    def _schedule_log_flush(self):
+        """Coalesce log writes into one flush per LOG_FLUSH_INTERVAL"""
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+
+    def _flush_log(self):
+        """Write pending log lines as one edit"""
+        self._log_flush_timer.stop()
+        if not self._pending_log:
+            return
+
+        lines = self._pending_log
+        self._pending_log = []
+
+        scrollbar = self.output_text.verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
+
+        cursor = QTextCursor(self.output_text.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for line in lines:
+            if not self.output_text.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertText(line)
+        cursor.endEditBlock()
+
+        # Follow the output like appendPlainText does
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
         
     def set_return_callback(self, callback):
         """Set callback for return button"""
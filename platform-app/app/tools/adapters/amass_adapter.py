@@ -1,9 +1,13 @@
 """Amass tool adapter"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, IO, Iterable, List, Union
+import io
+import orjson
+import tempfile
 from pathlib import Path
 
+from app.utils.result_utils import save_results_async
+
 class AmassAdapter(BaseTool):
 
     def get_metadata(self) -> ToolMetadata:
@@ -13,7 +17,8 @@ class AmassAdapter(BaseTool):
             description="In-depth DNS enumeration and network mapping",
             executable="amass",
             requires_root=False,
-            default_timeout=900
+            default_timeout=900,
+            streams_output=True
         )
 
     def validate_parameters(self, params: Dict[str, Any]) -> bool:
@@ -43,57 +48,86 @@ class AmassAdapter(BaseTool):
 
     def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
         """Parse Amass JSON output with ASNs, IPs, and subdomains"""
+        return self._build_result(self._collect_subdomains(io.StringIO(output)), output)
+
+    def parse_stream(self, lines: Iterable[str]) -> Dict[str, Any]:
+        """Parse Amass JSON lines as they are read from the process"""
+        # Raw output is spooled to disk rather than kept in memory
+        raw = tempfile.TemporaryFile("w+")
+        try:
+            subdomains_list = self._collect_subdomains(self._tee(lines, raw))
+        except BaseException:
+            raw.close()
+            raise
+        raw.seek(0)
+
+        # The background save takes ownership of the spool file
+        return self._build_result(subdomains_list, raw)
+
+    @staticmethod
+    def _tee(lines: Iterable[str], sink: IO[str]) -> Iterable[str]:
+        """Yield lines while copying them to sink"""
+        for line in lines:
+            sink.write(line)
+            yield line
+
+    def _collect_subdomains(self, lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """Merge Amass JSON lines into one entry per subdomain"""
         subdomains_data = {}
 
-        for line in output.strip().split('\n'):
+        for line in lines:
+            line = line.strip()
             if line:
                 try:
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     subdomain_name = data.get("name")
 
                     if not subdomain_name:
                         continue
 
-                    # Extract IPs
-                    ips = []
-                    if "addresses" in data:
-                        for addr in data["addresses"]:
-                            if "ip" in addr:
-                                ips.append(addr["ip"])
-
-                    # Extract ASNs
-                    asns = []
-                    if "addresses" in data:
-                        for addr in data["addresses"]:
-                            if "asn" in addr and addr["asn"]:
-                                asn_str = f"AS{addr['asn']}" if not str(addr['asn']).startswith("AS") else str(addr['asn'])
-                                if asn_str not in asns:
-                                    asns.append(asn_str)
-
-                    # If subdomain already exists, merge data
-                    if subdomain_name in subdomains_data:
-                        existing_ips = set(subdomains_data[subdomain_name].get("ips", []))
-                        existing_asns = set(subdomains_data[subdomain_name].get("asns", []))
-
-                        subdomains_data[subdomain_name]["ips"] = list(existing_ips | set(ips))
-                        subdomains_data[subdomain_name]["asns"] = list(existing_asns | set(asns))
-                    else:
-                        subdomains_data[subdomain_name] = {
+                    # Accumulate into sets; lists are built once at the end
+                    entry = subdomains_data.get(subdomain_name)
+                    if entry is None:
+                        entry = subdomains_data[subdomain_name] = {
                             "name": subdomain_name,
-                            "ips": ips,
-                            "asns": asns,
+                            "ips": set(),
+                            "asns": set(),
                             "source": data.get("source", "amass")
                         }
 
-                except json.JSONDecodeError:
+                    # Extract IPs and ASNs
+                    addresses = data.get("addresses")
+                    if addresses:
+                        add_ip = entry["ips"].add
+                        add_asn = entry["asns"].add
+                        for addr in addresses:
+                            try:
+                                add_ip(addr["ip"])
+                            except KeyError:
+                                pass
+                            asn = addr.get("asn")
+                            if asn:
+                                asn_str = str(asn)
+                                add_asn(asn_str if asn_str.startswith("AS") else f"AS{asn_str}")
+
+                except orjson.JSONDecodeError:
                     continue
                 except Exception as e:
                     # Log error but continue processing
                     continue
 
         # Convert to list
-        subdomains_list = list(subdomains_data.values())
+        subdomains_list = []
+        for entry in subdomains_data.values():
+            entry["ips"] = list(entry["ips"])
+            entry["asns"] = list(entry["asns"])
+            subdomains_list.append(entry)
+
+        return subdomains_list
 
+    def _build_result(self, subdomains_list: List[Dict[str, Any]],
+                      raw_output: Union[str, IO[str]]) -> Dict[str, Any]:
+        """Save the results and build the parsed output"""
         # Save raw and parsed output to files
         domain = None
         for subdomain in subdomains_list:
@@ -104,34 +138,25 @@ class AmassAdapter(BaseTool):
                 break
 
         if domain:
-            self._save_results(domain, output, subdomains_list)
+            self._save_results(domain, raw_output, subdomains_list)
+        elif not isinstance(raw_output, str):
+            raw_output.close()
 
         return {
             "subdomains": subdomains_list,
             "count": len(subdomains_list)
         }
 
-    def _save_results(self, domain: str, raw_output: str, parsed_data: List[Dict]):
-        """Save raw and parsed results to files"""
+    def _save_results(self, domain: str, raw_output: Union[str, IO[str]], parsed_data: List[Dict]):
+        """Save raw and parsed results to files in the background"""
+        base_dir = Path("data/scans") / domain
         try:
-            # Create directory structure
-            base_dir = Path("data/scans") / domain
-            raw_dir = base_dir / "raw" / "amass"
-            parsed_dir = base_dir / "parsed" / "amass"
-
-            raw_dir.mkdir(parents=True, exist_ok=True)
-            parsed_dir.mkdir(parents=True, exist_ok=True)
-
-            # Save raw output
-            raw_file = raw_dir / "output.json"
-            with open(raw_file, 'w') as f:
-                f.write(raw_output)
-
-            # Save parsed output
-            parsed_file = parsed_dir / "results.json"
-            with open(parsed_file, 'w') as f:
-                json.dump(parsed_data, f, indent=2)
-
+            save_results_async(
+                raw_output,
+                base_dir / "raw" / "amass" / "output.json",
+                parsed_data,
+                base_dir / "parsed" / "amass" / "results.json"
+            )
         except Exception as e:
             # Silently fail if file saving fails - don't break the workflow
-            pass
\ No newline at end of file
+            pass
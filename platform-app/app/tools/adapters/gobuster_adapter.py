@@ -1,6 +1,15 @@
 """Gobuster tool adapter"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
 from typing import Dict, Any, List
+import re
+
+# One directory finding per line, e.g.
+#   /admin                (Status: 301) [Size: 178] [--> http://host/admin/]
+# Older releases print "/admin (Status: 301)" without a size
+_DIR_LINE_RE = re.compile(
+    r'^\s*(/\S*)\s+\((?:Status:\s*)?(\d+)\)(?:\s*\[Size:\s*(\d+)\])?',
+    re.MULTILINE
+)
 
 class GobusterAdapter(BaseTool):
     
@@ -49,18 +58,15 @@ class GobusterAdapter(BaseTool):
         return cmd
     
     def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
-        findings = []
-        
-        for line in output.split('\n'):
-            if line.startswith('/') or 'Found:' in line:
-                # Parse directory/file findings
-                parts = line.split()
-                if len(parts) >= 3:
-                    findings.append({
-                        "path": parts[0],
-                        "status": parts[1].strip('()'),
-                        "size": parts[2] if len(parts) > 2 else ""
-                    })
+        # Directory/file findings, matched in one sweep over the output
+        findings = [
+            {
+                "path": match.group(1),
+                "status": match.group(2),
+                "size": match.group(3) or ""
+            }
+            for match in _DIR_LINE_RE.finditer(output)
+        ]
         
         return {
             "findings": findings,
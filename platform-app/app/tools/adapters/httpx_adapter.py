@@ -1,7 +1,8 @@
 """HTTPx tool adapter"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
 from typing import Dict, Any, List
-import json
+import io
+import orjson
 
 class HttpxAdapter(BaseTool):
     
@@ -40,10 +41,11 @@ class HttpxAdapter(BaseTool):
     def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
         results = []
         
-        for line in output.strip().split('\n'):
+        for line in io.StringIO(output):
+            line = line.strip()
             if line:
                 try:
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     results.append({
                         "url": data.get("url"),
                         "status_code": data.get("status_code"),
@@ -1,9 +1,13 @@
 """Masscan tool adapter - high-speed port scanner"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
-from typing import Dict, Any, List
-import json
+from typing import Dict, Any, Iterator, List
+import io
+import orjson
+import time
 from pathlib import Path
 
+from app.utils.result_utils import save_results_async
+
 class MasscanAdapter(BaseTool):
 
     def get_metadata(self) -> ToolMetadata:
@@ -13,7 +17,8 @@ class MasscanAdapter(BaseTool):
             description="Ultra-fast TCP port scanner for large-scale networks",
             executable="masscan",
             requires_root=True,  # Masscan requires root for raw sockets
-            default_timeout=1800  # 30 minutes for large scans
+            default_timeout=1800,  # 30 minutes for large scans
+            supports_parallel=False  # Saturates the link; runs alone
         )
 
     def validate_parameters(self, params: Dict[str, Any]) -> bool:
@@ -61,42 +66,37 @@ class MasscanAdapter(BaseTool):
         """Parse masscan JSON output into structured host/port data"""
         hosts_dict = {}
 
-        for line in output.strip().split('\n'):
-            if not line or line.startswith('#'):
-                continue
-
+        for data in self._iter_records(output):
             try:
-                data = json.loads(line.rstrip(','))
-
                 ip = data.get("ip")
                 if not ip:
                     continue
 
-                # Initialize host if not seen
-                if ip not in hosts_dict:
-                    hosts_dict[ip] = {
+                # Initialize host if not seen; one lookup per record
+                host = hosts_dict.get(ip)
+                if host is None:
+                    host = hosts_dict[ip] = {
                         "ip": ip,
                         "ports": []
                     }
+                append_port = host["ports"].append
 
                 # Extract port information
-                if "ports" in data:
-                    for port_info in data["ports"]:
-                        port_entry = {
-                            "port": port_info.get("port"),
-                            "protocol": port_info.get("proto", "tcp"),
-                            "state": port_info.get("status", "open"),
-                            "service": None  # Masscan doesn't detect service names
-                        }
-
-                        # Add banner if available
-                        if "service" in port_info:
-                            port_entry["banner"] = port_info["service"].get("banner", "")
-
-                        hosts_dict[ip]["ports"].append(port_entry)
-
-            except json.JSONDecodeError:
-                continue
+                for port_info in data.get("ports") or ():
+                    port_entry = {
+                        "port": port_info.get("port"),
+                        "protocol": port_info.get("proto", "tcp"),
+                        "state": port_info.get("status", "open"),
+                        "service": None  # Masscan doesn't detect service names
+                    }
+
+                    # Add banner if available
+                    service = port_info.get("service")
+                    if service is not None:
+                        port_entry["banner"] = service.get("banner", "")
+
+                    append_port(port_entry)
+
             except Exception:
                 continue
 
@@ -112,27 +112,39 @@ class MasscanAdapter(BaseTool):
             "total_ports": sum(len(h["ports"]) for h in hosts_list)
         }
 
+    @staticmethod
+    def _iter_records(output: str) -> Iterator[Any]:
+        """Yield the JSON records in masscan output"""
+        # Well-formed -oJ output is a single array, decoded in one call
+        if output.lstrip().startswith('['):
+            try:
+                records = orjson.loads(output)
+            except orjson.JSONDecodeError:
+                # Older masscan releases leave a trailing comma before ']'
+                records = None
+            if isinstance(records, list):
+                yield from records
+                return
+
+        for line in io.StringIO(output):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                yield orjson.loads(line.rstrip(','))
+            except orjson.JSONDecodeError:
+                continue
+
     def _save_results(self, parsed_data: List[Dict], raw_output: str):
-        """Save masscan results to files"""
+        """Save masscan results to files in the background"""
         try:
             base_dir = Path("data/scans/masscan")
-            raw_dir = base_dir / "raw"
-            parsed_dir = base_dir / "parsed"
-
-            raw_dir.mkdir(parents=True, exist_ok=True)
-            parsed_dir.mkdir(parents=True, exist_ok=True)
-
-            # Save raw JSON output
-            import time
             timestamp = int(time.time())
-            raw_file = raw_dir / f"scan_{timestamp}.json"
-            with open(raw_file, 'w') as f:
-                f.write(raw_output)
-
-            # Save parsed output
-            parsed_file = parsed_dir / f"results_{timestamp}.json"
-            with open(parsed_file, 'w') as f:
-                json.dump(parsed_data, f, indent=2)
-
+            save_results_async(
+                raw_output,
+                base_dir / "raw" / f"scan_{timestamp}.json",
+                parsed_data,
+                base_dir / "parsed" / f"results_{timestamp}.json"
+            )
         except Exception:
             pass
@@ -1,9 +1,25 @@
 """Metasploit Framework adapter for exploitation"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
 from typing import Dict, Any, List
-import tempfile
+import itertools
 import re
-import os
+import shlex
+
+# "Meterpreter session 1 opened ..." lines; group 1 is the session id
+_SESSION_OPEN_RE = re.compile(r'session\s+(\d+)\s+opened', re.IGNORECASE)
+_FINDING_PREFIX = '[+]'
+
+# Params that are not passed to msfconsole as `set` options
+_NON_OPTION_PARAMS = frozenset(("module", "payload", "timeout"))
+_NEEDS_QUOTING = frozenset(' \t"\'')
+
+
+def _quote_value(value: Any) -> str:
+    """Quote option values that the console would split or mangle"""
+    value = str(value)
+    if _NEEDS_QUOTING.isdisjoint(value):
+        return value
+    return shlex.quote(value)
 
 
 class MetasploitAdapter(BaseTool):
@@ -25,32 +41,17 @@ class MetasploitAdapter(BaseTool):
     def build_command(self, params: Dict[str, Any]) -> List[str]:
         """Build msfconsole command with module and options"""
         module = params["module"]
-
-        # Build MSF commands
-        commands = [f"use {module}"]
-
-        # Set payload if specified
-        if "payload" in params:
-            commands.append(f"set PAYLOAD {params['payload']}")
-
-        # Set all other options (excluding module and payload)
-        for key, value in params.items():
-            if key not in ["module", "payload", "timeout"]:
-                # Convert to MSF option format (uppercase)
-                msf_key = key.upper()
-                commands.append(f"set {msf_key} {value}")
-
-        # Run the module
-        if "exploit" in module:
-            commands.append("exploit")
-        else:
-            commands.append("run")
-
-        # Exit after execution
-        commands.append("exit")
-
-        # Build command string
-        command_string = "; ".join(commands)
+        payload = params.get("payload")
+
+        # Build MSF commands: use, PAYLOAD, other options (uppercase), run, exit
+        command_string = "; ".join(itertools.chain(
+            (f"use {module}",),
+            (f"set PAYLOAD {payload}",) if payload else (),
+            (f"set {key.upper()} {_quote_value(value)}"
+             for key, value in params.items() if key not in _NON_OPTION_PARAMS),
+            ("exploit" if "exploit" in module else "run",),
+            ("exit",)
+        ))
 
         # Return msfconsole with quiet mode and execute commands
         cmd = [
@@ -68,22 +69,20 @@ class MetasploitAdapter(BaseTool):
         session_opened = False
 
         # Extract findings (lines starting with [+])
-        for line in output.split('\n'):
+        for line in output.splitlines():
             line = line.strip()
 
-            if line.startswith('[+]'):
-                findings.append(line[3:].strip())
+            if line.startswith(_FINDING_PREFIX):
+                findings.append(line[len(_FINDING_PREFIX):].strip())
 
             # Detect session openings
-            if 'session' in line.lower() and 'opened' in line.lower():
+            session_match = _SESSION_OPEN_RE.search(line)
+            if session_match:
                 session_opened = True
-                # Extract session info
-                session_match = re.search(r'session (\d+)', line, re.IGNORECASE)
-                if session_match:
-                    sessions.append({
-                        "id": session_match.group(1),
-                        "info": line
-                    })
+                sessions.append({
+                    "id": session_match.group(1),
+                    "info": line
+                })
 
         return {
             "module_output": output,
@@ -1,12 +1,58 @@
 """Nmap tool adapter"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
-from typing import Dict, Any, List
-import xml.etree.ElementTree as ET
-import json
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import IO, Dict, Any, Iterator, List, Optional, Union
+import atexit
+import io
+import tempfile
+import threading
+import orjson
+
+# lxml parses with libxml2 in C; the stdlib parser is the fallback
+try:
+    from lxml import etree as ET
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAVE_LXML = False
 from pathlib import Path
 
+from app.utils.result_utils import save_results
+
+# Domain of the run in progress. A context variable rather than an
+# attribute, so one adapter instance can serve parallel tasks and
+# concurrent execute_async() calls
+_current_domain: ContextVar[Optional[str]] = ContextVar("nmap_current_domain", default=None)
+
+class _TeeReader:
+    """Binary reader that copies everything read from source into sink"""
+
+    def __init__(self, source: IO[bytes], sink: IO[bytes]):
+        self._source = source
+        self._sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._source.read(size)
+        self._sink.write(data)
+        return data
+
+    def drain(self):
+        """Read whatever the parser left behind"""
+        while self.read(65536):
+            pass
+
+
 class NmapAdapter(BaseTool):
 
+    # Parsed subdomains.json by path, validated by (mtime_ns, size) so an
+    # unchanged file is not decoded again on the next run
+    SUBDOMAINS_CACHE_SIZE = 8
+    _subdomains_cache: "OrderedDict[Path, tuple]" = OrderedDict()
+    _subdomains_lock = threading.Lock()
+    # subdomains.json path -> accumulated {ip: {port: service}} not yet written
+    _pending_ports: Dict[Path, Dict[str, Dict]] = {}
+
     def get_metadata(self) -> ToolMetadata:
         return ToolMetadata(
             name="nmap",
@@ -14,7 +60,10 @@ class NmapAdapter(BaseTool):
             description="Network exploration and security auditing",
             executable="nmap",
             requires_root=True,
-            default_timeout=600
+            default_timeout=600,
+            supports_parallel=False,  # Raw-socket scans run alone
+            streams_output=True,  # XML is parsed while nmap is still scanning
+            bytes_output=True  # XML goes to the parser and disk as bytes
         )
 
     def validate_parameters(self, params: Dict[str, Any]) -> bool:
@@ -61,33 +110,60 @@ class NmapAdapter(BaseTool):
 
         return cmd
 
-    def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
+    def parse_output(self, output: Union[bytes, str], stderr: str,
+                     return_code: int) -> Dict[str, Any]:
         """Parse nmap XML output with service fingerprints for exploit lookup"""
         try:
-            root = ET.fromstring(output)
-        except:
-            return {"error": "Failed to parse nmap XML output", "hosts": [], "services": []}
-
+            collected = self._collect_hosts(output)
+        except ET.ParseError:
+            return self._parse_error()
+        return self._build_result(*collected, output)
+
+    def parse_stream(self, stdout: IO[bytes]) -> Dict[str, Any]:
+        """Parse nmap XML as it is read from the process"""
+        # Raw XML is spooled to disk as it streams past, not kept in memory
+        raw = tempfile.TemporaryFile("w+b")
+        reader = _TeeReader(stdout, raw)
+        try:
+            try:
+                collected = self._collect_hosts(reader)
+            except ET.ParseError:
+                # Keep reading so nmap never blocks on a full pipe
+                reader.drain()
+                raw.close()
+                return self._parse_error()
+        except BaseException:
+            raw.close()
+            raise
+        raw.seek(0)
+
+        # Saving takes ownership of the spool file
+        return self._build_result(*collected, raw)
+
+    @staticmethod
+    def _parse_error() -> Dict[str, Any]:
+        return {"error": "Failed to parse nmap XML output", "hosts": [], "services": []}
+
+    def _collect_hosts(self, source: Union[bytes, str, IO[bytes]]):
+        """Extract hosts with open ports, service fingerprints and the IP->ports map"""
         hosts = []
         services = []  # NEW: Collect all services for fingerprinting
         ip_port_map = {}
 
-        for host_elem in root.findall('.//host'):
-            address_elem = host_elem.find('.//address[@addrtype="ipv4"]')
+        for host_elem in self._iter_hosts(source):
+            address_elem, hostname_elem, port_elems = self._scan_host(host_elem)
             if address_elem is None:
                 continue
 
             host_ip = address_elem.get('addr')
-            hostname_elem = host_elem.find('.//hostname')
             hostname = hostname_elem.get('name') if hostname_elem is not None else None
 
             ports = []
             ports_dict = {}
 
-            for port_elem in host_elem.findall('.//port'):
-                state_elem = port_elem.find('.//state')
+            for port_elem in port_elems:
+                state_elem, service_elem = self._scan_port(port_elem)
                 if state_elem is not None and state_elem.get('state') == 'open':
-                    service_elem = port_elem.find('.//service')
                     port_num = int(port_elem.get('portid'))
                     service_name = service_elem.get('name') if service_elem is not None else 'unknown'
                     service_product = service_elem.get('product', '') if service_elem is not None else ''
@@ -134,16 +210,22 @@ class NmapAdapter(BaseTool):
 
                 # Store port mapping for this IP
                 ip_port_map[host_ip] = ports_dict
+        return hosts, services, ip_port_map
 
+    def _build_result(self, hosts: List[Dict], services: List[Dict], ip_port_map: Dict[str, Dict],
+                      raw_output: Union[bytes, str, IO[bytes]]) -> Dict[str, Any]:
+        """Save results for the current domain and build the parsed data"""
         # Extract domain for file operations
         domain = self._extract_domain_from_params()
 
         if domain:
             # Save raw and parsed nmap output
-            self._save_nmap_results(domain, output, hosts)
+            self._save_nmap_results(domain, raw_output, hosts)
 
             # Update subdomains.json with port information
             self._update_subdomains_with_ports(domain, ip_port_map)
+        elif not isinstance(raw_output, (bytes, str)):
+            raw_output.close()
 
         return {
             "hosts": hosts,
@@ -153,76 +235,184 @@ class NmapAdapter(BaseTool):
             "ip_port_map": ip_port_map
         }
 
-    def _extract_domain_from_params(self) -> str:
+    @staticmethod
+    def _iter_hosts(output: Union[bytes, str, IO[bytes]]) -> Iterator[Any]:
+        """Yield <host> elements as they are parsed, freeing each afterwards"""
+        if isinstance(output, str):
+            output = output.encode('utf-8')
+        source = io.BytesIO(output) if isinstance(output, bytes) else output
+        if HAVE_LXML:
+            for _, elem in ET.iterparse(source, events=('end',), tag='host',
+                                        resolve_entities=False):
+                yield elem
+                elem.clear()
+                # Drop already-processed siblings from the root too
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+        else:
+            # ElementTree has no getprevious(); track depth instead so
+            # finished top-level elements can be detached from the root
+            root = None
+            depth = 0
+            for event, elem in ET.iterparse(source, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if elem.tag == 'host':
+                    yield elem
+                    elem.clear()
+                if depth == 1:
+                    root.remove(elem)
+
+    @staticmethod
+    def _scan_host(host_elem):
+        """Find a host's IPv4 address, first hostname and ports
+
+        nmap's schema is shallow, so only the host's children and the
+        <hostnames>/<ports> containers are visited; script output nested
+        under ports is never walked. This plain loop is also faster than
+        compiled lxml XPath here, whose per-call setup outweighs the
+        handful of children it would skip.
+        """
+        address_elem = hostname_elem = None
+        port_elems = []
+        for child in host_elem:
+            tag = child.tag
+            if tag == 'ports':
+                port_elems.extend(elem for elem in child if elem.tag == 'port')
+            elif tag == 'address':
+                if address_elem is None and child.get('addrtype') == 'ipv4':
+                    address_elem = child
+            elif tag == 'hostnames' and hostname_elem is None:
+                hostname_elem = child.find('hostname')
+        return address_elem, hostname_elem, port_elems
+
+    @staticmethod
+    def _scan_port(port_elem):
+        """Find a port's state and service elements among its children"""
+        state_elem = service_elem = None
+        for child in port_elem:
+            if child.tag == 'state':
+                if state_elem is None:
+                    state_elem = child
+            elif child.tag == 'service' and service_elem is None:
+                service_elem = child
+        return state_elem, service_elem
+
+    def _extract_domain_from_params(self) -> Optional[str]:
         """Extract domain from current execution context"""
-        # Domain is stored in instance variable during execute()
-        return getattr(self, '_current_domain', None)
+        # Domain is set for the duration of execute()
+        return _current_domain.get()
 
     def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Override execute to capture domain parameter"""
         # Store domain for later use in parse_output
-        self._current_domain = params.get("domain")
-        return super().execute(params)
-
-    def _save_nmap_results(self, domain: str, raw_output: str, parsed_data: List[Dict]):
-        """Save raw and parsed nmap results to files"""
+        token = _current_domain.set(params.get("domain"))
         try:
-            # Create directory structure
-            base_dir = Path("data/scans") / domain
-            raw_dir = base_dir / "raw" / "nmap"
-            parsed_dir = base_dir / "parsed" / "nmap"
-
-            raw_dir.mkdir(parents=True, exist_ok=True)
-            parsed_dir.mkdir(parents=True, exist_ok=True)
-
-            # Save raw XML output
-            raw_file = raw_dir / "output.xml"
-            with open(raw_file, 'w') as f:
-                f.write(raw_output)
-
-            # Save parsed output
-            parsed_file = parsed_dir / "results.json"
-            with open(parsed_file, 'w') as f:
-                json.dump(parsed_data, f, indent=2)
-
-        except Exception as e:
-            # Silently fail if file saving fails - don't break the workflow
-            pass
+            return super().execute(params)
+        finally:
+            _current_domain.reset(token)
 
-    def _update_subdomains_with_ports(self, domain: str, ip_port_map: Dict[str, Dict]):
-        """Update subdomains.json with port information"""
+    async def execute_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Override execute_async to capture domain parameter"""
+        token = _current_domain.set(params.get("domain"))
         try:
-            subdomains_file = Path("data/scans") / domain / "final" / "subdomains.json"
-
-            if not subdomains_file.exists():
-                return
-
-            # Read existing subdomains data
-            with open(subdomains_file, 'r') as f:
-                subdomains_data = json.load(f)
-
-            # Update each subdomain with port information based on its IPs
-            for subdomain in subdomains_data:
-                subdomain_ips = subdomain.get("ips", [])
-
-                # Ensure ips is a list
-                if not isinstance(subdomain_ips, list):
-                    subdomain_ips = [subdomain_ips]
-
-                # Collect all ports for this subdomain's IPs
-                all_ports = {}
-                for ip in subdomain_ips:
-                    if ip in ip_port_map:
-                        all_ports.update(ip_port_map[ip])
+            return await super().execute_async(params)
+        finally:
+            _current_domain.reset(token)
 
-                # Add ports to subdomain
-                if all_ports:
-                    subdomain["ports"] = all_ports
-
-            # Save updated subdomains data
-            with open(subdomains_file, 'w') as f:
-                json.dump(subdomains_data, f, indent=2)
+    def _save_nmap_results(self, domain: str, raw_output: Union[bytes, str, IO[bytes]],
+                           parsed_data: List[Dict]):
+        """Save raw and parsed nmap results to files"""
+        base_dir = Path("data/scans") / domain
+        save_results(
+            raw_output,
+            base_dir / "raw" / "nmap" / "output.xml",
+            parsed_data,
+            base_dir / "parsed" / "nmap" / "results.json"
+        )
 
-        except Exception as e:
-            # Silently fail if update fails - don't break the workflow
-            pass
\ No newline at end of file
+    def _update_subdomains_with_ports(self, domain: str, ip_port_map: Dict[str, Dict]):
+        """Queue port information for subdomains.json
+
+        Updates are held in memory and written by flush_subdomain_ports(),
+        so several nmap runs against one domain cost a single rewrite.
+        """
+        subdomains_file = (Path("data/scans") / domain / "final" / "subdomains.json").absolute()
+        with self._subdomains_lock:
+            pending = self._pending_ports.setdefault(subdomains_file, {})
+            for ip, ports in ip_port_map.items():
+                pending.setdefault(ip, {}).update(ports)
+
+    def flush_deferred(self):
+        """Write coalesced subdomains.json port updates"""
+        self.flush_subdomain_ports()
+
+    @classmethod
+    def flush_subdomain_ports(cls):
+        """Write queued port information into each subdomains.json"""
+        with cls._subdomains_lock:
+            pending, cls._pending_ports = cls._pending_ports, {}
+            for subdomains_file, ip_port_map in pending.items():
+                try:
+                    cls._merge_subdomain_ports(subdomains_file, ip_port_map)
+                except Exception as e:
+                    # Silently fail if update fails - don't break the workflow
+                    pass
+
+    @classmethod
+    def _merge_subdomain_ports(cls, subdomains_file: Path, ip_port_map: Dict[str, Dict]):
+        """Merge ports into subdomains.json, rewriting it only if something changed"""
+        cache = cls._subdomains_cache
+        try:
+            stat = subdomains_file.stat()
+        except FileNotFoundError:
+            cache.pop(subdomains_file, None)
+            return
+
+        # Reuse the parsed file while it is unchanged on disk
+        cached = cache.get(subdomains_file)
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            subdomains_data = cached[1]
+            cache.move_to_end(subdomains_file)
+        else:
+            subdomains_data = orjson.loads(subdomains_file.read_bytes())
+
+        # Update each subdomain with port information based on its IPs
+        mutated = False
+        for subdomain in subdomains_data:
+            subdomain_ips = subdomain.get("ips", [])
+
+            # Ensure ips is a list
+            if not isinstance(subdomain_ips, list):
+                subdomain_ips = [subdomain_ips]
+
+            # Collect all ports for this subdomain's IPs
+            all_ports = {}
+            for ip in subdomain_ips:
+                if ip in ip_port_map:
+                    all_ports.update(ip_port_map[ip])
+
+            # Add ports to subdomain
+            if all_ports and subdomain.get("ports") != all_ports:
+                subdomain["ports"] = all_ports
+                mutated = True
+
+        if mutated:
+            # Drop the entry first; a failed write leaves it out of the cache
+            cache.pop(subdomains_file, None)
+            subdomains_file.write_bytes(orjson.dumps(subdomains_data, option=orjson.OPT_INDENT_2))
+            stat = subdomains_file.stat()
+
+        cache[subdomains_file] = ((stat.st_mtime_ns, stat.st_size), subdomains_data)
+        cache.move_to_end(subdomains_file)
+        while len(cache) > cls.SUBDOMAINS_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+# Port updates not written by the workflow engine are saved on exit
+atexit.register(NmapAdapter.flush_subdomain_ports)
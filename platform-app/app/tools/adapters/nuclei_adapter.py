@@ -1,5 +1,5 @@
 """Nuclei tool adapter"""
-from app.tools.base import BaseTool, ToolMetadata, ToolCategory
+from app.tools.base import BaseTool, ToolMetadata, ToolCategory, scratch_path
 from typing import Dict, Any, List
 import json
 
@@ -24,10 +24,9 @@ class NucleiAdapter(BaseTool):
         if "url" in params:
             cmd.extend(["-u", params["url"]])
         elif "urls" in params:
-            import tempfile
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt') as f:
-                f.write('\n'.join(params["urls"]))
-                cmd.extend(["-list", f.name])
+            url_list = scratch_path('.txt')
+            url_list.write_text('\n'.join(params["urls"]))
+            cmd.extend(["-list", str(url_list)])
         
         templates = params.get("templates", ["cves", "vulnerabilities"])
         for template in templates:
@@ -41,7 +40,7 @@ class NucleiAdapter(BaseTool):
     def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
         findings = []
         
-        for line in output.strip().split('\n'):
+        for line in output.splitlines():
             if line:
                 try:
                     data = json.loads(line)
@@ -3,6 +3,21 @@ from app.tools.base import BaseTool, ToolMetadata, ToolCategory
 from typing import Dict, Any, List
 import re
 
+_PARAM_RE = re.compile(r"Parameter: (.*?) \(.*?\) is vulnerable")
+
+# Injection types in report order; one group per type
+_INJECTION_TYPES = ("Boolean-based blind", "Time-based blind", "Error-based", "UNION query")
+_INJECTION_TYPE_RE = re.compile(
+    "(boolean-based blind)|(time-based blind)|(error-based)|(UNION query)"
+)
+
+# "available databases [N]:" and the bracketed lines that follow it;
+# log lines like "[12:00:00] [INFO] ..." may be interleaved with the list
+_DB_BLOCK_RE = re.compile(
+    r"available databases[^\n]*\n((?:[ \t]*\[[^\n]*(?:\n|$))*)", re.IGNORECASE
+)
+_DB_LINE_RE = re.compile(r"^[ \t]*\[\*\][ \t]*(\S[^\n]*?)[ \t\r]*$", re.MULTILINE)
+
 class SqlmapAdapter(BaseTool):
     
     def get_metadata(self) -> ToolMetadata:
@@ -49,37 +64,24 @@ class SqlmapAdapter(BaseTool):
         vulnerabilities = []
         
         # Look for vulnerable parameters
-        param_pattern = r"Parameter: (.*?) \(.*?\) is vulnerable"
-        for match in re.finditer(param_pattern, output):
+        for match in _PARAM_RE.finditer(output):
             vulnerabilities.append({
                 "parameter": match.group(1),
                 "type": "SQL Injection"
             })
         
         # Look for injection types
-        injection_types = []
-        if "boolean-based blind" in output:
-            injection_types.append("Boolean-based blind")
-        if "time-based blind" in output:
-            injection_types.append("Time-based blind")
-        if "error-based" in output:
-            injection_types.append("Error-based")
-        if "UNION query" in output:
-            injection_types.append("UNION query")
+        found = set()
+        for match in _INJECTION_TYPE_RE.finditer(output):
+            found.add(match.lastindex - 1)
+            if len(found) == len(_INJECTION_TYPES):
+                break
+        injection_types = [name for i, name in enumerate(_INJECTION_TYPES) if i in found]
         
         # Look for databases
         databases = []
-        if "[*]" in output:
-            db_section = False
-            for line in output.split('\n'):
-                if "available databases" in line.lower():
-                    db_section = True
-                elif db_section and line.strip().startswith("[*]"):
-                    db_name = line.strip().replace("[*]", "").strip()
-                    if db_name:
-                        databases.append(db_name)
-                elif db_section and not line.strip().startswith("["):
-                    db_section = False
+        for block in _DB_BLOCK_RE.finditer(output):
+            databases.extend(_DB_LINE_RE.findall(block.group(1)))
         
         is_vulnerable = len(vulnerabilities) > 0
         
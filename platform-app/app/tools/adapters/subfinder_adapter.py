@@ -1,9 +1,11 @@
 """Subfinder tool adapter"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
 from typing import Dict, Any, List
-import json
+import orjson
 from pathlib import Path
 
+from app.utils.result_utils import save_results
+
 class SubfinderAdapter(BaseTool):
 
     def get_metadata(self) -> ToolMetadata:
@@ -42,43 +44,44 @@ class SubfinderAdapter(BaseTool):
         """Parse Subfinder JSON output with IPs"""
         subdomains_data = {}
 
-        for line in output.strip().split('\n'):
+        for line in output.splitlines():
             if line:
                 try:
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     subdomain_name = data.get("host")
 
                     if not subdomain_name:
                         continue
 
-                    # Extract IP if available
-                    ips = []
-                    if "ip" in data and data["ip"]:
-                        # Subfinder can return a single IP or array
-                        if isinstance(data["ip"], list):
-                            ips = data["ip"]
-                        else:
-                            ips = [data["ip"]]
-
-                    # If subdomain already exists, merge IPs
-                    if subdomain_name in subdomains_data:
-                        existing_ips = set(subdomains_data[subdomain_name].get("ips", []))
-                        subdomains_data[subdomain_name]["ips"] = list(existing_ips | set(ips))
-                    else:
-                        subdomains_data[subdomain_name] = {
+                    # Accumulate IPs in an insertion-ordered dict so output is
+                    # stable across runs; lists are built once at the end
+                    entry = subdomains_data.get(subdomain_name)
+                    if entry is None:
+                        entry = subdomains_data[subdomain_name] = {
                             "name": subdomain_name,
-                            "ips": ips,
+                            "ips": {},
                             "source": data.get("source", "subfinder")
                         }
 
-                except json.JSONDecodeError:
+                    # Subfinder can return a single IP or array
+                    ip = data.get("ip")
+                    if ip:
+                        if isinstance(ip, list):
+                            entry["ips"].update(dict.fromkeys(ip))
+                        else:
+                            entry["ips"][ip] = None
+
+                except orjson.JSONDecodeError:
                     continue
                 except Exception as e:
                     # Log error but continue processing
                     continue
 
         # Convert to list
-        subdomains_list = list(subdomains_data.values())
+        subdomains_list = []
+        for entry in subdomains_data.values():
+            entry["ips"] = list(entry["ips"])
+            subdomains_list.append(entry)
 
         # Save raw and parsed output to files
         domain = None
@@ -99,25 +102,10 @@ class SubfinderAdapter(BaseTool):
 
     def _save_results(self, domain: str, raw_output: str, parsed_data: List[Dict]):
         """Save raw and parsed results to files"""
-        try:
-            # Create directory structure
-            base_dir = Path("data/scans") / domain
-            raw_dir = base_dir / "raw" / "subfinder"
-            parsed_dir = base_dir / "parsed" / "subfinder"
-
-            raw_dir.mkdir(parents=True, exist_ok=True)
-            parsed_dir.mkdir(parents=True, exist_ok=True)
-
-            # Save raw output
-            raw_file = raw_dir / "output.json"
-            with open(raw_file, 'w') as f:
-                f.write(raw_output)
-
-            # Save parsed output
-            parsed_file = parsed_dir / "results.json"
-            with open(parsed_file, 'w') as f:
-                json.dump(parsed_data, f, indent=2)
-
-        except Exception as e:
-            # Silently fail if file saving fails - don't break the workflow
-            pass
\ No newline at end of file
+        base_dir = Path("data/scans") / domain
+        save_results(
+            raw_output,
+            base_dir / "raw" / "subfinder" / "output.json",
+            parsed_data,
+            base_dir / "parsed" / "subfinder" / "results.json"
+        )
@@ -1,9 +1,10 @@
 """Sublist3r tool adapter"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
 from typing import Dict, Any, List
-import json
 from pathlib import Path
 
+from app.utils.result_utils import save_results
+
 class Sublist3rAdapter(BaseTool):
 
     def get_metadata(self) -> ToolMetadata:
@@ -42,16 +43,19 @@ class Sublist3rAdapter(BaseTool):
 
     def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
         """Parse Sublist3r text output into structured subdomain list"""
-        subdomains_list = []
-
-        for line in output.strip().split('\n'):
-            line = line.strip()
-            if line and not line.startswith('['):  # Filter out log lines
-                subdomains_list.append({
-                    "name": line,
-                    "ips": [],  # Sublist3r doesn't provide IPs by default
-                    "source": "sublist3r"
-                })
+        # Sublist3r can list a name more than once; keep first-seen order
+        names = dict.fromkeys(
+            line for line in map(str.strip, output.splitlines())
+            if line and not line.startswith('[')  # Filter out log lines
+        )
+        subdomains_list = [
+            {
+                "name": name,
+                "ips": [],  # Sublist3r doesn't provide IPs by default
+                "source": "sublist3r"
+            }
+            for name in names
+        ]
 
         # Save results
         if subdomains_list:
@@ -66,23 +70,10 @@ class Sublist3rAdapter(BaseTool):
 
     def _save_results(self, domain: str, raw_output: str, parsed_data: List[Dict]):
         """Save raw and parsed results to files"""
-        try:
-            base_dir = Path("data/scans") / domain
-            raw_dir = base_dir / "raw" / "sublist3r"
-            parsed_dir = base_dir / "parsed" / "sublist3r"
-
-            raw_dir.mkdir(parents=True, exist_ok=True)
-            parsed_dir.mkdir(parents=True, exist_ok=True)
-
-            # Save raw output
-            raw_file = raw_dir / "output.txt"
-            with open(raw_file, 'w') as f:
-                f.write(raw_output)
-
-            # Save parsed output
-            parsed_file = parsed_dir / "results.json"
-            with open(parsed_file, 'w') as f:
-                json.dump(parsed_data, f, indent=2)
-
-        except Exception:
-            pass  # Silently fail if file saving fails
+        base_dir = Path("data/scans") / domain
+        save_results(
+            raw_output,
+            base_dir / "raw" / "sublist3r" / "output.txt",
+            parsed_data,
+            base_dir / "parsed" / "sublist3r" / "results.json"
+        )
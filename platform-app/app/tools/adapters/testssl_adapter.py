@@ -1,9 +1,16 @@
 """TestSSL tool adapter for SSL/TLS security testing"""
 from app.tools.base import BaseTool, ToolMetadata, ToolCategory
+from collections import Counter
+from operator import itemgetter
 from typing import Dict, Any, List
-import json
+import orjson
 import re
 
+# Severities always present in severity_counts, in report order
+_SEVERITY_BUCKETS = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0, "OK": 0, "INFO": 0}
+# Severities that are not reported as vulnerabilities
+_NONVULN = frozenset(("OK", "INFO"))
+
 
 class TestsslAdapter(BaseTool):
 
@@ -53,14 +60,7 @@ class TestsslAdapter(BaseTool):
     def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
         """Parse testssl.sh JSON output"""
         findings = []
-        severity_counts = {
-            "CRITICAL": 0,
-            "HIGH": 0,
-            "MEDIUM": 0,
-            "LOW": 0,
-            "OK": 0,
-            "INFO": 0
-        }
+        severity_counts = dict(_SEVERITY_BUCKETS)
         vulnerabilities = []
 
         if not output.strip():
@@ -72,26 +72,26 @@ class TestsslAdapter(BaseTool):
             }
 
         try:
-            data = json.loads(output)
+            data = orjson.loads(output)
 
-            for item in data:
-                finding = {
+            findings = [
+                {
                     "id": item.get("id", ""),
                     "finding": item.get("finding", ""),
                     "severity": item.get("severity", "INFO")
                 }
-                findings.append(finding)
+                for item in data
+            ]
 
-                # Count by severity
-                severity = finding["severity"]
-                if severity in severity_counts:
-                    severity_counts[severity] += 1
+            # Count by severity; unlisted ones (WARN, FATAL) get their own key
+            severity_counts.update(Counter(map(itemgetter("severity"), findings)))
 
-                # Track vulnerabilities (non-OK findings)
-                if severity not in ["OK", "INFO"]:
-                    vulnerabilities.append(finding)
+            # Track vulnerabilities (non-OK findings)
+            vulnerabilities = [
+                finding for finding in findings if finding["severity"] not in _NONVULN
+            ]
 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Fallback: return empty results if JSON parsing fails
             pass
 
@@ -2,22 +2,50 @@
 Base tool interface
 """
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
 from dataclasses import dataclass
 from enum import Enum
+from pathlib import Path
+import asyncio
+import atexit
+import contextvars
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
 import json
+import uuid
 
 from app.core.logging_config import get_tool_logger
 
+# Per-process directory for tool input files, created on first use
+_scratch_dir: Optional[Path] = None
+_scratch_lock = threading.Lock()
+
+def scratch_path(suffix: str = "") -> Path:
+    """Return a unique path in the shared scratch directory
+
+    The directory is removed when the process exits.
+    """
+    global _scratch_dir
+    with _scratch_lock:
+        if _scratch_dir is None:
+            _scratch_dir = Path(tempfile.mkdtemp(prefix="platform_tools_"))
+            atexit.register(shutil.rmtree, _scratch_dir, ignore_errors=True)
+    return _scratch_dir / f"{uuid.uuid4().hex}{suffix}"
+
+def _elapsed(start_ns: int) -> float:
+    """Seconds since a perf_counter_ns() reading"""
+    return (time.perf_counter_ns() - start_ns) / 1e9
+
 class ToolCategory(Enum):
     RECONNAISSANCE = "reconnaissance"
     SCANNING = "scanning"
     EXPLOITATION = "exploitation"
     POST_EXPLOITATION = "post_exploitation"
 
-@dataclass
+@dataclass(frozen=True)
 class ToolMetadata:
     """Metadata about a security tool"""
     name: str
@@ -27,12 +55,23 @@ class ToolMetadata:
     requires_root: bool = False
     default_timeout: int = 300
     supports_parallel: bool = True
+    streams_output: bool = False  # stdout is fed to parse_stream line by line
+    bytes_output: bool = False  # stdout reaches parse_output and raw_output undecoded
 
 class BaseTool(ABC):
     """Abstract base class for all security tools"""
     
     def __init__(self):
-        self.metadata = self.get_metadata()
+        # Metadata is static per tool class, so build it once per class.
+        # ToolRegistry shares one instance per tool across pool threads:
+        # adapters must not keep per-run state on self; use a ContextVar
+        # like nmap's _current_domain instead
+        cls = type(self)
+        metadata = cls.__dict__.get('_metadata')
+        if metadata is None:
+            metadata = self.get_metadata()
+            cls._metadata = metadata
+        self.metadata = metadata
     
     @abstractmethod
     def get_metadata(self) -> ToolMetadata:
@@ -53,13 +92,74 @@ class BaseTool(ABC):
     def parse_output(self, output: str, stderr: str, return_code: int) -> Dict[str, Any]:
         """Parse tool output into structured data"""
         pass
-    
-    def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute the tool and return parsed results"""
-        logger = get_tool_logger(self.metadata.name)
 
+    def parse_stream(self, lines: Iterable[str]) -> Dict[str, Any]:
+        """Parse stdout lines as the tool produces them
+
+        Used instead of parse_output when metadata.streams_output is set.
+        With bytes_output also set, lines is the binary stdout pipe.
+        Implementations must consume all of it.
+        """
+        raise NotImplementedError(f"{self.metadata.name} does not stream its output")
+
+    def flush_deferred(self):
+        """Write out results held back across runs
+
+        Called when a workflow finishes. Nothing is deferred by default.
+        """
+
+    def _run_streaming(self, command: List[str], timeout: int):
+        """Run command, parsing stdout while it is read from the pipe"""
+        binary = self.metadata.bytes_output
+        proc = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=not binary,
+            bufsize=-1 if binary else 1
+        )
+
+        # Drain stderr alongside stdout so neither pipe fills up
+        stderr_lines = []
+        stderr_reader = threading.Thread(
+            target=stderr_lines.extend, args=(proc.stderr,), daemon=True
+        )
+        stderr_reader.start()
+
+        timed_out = threading.Event()
+
+        def expire():
+            timed_out.set()
+            proc.kill()
+
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.start()
+        try:
+            parsed_data = self.parse_stream(proc.stdout)
+            return_code = proc.wait()
+        finally:
+            watchdog.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            stderr_reader.join()
+            proc.stdout.close()
+            proc.stderr.close()
+
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(command, timeout)
+
+        if binary:
+            return parsed_data, b"".join(stderr_lines).decode(errors='replace'), return_code
+        return parsed_data, "".join(stderr_lines), return_code
+
+    def _prepare(self, params: Dict[str, Any], logger):
+        """Validate params and build the command
+
+        Returns (command, timeout), or an error result if validation fails.
+        """
         logger.info(f"Executing tool: {self.metadata.name}")
-        logger.debug(f"Tool parameters: {params}")
+        logger.debug("Tool parameters: %s", params)
 
         # Validate parameters
         if not self.validate_parameters(params):
@@ -75,46 +175,44 @@ class BaseTool(ABC):
         timeout = params.get('timeout', self.metadata.default_timeout)
 
         logger.info(f"Command: {' '.join(command)}")
-        logger.debug(f"Timeout: {timeout}s")
+        logger.debug("Timeout: %ss", timeout)
 
-        # Execute
-        start_time = time.time()
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                check=False
-            )
+        return command, timeout
 
-            execution_time = time.time() - start_time
+    def _completed(self, logger, stdout: str, stderr: str, return_code: int,
+                   execution_time: float,
+                   parsed_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Parse output of a finished run and build the result"""
+        logger.info(f"Tool completed in {execution_time:.2f}s - Return code: {return_code}")
 
-            logger.info(f"Tool completed in {execution_time:.2f}s - Return code: {result.returncode}")
+        if stdout:
+            logger.debug("STDOUT length: %d characters", len(stdout))
+        if stderr:
+            logger.debug("STDERR length: %d characters", len(stderr))
+            # Log first 500 chars of stderr for debugging
+            logger.debug("STDERR preview: %s", stderr[:500])
 
-            if result.stdout:
-                logger.debug(f"STDOUT length: {len(result.stdout)} characters")
-            if result.stderr:
-                logger.debug(f"STDERR length: {len(result.stderr)} characters")
-                # Log first 500 chars of stderr for debugging
-                if len(result.stderr) > 0:
-                    logger.debug(f"STDERR preview: {result.stderr[:500]}")
+        # Parse output
+        if parsed_data is None:
+            parsed_data = self.parse_output(stdout, stderr, return_code)
+        logger.debug(
+            "Parsed data keys: %s",
+            list(parsed_data.keys()) if isinstance(parsed_data, dict) else 'non-dict'
+        )
 
-            # Parse output
-            parsed_data = self.parse_output(result.stdout, result.stderr, result.returncode)
-            logger.debug(f"Parsed data keys: {list(parsed_data.keys()) if isinstance(parsed_data, dict) else 'non-dict'}")
+        return {
+            "success": return_code == 0,
+            "data": parsed_data,
+            "raw_output": stdout,
+            "errors": stderr,
+            "execution_time": execution_time,
+            "return_code": return_code
+        }
 
-            return {
-                "success": result.returncode == 0,
-                "data": parsed_data,
-                "raw_output": result.stdout,
-                "errors": result.stderr,
-                "execution_time": execution_time,
-                "return_code": result.returncode
-            }
-
-        except subprocess.TimeoutExpired:
-            execution_time = time.time() - start_time
+    def _failed(self, logger, error: Exception, command: List[str], timeout,
+                execution_time: float) -> Dict[str, Any]:
+        """Build the result for a run that raised; call from the except block"""
+        if isinstance(error, subprocess.TimeoutExpired):
             error_msg = f"Tool execution timed out after {timeout} seconds"
             logger.error(error_msg)
             return {
@@ -123,15 +221,14 @@ class BaseTool(ABC):
                 "data": {},
                 "execution_time": execution_time
             }
-        except FileNotFoundError as e:
-            execution_time = time.time() - start_time
+        if isinstance(error, FileNotFoundError):
             error_msg = (
                 f"Tool '{self.metadata.executable}' not found. "
                 f"Please ensure {self.metadata.name} is installed and available in PATH. "
                 f"Command attempted: {' '.join(command)}"
             )
             logger.error(f"Tool not found: {self.metadata.executable}")
-            logger.error(f"Full error: {e}")
+            logger.error(f"Full error: {error}")
             logger.error(f"Hint: Install {self.metadata.name} or add it to your system PATH")
             return {
                 "success": False,
@@ -140,12 +237,93 @@ class BaseTool(ABC):
                 "execution_time": execution_time,
                 "tool_missing": True  # Flag to indicate tool is not installed
             }
+        logger.exception(f"Tool execution failed with exception: {error}")
+        return {
+            "success": False,
+            "error": str(error),
+            "data": {},
+            "execution_time": execution_time
+        }
+
+    def execute(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute the tool and return parsed results"""
+        logger = get_tool_logger(self.metadata.name)
+
+        prepared = self._prepare(params, logger)
+        if isinstance(prepared, dict):
+            return prepared
+        command, timeout = prepared
+
+        # Execute
+        start_ns = time.perf_counter_ns()
+        try:
+            if self.metadata.streams_output:
+                # Parsed while running; stdout is never held in full
+                parsed_data, stderr, return_code = self._run_streaming(command, timeout)
+                stdout = ""
+            else:
+                result = subprocess.run(
+                    command,
+                    capture_output=True,
+                    text=not self.metadata.bytes_output,
+                    timeout=timeout,
+                    check=False
+                )
+                stdout, stderr, return_code = result.stdout, result.stderr, result.returncode
+                if self.metadata.bytes_output:
+                    stderr = stderr.decode(errors='replace')
+                parsed_data = None
+
+            return self._completed(
+                logger, stdout, stderr, return_code, _elapsed(start_ns), parsed_data
+            )
         except Exception as e:
-            execution_time = time.time() - start_time
-            logger.exception(f"Tool execution failed with exception: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "data": {},
-                "execution_time": execution_time
-            }
\ No newline at end of file
+            return self._failed(logger, e, command, timeout, _elapsed(start_ns))
+
+    async def execute_async(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute the tool on the running event loop
+
+        Same result as execute(), but the subprocess is awaited instead of
+        blocking a thread, so many tools can run from one loop.
+        """
+        logger = get_tool_logger(self.metadata.name)
+
+        prepared = self._prepare(params, logger)
+        if isinstance(prepared, dict):
+            return prepared
+        command, timeout = prepared
+
+        start_ns = time.perf_counter_ns()
+        try:
+            if self.metadata.streams_output:
+                # parse_stream reads a blocking pipe; keep it off the loop.
+                # Context variables (nmap's domain) must follow it to the
+                # thread; asyncio.to_thread would do this but needs 3.9.
+                context = contextvars.copy_context()
+                loop = asyncio.get_running_loop()
+                parsed_data, stderr, return_code = await loop.run_in_executor(
+                    None, context.run, self._run_streaming, command, timeout
+                )
+                stdout = ""
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                try:
+                    out, err = await asyncio.wait_for(proc.communicate(), timeout)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await proc.wait()
+                    raise subprocess.TimeoutExpired(command, timeout)
+                stdout = out if self.metadata.bytes_output else out.decode(errors='replace')
+                stderr = err.decode(errors='replace')
+                return_code = proc.returncode
+                parsed_data = None
+
+            return self._completed(
+                logger, stdout, stderr, return_code, _elapsed(start_ns), parsed_data
+            )
+        except Exception as e:
+            return self._failed(logger, e, command, timeout, _elapsed(start_ns))
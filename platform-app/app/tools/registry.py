@@ -1,66 +1,87 @@
 """Tool registry - Updated with all adapters"""
-from typing import Dict, Type
+from typing import Dict, Type, Union
+import importlib
+
 from app.tools.base import BaseTool
 
-# Import all adapters
-from app.tools.adapters.subfinder_adapter import SubfinderAdapter
-from app.tools.adapters.sublist3r_adapter import Sublist3rAdapter
-from app.tools.adapters.nmap_adapter import NmapAdapter
-from app.tools.adapters.httpx_adapter import HttpxAdapter
-from app.tools.adapters.nuclei_adapter import NucleiAdapter
-from app.tools.adapters.ffuf_adapter import FfufAdapter
-from app.tools.adapters.sqlmap_adapter import SqlmapAdapter
-from app.tools.adapters.gobuster_adapter import GobusterAdapter
-from app.tools.adapters.amass_adapter import AmassAdapter
-from app.tools.adapters.testssl_adapter import TestsslAdapter
-from app.tools.adapters.wpscan_adapter import WpscanAdapter
-from app.tools.adapters.metasploit_adapter import MetasploitAdapter
-from app.tools.adapters.masscan_adapter import MasscanAdapter
+# Adapters are imported on first use, so a workflow only pays for the
+# tools it runs
+ADAPTER_PATHS = {
+    # Reconnaissance
+    "subfinder": "app.tools.adapters.subfinder_adapter:SubfinderAdapter",
+    "sublist3r": "app.tools.adapters.sublist3r_adapter:Sublist3rAdapter",
+    "amass": "app.tools.adapters.amass_adapter:AmassAdapter",
+    "httpx": "app.tools.adapters.httpx_adapter:HttpxAdapter",
+
+    # Scanning
+    "nmap": "app.tools.adapters.nmap_adapter:NmapAdapter",
+    "masscan": "app.tools.adapters.masscan_adapter:MasscanAdapter",
+    "nuclei": "app.tools.adapters.nuclei_adapter:NucleiAdapter",
+    "ffuf": "app.tools.adapters.ffuf_adapter:FfufAdapter",
+    "gobuster": "app.tools.adapters.gobuster_adapter:GobusterAdapter",
+    "testssl.sh": "app.tools.adapters.testssl_adapter:TestsslAdapter",
+    "wpscan": "app.tools.adapters.wpscan_adapter:WpscanAdapter",
+
+    # Exploitation
+    "sqlmap": "app.tools.adapters.sqlmap_adapter:SqlmapAdapter",
+    "metasploit": "app.tools.adapters.metasploit_adapter:MetasploitAdapter",
+}
 
 class ToolRegistry:
     """Central registry for all security tools"""
     
     def __init__(self):
-        self._tools: Dict[str, Type[BaseTool]] = {}
+        # Adapter class, or its "module:Class" path until first use
+        self._tools: Dict[str, Union[str, Type[BaseTool]]] = {}
+        # Adapters keep no per-run state on the instance, so one instance
+        # per tool serves every task
+        self._instances: Dict[str, BaseTool] = {}
+        self._metadata: Dict[str, dict] = {}
         self._register_tools()
     
     def _register_tools(self):
         """Register all available tools"""
-        # Reconnaissance
-        self.register("subfinder", SubfinderAdapter)
-        self.register("sublist3r", Sublist3rAdapter)
-        self.register("amass", AmassAdapter)
-        self.register("httpx", HttpxAdapter)
-
-        # Scanning
-        self.register("nmap", NmapAdapter)
-        self.register("masscan", MasscanAdapter)
-        self.register("nuclei", NucleiAdapter)
-        self.register("ffuf", FfufAdapter)
-        self.register("gobuster", GobusterAdapter)
-        self.register("testssl.sh", TestsslAdapter)
-        self.register("wpscan", WpscanAdapter)
-
-        # Exploitation
-        self.register("sqlmap", SqlmapAdapter)
-        self.register("metasploit", MetasploitAdapter)
+        for name, path in ADAPTER_PATHS.items():
+            self.register(name, path)
     
-    def register(self, name: str, tool_class: Type[BaseTool]):
-        """Register a new tool"""
+    def register(self, name: str, tool_class: Union[str, Type[BaseTool]]):
+        """Register a new tool, given its class or a "module:Class" path"""
         self._tools[name] = tool_class
+        self._instances.pop(name, None)
+        self._metadata.pop(name, None)
     
     def get_tool(self, name: str) -> BaseTool:
-        """Get a tool instance by name"""
-        if name not in self._tools:
-            raise ValueError(f"Tool '{name}' not found in registry")
-        return self._tools[name]()
+        """Get the shared tool instance by name"""
+        instance = self._instances.get(name)
+        if instance is None:
+            if name not in self._tools:
+                raise ValueError(f"Tool '{name}' not found in registry")
+            instance = self._instances[name] = self._resolve(name)()
+        return instance
+
+    def _resolve(self, name: str) -> Type[BaseTool]:
+        """Import a lazily registered adapter class"""
+        tool_class = self._tools[name]
+        if isinstance(tool_class, str):
+            module_path, class_name = tool_class.split(":")
+            tool_class = getattr(importlib.import_module(module_path), class_name)
+            self._tools[name] = tool_class
+        return tool_class
     
     def list_tools(self) -> list:
-        """List all registered tools"""
-        return [
-            {
-                "name": name,
-                "metadata": tool_class().get_metadata().__dict__
-            }
-            for name, tool_class in self._tools.items()
-        ]
\ No newline at end of file
+        """List all registered tools
+
+        Metadata lives on the adapter classes, so this imports every adapter.
+        """
+        tools = []
+        for name in self._tools:
+            metadata = self._metadata.get(name)
+            if metadata is None:
+                metadata = self._metadata[name] = dict(vars(self.get_tool(name).metadata))
+            tools.append({"name": name, "metadata": dict(metadata)})
+        return tools
+
+    def flush(self):
+        """Let adapters in use write out results they defer across runs"""
+        for instance in list(self._instances.values()):
+            instance.flush_deferred()
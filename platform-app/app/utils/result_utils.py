@@ -1,58 +1,117 @@
 """Utilities for result processing, deduplication, and file I/O"""
-from typing import List, Dict, Any, Set
+from typing import IO, Iterable, List, Dict, Any, Set, Union
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+import itertools
 import json
+import logging
+import shutil
+import threading
 
-def deduplicate_subdomains(subdomains: List[Dict[str, Any]], merge_ips: bool = True) -> List[Dict[str, Any]]:
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Result files are written here so parsing threads never wait on the disk
+_io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="result-io")
+_pending_saves: Set[Future] = set()
+_pending_lock = threading.Lock()
+
+# Result directories already created by this process
+_made_dirs: Set[Path] = set()
+
+def deduplicate_subdomains(subdomains: Iterable[Dict[str, Any]],
+                           merge_ips: bool = True) -> List[Dict[str, Any]]:
     """
     Deduplicate subdomain list by name, optionally merging IP addresses
 
     Args:
-        subdomains: List of subdomain dictionaries with 'name' and 'ips' keys
+        subdomains: Subdomain dictionaries with 'name' and 'ips' keys, read once
         merge_ips: If True, merge IP lists for duplicate subdomains
 
     Returns:
         Deduplicated list of subdomains
     """
     seen = {}
+    # IPs and sources of duplicated names, gathered as ordered sets and
+    # written back once at the end
+    merged_ips: Dict[str, Dict[str, None]] = {}
+    merged_sources: Dict[str, Dict[str, None]] = {}
 
     for subdomain in subdomains:
         name = subdomain.get("name")
         if not name:
             continue
 
-        if name in seen:
-            if merge_ips and "ips" in subdomain:
-                # Merge IP addresses
-                existing_ips = set(seen[name].get("ips", []))
-                new_ips = set(subdomain.get("ips", []))
-                seen[name]["ips"] = list(existing_ips | new_ips)
-
-                # Merge sources
-                existing_source = seen[name].get("source", "")
-                new_source = subdomain.get("source", "")
-                if new_source and new_source not in existing_source:
-                    seen[name]["source"] = f"{existing_source},{new_source}" if existing_source else new_source
-        else:
+        entry = seen.get(name)
+        if entry is None:
             seen[name] = subdomain.copy()
+        elif merge_ips and "ips" in subdomain:
+            # Merge IP addresses
+            ips = merged_ips.get(name)
+            if ips is None:
+                ips = merged_ips[name] = dict.fromkeys(entry.get("ips") or ())
+            ips.update(dict.fromkeys(subdomain["ips"] or ()))
+
+            # Merge sources
+            new_source = subdomain.get("source")
+            if new_source:
+                sources = merged_sources.get(name)
+                if sources is None:
+                    existing = entry.get("source")
+                    sources = merged_sources[name] = dict.fromkeys(
+                        existing.split(",") if existing else ()
+                    )
+                sources[new_source] = None
+
+    for name, ips in merged_ips.items():
+        seen[name]["ips"] = list(ips)
+    for name, sources in merged_sources.items():
+        seen[name]["source"] = ",".join(sources)
 
     return list(seen.values())
 
-def merge_subdomain_lists(lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+def collapse_covered_subdomains(names: Iterable[str]) -> List[str]:
+    """
+    Drop names that sit under another name in the list
+
+    a.b.example.com is dropped when example.com (or b.example.com) is
+    present. Names are sorted by their labels from the top level down, so
+    every covered name directly follows the name covering it.
+
+    Args:
+        names: Domain names
+
+    Returns:
+        Uncovered names, sorted by reversed labels
+    """
+    kept = []
+    last = None
+    for labels in sorted({tuple(reversed(name.split("."))) for name in names}):
+        if last is None or labels[:len(last)] != last:
+            kept.append(labels)
+            last = labels
+
+    return [".".join(reversed(labels)) for labels in kept]
+
+def merge_subdomain_lists(lists: Iterable[Iterable[Dict[str, Any]]],
+                          collapse_covered: bool = False) -> List[Dict[str, Any]]:
     """
     Merge multiple subdomain lists with deduplication
 
     Args:
         lists: List of subdomain lists to merge
+        collapse_covered: If True, drop subdomains under another listed name
 
     Returns:
         Merged and deduplicated subdomain list
     """
-    combined = []
-    for sublist in lists:
-        combined.extend(sublist)
+    merged = deduplicate_subdomains(itertools.chain.from_iterable(lists), merge_ips=True)
+    if collapse_covered:
+        uncovered = set(collapse_covered_subdomains(entry["name"] for entry in merged))
+        merged = [entry for entry in merged if entry["name"] in uncovered]
 
-    return deduplicate_subdomains(combined, merge_ips=True)
+    return merged
 
 def save_list_to_file(items: List[str], filepath: Path, append: bool = False) -> bool:
     """
@@ -78,6 +137,117 @@ def save_list_to_file(items: List[str], filepath: Path, append: bool = False) ->
     except (OSError, IOError) as e:
         return False
 
+def save_results(raw_output: Union[str, bytes, IO], raw_file: Path,
+                 parsed_data: Any, parsed_file: Path) -> bool:
+    """
+    Write raw tool output and parsed results on the calling thread
+
+    Result directories are created once per process, as for
+    save_results_async.
+
+    Args:
+        raw_output: Raw output text or bytes, or an open file positioned at
+            its start (closed once copied)
+        raw_file: Path for the raw output
+        parsed_data: JSON-serializable results
+        parsed_file: Path for the pretty-printed parsed results
+
+    Returns:
+        True if both files were saved, False on error
+    """
+    parsed_json = orjson.dumps(parsed_data, option=orjson.OPT_INDENT_2)
+    return _write_results(raw_output, Path(raw_file), parsed_json, Path(parsed_file))
+
+def save_results_async(raw_output: Union[str, bytes, IO], raw_file: Path,
+                       parsed_data: Any, parsed_file: Path) -> Future:
+    """
+    Write raw tool output and parsed results on the I/O pool
+
+    Args:
+        raw_output: Raw output text or bytes, or an open file positioned at
+            its start (closed once copied)
+        raw_file: Path for the raw output
+        parsed_data: JSON-serializable results, serialized before returning
+        parsed_file: Path for the pretty-printed parsed results
+
+    Returns:
+        Future resolving to True if both files were saved, False on error
+    """
+    # Serialize now so later changes to parsed_data cannot race the write
+    parsed_json = orjson.dumps(parsed_data, option=orjson.OPT_INDENT_2)
+    future = _io_pool.submit(
+        _write_results, raw_output, Path(raw_file), parsed_json, Path(parsed_file)
+    )
+
+    with _pending_lock:
+        _pending_saves.add(future)
+    future.add_done_callback(_forget_save)
+    return future
+
+def _forget_save(future: Future):
+    with _pending_lock:
+        _pending_saves.discard(future)
+
+def _write_results(raw_output: Union[str, bytes, IO], raw_file: Path,
+                   parsed_json: bytes, parsed_file: Path) -> bool:
+    raw_file = raw_file.absolute()
+    parsed_file = parsed_file.absolute()
+    try:
+        try:
+            _write_result_files(raw_output, raw_file, parsed_json, parsed_file)
+        except FileNotFoundError:
+            # A cached directory was removed since; create it again
+            _made_dirs.discard(raw_file.parent)
+            _made_dirs.discard(parsed_file.parent)
+            if not isinstance(raw_output, (str, bytes)):
+                raw_output.seek(0)
+            _write_result_files(raw_output, raw_file, parsed_json, parsed_file)
+        return True
+    except OSError as e:
+        logger.error("Failed to save results to %s and %s: %s", raw_file, parsed_file, e)
+        return False
+    finally:
+        if not isinstance(raw_output, (str, bytes)):
+            raw_output.close()
+
+def _write_result_files(raw_output: Union[str, bytes, IO], raw_file: Path,
+                        parsed_json: bytes, parsed_file: Path):
+    _ensure_dir(raw_file.parent)
+    _ensure_dir(parsed_file.parent)
+
+    # Whole buffers go out in a single write
+    if isinstance(raw_output, str):
+        raw_file.write_bytes(raw_output.encode('utf-8'))
+    elif isinstance(raw_output, bytes):
+        raw_file.write_bytes(raw_output)
+    else:
+        mode = 'wb' if 'b' in getattr(raw_output, 'mode', '') else 'w'
+        with open(raw_file, mode) as f:
+            shutil.copyfileobj(raw_output, f)
+
+    parsed_file.write_bytes(parsed_json)
+
+def _ensure_dir(path: Path):
+    """Create path once per process"""
+    if path not in _made_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _made_dirs.add(path)
+
+def wait_for_saves(timeout: float = None) -> bool:
+    """
+    Block until results queued with save_results_async are on disk
+
+    Args:
+        timeout: Seconds to wait, or None to wait indefinitely
+
+    Returns:
+        True if nothing is left pending
+    """
+    with _pending_lock:
+        pending = list(_pending_saves)
+    _, not_done = wait(pending, timeout=timeout)
+    return not not_done
+
 def load_list_from_file(filepath: Path) -> List[str]:
     """
     Load list of strings from text file
@@ -1,18 +1,58 @@
 """
 Workflow execution engine with dependency resolution and parallel execution
 """
-from typing import Dict, List, Set, Any
-from PyQt5.QtCore import QThread, pyqtSignal
+from typing import Dict, List, Optional, Set, Tuple, Any
+from PyQt5.QtCore import QRunnable, QThread, QThreadPool, pyqtSignal
+import functools
+import heapq
 import json
+import queue
+import re
 from datetime import datetime
+import threading
 import time
 import os
 from pathlib import Path
 
+import orjson
+from sqlalchemy import update
+
 from app.workflows.schemas import WorkflowDefinition, TaskResult, TaskStatus, TaskType
 from app.tools.registry import ToolRegistry
 from app.core.database import SessionLocal, Scan, Task
 from app.core.logging_config import get_workflow_logger
+from app.utils.result_utils import wait_for_saves
+
+# "${task_id.key.subkey}" references to earlier task outputs
+_REF_RE = re.compile(r"\$\{(.*)\}", re.DOTALL)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_reference(value: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """Split a parameter reference into (task_id, path); None if not one"""
+    match = _REF_RE.fullmatch(value)
+    if match is None:
+        return None
+    task_id, *path = match.group(1).split(".")
+    return task_id, tuple(path)
+
+
+class _TaskRunnable(QRunnable):
+    """Runs one workflow task on the worker's thread pool"""
+
+    def __init__(self, worker: 'WorkflowWorker', task_def):
+        super().__init__()
+        self.worker = worker
+        self.task_def = task_def
+
+    def run(self):
+        try:
+            success = self.worker._execute_task(self.task_def)
+        except Exception as e:
+            self.worker.logger.exception(f"Task {self.task_def.task_id} raised: {e}")
+            success = False
+        self.worker._finished_tasks.put((self.task_def.task_id, success))
+
 
 class WorkflowWorker(QThread):
     """Worker thread for executing workflows"""
@@ -29,8 +69,15 @@ class WorkflowWorker(QThread):
         self.user_id = user_id
         self.tool_registry = ToolRegistry()
         self.task_results: Dict[str, TaskResult] = {}
+        self._results_json: Dict[str, bytes] = {}
+        # Pool threads store results while others read them
+        self._results_lock = threading.Lock()
+        # Finished task rows, written in one batch by the scheduler
+        self._task_updates: List[Dict[str, Any]] = []
         self.scan_id = None
         self._stop_requested = False
+        # (task_id, success) pairs reported by pool threads
+        self._finished_tasks: queue.SimpleQueue = queue.SimpleQueue()
         self.logger = get_workflow_logger()  # Will be updated with scan_id once created
         
     def run(self):
@@ -60,7 +107,14 @@ class WorkflowWorker(QThread):
             # Execute workflow
             workflow_start_time = time.time()
             self.logger.info("Starting workflow execution")
-            self._execute_workflow()
+            try:
+                self._execute_workflow()
+            finally:
+                # Adapters such as nmap coalesce file updates per workflow,
+                # and result files are written on a background pool; both
+                # must be on disk before the scan is marked completed
+                self.tool_registry.flush()
+                wait_for_saves()
             workflow_duration = time.time() - workflow_start_time
 
             # Mark as completed
@@ -71,10 +125,7 @@ class WorkflowWorker(QThread):
             scan = db.query(Scan).filter(Scan.id == self.scan_id).first()
             scan.status = final_status
             scan.completed_at = datetime.utcnow()
-            scan.results = json.dumps({
-                task_id: result.dict()
-                for task_id, result in self.task_results.items()
-            })
+            scan.results = self._scan_results_json()
             db.commit()
             db.close()
 
@@ -95,83 +146,181 @@ class WorkflowWorker(QThread):
             self._handle_workflow_error(str(e))
     
     def _execute_workflow(self):
-        """Execute workflow with dependency resolution"""
-        completed_tasks: Set[str] = set()
-        failed_tasks: Set[str] = set()
-        total_tasks = len(self.workflow.tasks)
+        """Execute workflow with dependency resolution
+
+        Ready tasks run concurrently on a thread pool, up to the workflow's
+        max_parallel_tasks. Tools that do not support parallel runs get the
+        pool to themselves. Dependency counts are built once and updated as
+        tasks finish, so nothing rescans the whole workflow.
+        """
+        tasks = self.workflow.tasks
+        total_tasks = len(tasks)
+        finished = 0
+        running_tasks: Set[str] = set()
+        exclusive_running = False
+
+        # Kahn's algorithm: unmet dependency counts and reverse edges
+        waiting_on: Dict[str, int] = {}
+        dependents: Dict[str, List] = {}
+        ready: List = []  # heap of (-priority, position, task)
+        for position, task in enumerate(tasks):
+            waiting_on[task.task_id] = len(task.depends_on)
+            for dep_id in task.depends_on:
+                dependents.setdefault(dep_id, []).append(task)
+            if not task.depends_on:
+                heapq.heappush(ready, (-task.priority, position, task))
+        positions = {task.task_id: position for position, task in enumerate(tasks)}
 
-        self.logger.debug(f"Entering workflow execution loop (total_tasks={total_tasks})")
+        pool = QThreadPool()
+        max_parallel = min(self.workflow.max_parallel_tasks, os.cpu_count() or 1)
+        pool.setMaxThreadCount(max_parallel)
 
-        while len(completed_tasks) + len(failed_tasks) < total_tasks:
-            if self._stop_requested:
-                self.logger.warning("Stop requested, terminating workflow execution")
-                break
+        self.logger.debug("Entering workflow execution loop (total_tasks=%d, max_parallel=%d)",
+                        total_tasks, max_parallel)
+
+        try:
+            while finished < total_tasks:
+                if self._stop_requested:
+                    self.logger.warning("Stop requested, terminating workflow execution")
+                    break
 
-            # Find tasks ready to execute
-            ready_tasks = self._get_ready_tasks(completed_tasks, failed_tasks)
-            self.logger.debug(f"Dependency check: {len(ready_tasks)} tasks ready to execute")
-
-            if not ready_tasks:
-                # Check if we're stuck
-                if len(completed_tasks) + len(failed_tasks) < total_tasks:
-                    # Some tasks can't run due to failed dependencies
-                    remaining = [t for t in self.workflow.tasks
-                               if t.task_id not in completed_tasks and t.task_id not in failed_tasks]
-                    self.logger.error(f"Workflow blocked: {len(remaining)} tasks cannot run due to failed dependencies")
+                self.logger.debug("Dependency check: %d tasks ready to execute", len(ready))
+
+                # Start ready tasks by priority while slots are free
+                while ready and not exclusive_running and len(running_tasks) < max_parallel:
+                    task = ready[0][2]
+                    if not self._supports_parallel(task):
+                        if running_tasks:
+                            break
+                        exclusive_running = True
+                    heapq.heappop(ready)
+
+                    self.logger.info(
+                        f"Selected task for execution: {task.task_id} ({task.name}) "
+                        f"- priority {task.priority}"
+                    )
+                    running_tasks.add(task.task_id)
+                    pool.start(_TaskRunnable(self, task), task.priority)
+
+                if not running_tasks:
+                    # Nothing is running and nothing is ready, so the rest
+                    # wait on unknown or circular dependencies
+                    remaining = [t for t in tasks if waiting_on.get(t.task_id, 0) > 0]
+                    self.logger.error(
+                        f"Workflow blocked: {len(remaining)} tasks have unresolvable dependencies"
+                    )
                     for task in remaining:
-                        self.logger.warning(f"Skipping task {task.task_id} ({task.name}) - dependencies failed")
+                        self.logger.warning(
+                            f"Skipping task {task.task_id} ({task.name}) "
+                            f"- dependencies cannot be met"
+                        )
                         self.task_failed.emit(task.task_id, "Dependency failed")
-                        failed_tasks.add(task.task_id)
-                break
+                    break
 
-            # Sort by priority
-            ready_tasks.sort(key=lambda t: t.priority, reverse=True)
-            task = ready_tasks[0]
-            self.logger.info(f"Selected task for execution: {task.task_id} ({task.name}) - priority {task.priority}")
+                # Wait for any running task to finish
+                task_id, success = self._finished_tasks.get()
+                self._flush_task_updates()
+                running_tasks.discard(task_id)
+                if not running_tasks:
+                    exclusive_running = False
+                finished += 1
+
+                if success:
+                    self.logger.info(f"Task {task_id} completed successfully")
+                    for child in dependents.get(task_id, ()):
+                        waiting_on[child.task_id] -= 1
+                        if waiting_on[child.task_id] == 0:
+                            heapq.heappush(
+                                ready, (-child.priority, positions[child.task_id], child)
+                            )
+                else:
+                    self.logger.error(f"Task {task_id} failed")
+                    finished += self._skip_dependents(task_id, dependents, waiting_on)
+
+                # Update progress
+                progress = int((finished / total_tasks) * 100)
+                self.logger.debug("Progress: %d%% (%d of %d tasks finished)",
+                                  progress, finished, total_tasks)
+                self.progress_updated.emit(progress)
+        finally:
+            # Running tools cannot be interrupted; let them finish
+            pool.waitForDone()
+            self._flush_task_updates()
+
+    def _skip_dependents(self, task_id: str, dependents: Dict[str, List],
+                         waiting_on: Dict[str, int]) -> int:
+        """Fail everything downstream of a failed task; returns how many"""
+        skipped = 0
+        queue_ = [task_id]
+        while queue_:
+            for child in dependents.get(queue_.pop(), ()):
+                # A negative count marks the task as skipped
+                if waiting_on[child.task_id] < 0:
+                    continue
+                waiting_on[child.task_id] = -1
+                skipped += 1
+                self.logger.warning(
+                    f"Skipping task {child.task_id} ({child.name}) - dependencies failed"
+                )
+                self.task_failed.emit(child.task_id, "Dependency failed")
+                queue_.append(child.task_id)
+        return skipped
+
+    def _supports_parallel(self, task_def) -> bool:
+        """Whether a task may run alongside others"""
+        if task_def.task_type != TaskType.TOOL:
+            return True
+        try:
+            return self.tool_registry.get_tool(task_def.tool).metadata.supports_parallel
+        except ValueError:
+            # Unknown tools fail when executed
+            return True
+    
+    def _store_result(self, task_result: TaskResult):
+        """Record a finished task's result
+
+        The result is serialized here, on the pool thread, so the scan
+        record only has to join the pieces when the workflow ends.
+        """
+        result_json = orjson.dumps(task_result.dict(), option=orjson.OPT_NON_STR_KEYS, default=str)
+        with self._results_lock:
+            self.task_results[task_result.task_id] = task_result
+            self._results_json[task_result.task_id] = result_json
+
+    def _scan_results_json(self) -> str:
+        """All task results as one JSON object, from the stored pieces"""
+        with self._results_lock:
+            members = b",".join(
+                orjson.dumps(task_id) + b":" + result_json
+                for task_id, result_json in self._results_json.items()
+            )
+        return (b"{" + members + b"}").decode()
 
-            if len(ready_tasks) > 1:
-                self.logger.debug(f"Other ready tasks (lower priority): {[t.task_id for t in ready_tasks[1:]]}")
+    def _task_outputs(self) -> Dict[str, Any]:
+        """Snapshot of the outputs of all finished tasks"""
+        with self._results_lock:
+            return {task_id: result.output for task_id, result in self.task_results.items()}
 
-            # Execute highest priority task
-            success = self._execute_task(task)
+    def _queue_task_update(self, task_id_db: int, **values):
+        """Queue an update of a task record for the next flush"""
+        with self._results_lock:
+            self._task_updates.append({"id": task_id_db, **values})
 
-            if success:
-                completed_tasks.add(task.task_id)
-                self.logger.info(f"Task {task.task_id} completed successfully")
-            else:
-                failed_tasks.add(task.task_id)
-                self.logger.error(f"Task {task.task_id} failed")
+    def _flush_task_updates(self):
+        """Write all queued task record updates in one transaction"""
+        with self._results_lock:
+            updates, self._task_updates = self._task_updates, []
+        if not updates:
+            return
+
+        db = SessionLocal()
+        try:
+            # Bulk UPDATE by primary key, batched per set of columns
+            db.execute(update(Task), updates)
+            db.commit()
+        finally:
+            db.close()
 
-            # Update progress
-            progress = int(((len(completed_tasks) + len(failed_tasks)) / total_tasks) * 100)
-            self.logger.debug(f"Progress: {progress}% ({len(completed_tasks)} completed, {len(failed_tasks)} failed)")
-            self.progress_updated.emit(progress)
-    
-    def _get_ready_tasks(self, completed: Set[str], failed: Set[str]) -> List:
-        """Get tasks that are ready to execute"""
-        ready = []
-        
-        for task in self.workflow.tasks:
-            # Skip if already processed
-            if task.task_id in completed or task.task_id in failed:
-                continue
-            
-            # Check if all dependencies are satisfied
-            deps_satisfied = True
-            for dep_id in task.depends_on:
-                if dep_id in failed:
-                    # Dependency failed, this task cannot run
-                    deps_satisfied = False
-                    break
-                if dep_id not in completed:
-                    deps_satisfied = False
-                    break
-            
-            if deps_satisfied:
-                ready.append(task)
-        
-        return ready
-    
     def _execute_task(self, task_def) -> bool:
         """Execute a single task (tool, merge, file_output, web_crawl, etc.)"""
         # Import processors
@@ -204,8 +353,8 @@ class WorkflowWorker(QThread):
         )
 
         task_logger.info(f"Starting task: {task_def.name}")
-        task_logger.debug(f"Task dependencies: {task_def.depends_on}")
-        task_logger.debug(f"Raw parameters: {task_def.parameters}")
+        task_logger.debug("Task dependencies: %s", task_def.depends_on)
+        task_logger.debug("Raw parameters: %s", task_def.parameters)
 
         self.task_started.emit(task_def.task_id, task_def.name)
 
@@ -226,7 +375,7 @@ class WorkflowWorker(QThread):
         try:
             # Substitute parameters from previous results
             params = self._substitute_parameters(task_def.parameters)
-            task_logger.debug(f"Substituted parameters: {params}")
+            task_logger.debug("Substituted parameters: %s", params)
 
             # Get tool and execute
             tool = self.tool_registry.get_tool(task_def.tool)
@@ -250,17 +399,16 @@ class WorkflowWorker(QThread):
                 timestamp=datetime.utcnow().isoformat()
             )
 
-            self.task_results[task_def.task_id] = task_result
+            self._store_result(task_result)
 
             # Update task record
-            db = SessionLocal()
-            task_record = db.query(Task).filter(Task.id == task_id_db).first()
-            task_record.status = "completed" if result["success"] else "failed"
-            task_record.completed_at = datetime.utcnow()
-            task_record.output = json.dumps(result.get("data", {}))
-            task_record.errors = result.get("error", "")
-            db.commit()
-            db.close()
+            self._queue_task_update(
+                task_id_db,
+                status="completed" if result["success"] else "failed",
+                completed_at=datetime.utcnow(),
+                output=json.dumps(result.get("data", {})),
+                errors=result.get("error", "")
+            )
 
             self.task_completed.emit(task_def.task_id, result)
 
@@ -279,16 +427,15 @@ class WorkflowWorker(QThread):
                 execution_time=0,
                 timestamp=datetime.utcnow().isoformat()
             )
-            self.task_results[task_def.task_id] = task_result
+            self._store_result(task_result)
 
             # Update task record
-            db = SessionLocal()
-            task_record = db.query(Task).filter(Task.id == task_id_db).first()
-            task_record.status = "failed"
-            task_record.completed_at = datetime.utcnow()
-            task_record.errors = error_msg
-            db.commit()
-            db.close()
+            self._queue_task_update(
+                task_id_db,
+                status="failed",
+                completed_at=datetime.utcnow(),
+                errors=error_msg
+            )
 
             self.task_failed.emit(task_def.task_id, error_msg)
 
@@ -303,10 +450,10 @@ class WorkflowWorker(QThread):
         )
 
         task_logger.info(f"Starting merge task: {task_def.name}")
-        task_logger.debug(f"Merge sources: {task_def.merge_sources}")
-        task_logger.debug(f"Merge field: {task_def.merge_field}")
-        task_logger.debug(f"Dedupe key: {task_def.dedupe_key}")
-        task_logger.debug(f"Merge strategy: {task_def.merge_strategy}")
+        task_logger.debug("Merge sources: %s", task_def.merge_sources)
+        task_logger.debug("Merge field: %s", task_def.merge_field)
+        task_logger.debug("Dedupe key: %s", task_def.dedupe_key)
+        task_logger.debug("Merge strategy: %s", task_def.merge_strategy)
 
         self.task_started.emit(task_def.task_id, task_def.name)
 
@@ -348,7 +495,8 @@ class WorkflowWorker(QThread):
                     "data": field_data
                 })
 
-                task_logger.debug(f"Collected {len(field_data) if isinstance(field_data, list) else 1} items from {source_id}")
+                task_logger.debug("Collected %d items from %s",
+                                len(field_data) if isinstance(field_data, list) else 1, source_id)
 
             # Perform merge based on strategy
             merged_data = self._merge_data(
@@ -389,16 +537,15 @@ class WorkflowWorker(QThread):
                 timestamp=datetime.utcnow().isoformat()
             )
 
-            self.task_results[task_def.task_id] = task_result
+            self._store_result(task_result)
 
             # Update task record
-            db = SessionLocal()
-            task_record = db.query(Task).filter(Task.id == task_id_db).first()
-            task_record.status = "completed"
-            task_record.completed_at = datetime.utcnow()
-            task_record.output = json.dumps(task_result.output)
-            db.commit()
-            db.close()
+            self._queue_task_update(
+                task_id_db,
+                status="completed",
+                completed_at=datetime.utcnow(),
+                output=json.dumps(task_result.output)
+            )
 
             task_logger.info(f"Merge task completed successfully in {execution_time:.2f}s")
             self.task_completed.emit(task_def.task_id, {"success": True, "data": task_result.output})
@@ -418,16 +565,15 @@ class WorkflowWorker(QThread):
                 execution_time=0,
                 timestamp=datetime.utcnow().isoformat()
             )
-            self.task_results[task_def.task_id] = task_result
+            self._store_result(task_result)
 
             # Update task record
-            db = SessionLocal()
-            task_record = db.query(Task).filter(Task.id == task_id_db).first()
-            task_record.status = "failed"
-            task_record.completed_at = datetime.utcnow()
-            task_record.errors = error_msg
-            db.commit()
-            db.close()
+            self._queue_task_update(
+                task_id_db,
+                status="failed",
+                completed_at=datetime.utcnow(),
+                errors=error_msg
+            )
 
             self.task_failed.emit(task_def.task_id, error_msg)
 
@@ -460,10 +606,7 @@ class WorkflowWorker(QThread):
         try:
             # Execute processor
             start_time = time.time()
-            result = processor.execute(task_def, {
-                task_id: result.output
-                for task_id, result in self.task_results.items()
-            })
+            result = processor.execute(task_def, self._task_outputs())
             execution_time = time.time() - start_time
 
             success = result.get("success", False)
@@ -476,16 +619,15 @@ class WorkflowWorker(QThread):
                 execution_time=execution_time
             )
 
-            self.task_results[task_def.task_id] = task_result
+            self._store_result(task_result)
 
             # Update database
-            db = SessionLocal()
-            task_record = db.query(Task).filter(Task.id == task_id_db).first()
-            task_record.status = "completed" if success else "failed"
-            task_record.output = json.dumps(result)
-            task_record.completed_at = datetime.utcnow()
-            db.commit()
-            db.close()
+            self._queue_task_update(
+                task_id_db,
+                status="completed" if success else "failed",
+                output=json.dumps(result),
+                completed_at=datetime.utcnow()
+            )
 
             if success:
                 task_logger.info(f"Processor task completed successfully in {execution_time:.2f}s")
@@ -500,13 +642,12 @@ class WorkflowWorker(QThread):
         except Exception as e:
             task_logger.exception(f"Processor task failed with exception: {e}")
 
-            db = SessionLocal()
-            task_record = db.query(Task).filter(Task.id == task_id_db).first()
-            task_record.status = "failed"
-            task_record.errors = str(e)
-            task_record.completed_at = datetime.utcnow()
-            db.commit()
-            db.close()
+            self._queue_task_update(
+                task_id_db,
+                status="failed",
+                errors=str(e),
+                completed_at=datetime.utcnow()
+            )
 
             self.task_failed.emit(task_def.task_id, str(e))
             return False
@@ -524,12 +665,12 @@ class WorkflowWorker(QThread):
 
             for item in data:
                 if not isinstance(item, dict):
-                    logger.debug(f"Skipping non-dict item: {item}")
+                    logger.debug("Skipping non-dict item: %s", item)
                     continue
 
                 key = item.get(dedupe_key)
                 if not key:
-                    logger.debug(f"Item missing dedupe key '{dedupe_key}', skipping: {item}")
+                    logger.debug("Item missing dedupe key '%s', skipping: %s", dedupe_key, item)
                     continue
 
                 if strategy == "combine":
@@ -563,7 +704,7 @@ class WorkflowWorker(QThread):
                     unique_key = f"{key}_{source['task_id']}"
                     merged[unique_key] = item.copy()
 
-        logger.debug(f"Merge complete: {len(merged)} unique items")
+        logger.debug("Merge complete: %d unique items", len(merged))
         return list(merged.values())
 
     def _extract_domain(self, target: str) -> str:
@@ -584,7 +725,7 @@ class WorkflowWorker(QThread):
         for subdir in subdirs:
             dir_path = base_dir / subdir
             dir_path.mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Created directory: {dir_path}")
+            logger.debug("Created directory: %s", dir_path)
 
         return base_dir
 
@@ -649,51 +790,56 @@ class WorkflowWorker(QThread):
 
     def _substitute_parameters(self, params: Dict) -> Dict:
         """Substitute dynamic parameters from previous task outputs"""
-        substituted = {}
-
-        for key, value in params.items():
-            if isinstance(value, str) and value.startswith("${") and value.endswith("}"):
-                # Extract reference path (e.g., "${recon_subdomains.unique_subdomains}")
-                ref_path = value[2:-1]
-                parts = ref_path.split(".")
-
-                task_id = parts[0]
-                self.logger.debug(f"Parameter substitution: {key} -> {ref_path}")
-
-                if task_id in self.task_results:
-                    data = self.task_results[task_id].output
-
-                    # Navigate the path
-                    for part in parts[1:]:
-                        if isinstance(data, dict) and part in data:
-                            data = data[part]
-                        else:
-                            self.logger.warning(f"Parameter substitution failed: path '{ref_path}' not found in task {task_id} output")
-                            data = None
-                            break
+        return {key: self._substitute_value(key, value) for key, value in params.items()}
+
+    def _substitute_value(self, key: str, value: Any) -> Any:
+        """Resolve one parameter value; references inside dicts are resolved too"""
+        if isinstance(value, dict):
+            # Recursively substitute in dicts
+            return self._substitute_parameters(value)
+        if isinstance(value, list):
+            # Recursively substitute in dicts inside lists
+            return [
+                self._substitute_parameters(item) if isinstance(item, dict) else item
+                for item in value
+            ]
+        if not isinstance(value, str):
+            return value
+
+        reference = _parse_reference(value)
+        if reference is None:
+            return value
+
+        # Reference path (e.g., "${recon_subdomains.unique_subdomains}")
+        task_id, path = reference
+        ref_path = value[2:-1]
+        self.logger.debug("Parameter substitution: %s -> %s", key, ref_path)
+
+        if task_id not in self.task_results:
+            self.logger.warning(
+                f"Parameter substitution failed: task {task_id} not found in results"
+            )
+            return []
 
-                    substituted[key] = data if data is not None else []
-                    if data is None:
-                        self.logger.debug(f"Substituted {key} with empty list (path not found)")
-                    else:
-                        self.logger.debug(f"Substituted {key} with value from {ref_path}")
-                else:
-                    self.logger.warning(f"Parameter substitution failed: task {task_id} not found in results")
-                    substituted[key] = []
-            elif isinstance(value, list):
-                # Recursively substitute in lists
-                substituted[key] = [
-                    self._substitute_parameters({"item": item})["item"]
-                    if isinstance(item, dict) else item
-                    for item in value
-                ]
-            elif isinstance(value, dict):
-                # Recursively substitute in dicts
-                substituted[key] = self._substitute_parameters(value)
+        data = self.task_results[task_id].output
+
+        # Navigate the path
+        for part in path:
+            if isinstance(data, dict) and part in data:
+                data = data[part]
             else:
-                substituted[key] = value
+                self.logger.warning(
+                    f"Parameter substitution failed: path '{ref_path}' "
+                    f"not found in task {task_id} output"
+                )
+                data = None
+                break
 
-        return substituted
+        if data is None:
+            self.logger.debug("Substituted %s with empty list (path not found)", key)
+            return []
+        self.logger.debug("Substituted %s with value from %s", key, ref_path)
+        return data
     
     def _handle_workflow_error(self, error: str):
         """Handle workflow-level error"""
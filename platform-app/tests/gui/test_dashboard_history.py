@@ -0,0 +1,245 @@
+"""Tests for the dashboard scan history pager"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from PyQt5.QtCore import Qt, QThreadPool
+from PyQt5.QtWidgets import QApplication
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, Scan
+from app.gui import dashboard_widget
+from app.gui.dashboard_widget import DashboardWidget, ScanDelegate, ScanListModel
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create QApplication instance for tests"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+@pytest.fixture
+def dashboard(qapp, monkeypatch):
+    """Dashboard backed by an in-memory database with 12 scans for user 1"""
+    # Shared connection so the fetch thread sees the same in-memory database
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(dashboard_widget, "SessionScoped", scoped_session(session_factory))
+    dashboard_widget._fetch_recent_scans.cache_clear()
+
+    start = datetime(2024, 1, 1)
+    with session_factory() as db:
+        db.add_all([
+            Scan(
+                user_id=1,
+                workflow_name=f"wf{i}",
+                target=f"t{i}.example.com",
+                status="completed" if i % 2 else "failed",
+                started_at=start + timedelta(hours=i)
+            )
+            for i in range(12)
+        ])
+        db.add(Scan(user_id=2, workflow_name="other", target="x", started_at=start))
+        db.commit()
+
+    widget = DashboardWidget()
+    widget.current_user = SimpleNamespace(id=1)
+    return widget
+
+
+def _wait_for_history():
+    """Let the background fetch finish and deliver its queued signal"""
+    QThreadPool.globalInstance().waitForDone()
+    QApplication.processEvents()
+
+
+def _load(widget, page=0):
+    widget.load_recent_scans(page)
+    _wait_for_history()
+
+
+def _visible_names(widget):
+    return [row.workflow_name for row in widget.history_model.rows()]
+
+
+def test_history_pages_newest_first(dashboard):
+    """Pages hold PAGE_SIZE scans and the pager buttons follow the page"""
+    _load(dashboard)
+    assert _visible_names(dashboard) == [f"wf{i}" for i in range(11, 1, -1)]
+    # Dates are formatted by the database
+    assert dashboard.history_model.rows()[0].started_str == "2024-01-01 11:00"
+    assert not dashboard.prev_btn.isEnabled()
+    assert dashboard.next_btn.isEnabled()
+
+    dashboard.next_btn.click()
+    _wait_for_history()
+    assert dashboard.page == 1
+    assert _visible_names(dashboard) == ["wf1", "wf0"]
+    assert dashboard.prev_btn.isEnabled()
+    assert not dashboard.next_btn.isEnabled()
+    assert dashboard.no_scans_label.isHidden()
+
+
+def test_history_model_roles(dashboard):
+    """The model exposes the name, target, id and full row"""
+    _load(dashboard)
+    index = dashboard.history_model.index(0)
+
+    assert index.data(Qt.DisplayRole) == "wf11"
+    assert index.data(Qt.ToolTipRole) == "t11.example.com"
+    assert index.data(Qt.UserRole) == dashboard.history_model.rows()[0].id
+    assert index.data(ScanListModel.RowRole).status == "completed"
+
+
+def test_clicking_completed_scan_requests_report(dashboard):
+    """Only completed scans open their report"""
+    _load(dashboard)
+    requested = []
+    dashboard.report_requested.connect(requested.append)
+
+    completed, failed = dashboard.history_model.index(0), dashboard.history_model.index(1)
+    dashboard.history_view.clicked.emit(failed)
+    dashboard.history_view.clicked.emit(completed)
+
+    assert requested == [completed.data(Qt.UserRole)]
+
+
+def test_delegate_paints_rows(dashboard):
+    """Rows render through the delegate at a uniform height"""
+    dashboard.resize(900, 600)
+    _load(dashboard)
+
+    view = dashboard.history_view
+    assert view.uniformItemSizes()
+    assert view.sizeHintForRow(0) == ScanDelegate.ROW_HEIGHT
+    # Painting exercises ScanDelegate.paint for every visible row
+    assert not view.viewport().grab().isNull()
+
+
+def test_history_empty_state(dashboard):
+    """A user without scans sees the empty-state message"""
+    dashboard.current_user = SimpleNamespace(id=99)
+    _load(dashboard)
+
+    assert not dashboard.no_scans_label.isHidden()
+    assert _visible_names(dashboard) == []
+
+
+def test_history_pages_are_cached_until_invalidated(dashboard, monkeypatch):
+    """Revisiting a page reuses the cached rows until the epoch is bumped"""
+    # Stay inside one TTL window
+    monkeypatch.setattr(dashboard_widget.time, "monotonic", lambda: 0.0)
+    _load(dashboard)
+
+    queries = []
+    real_session = dashboard_widget.SessionScoped
+
+    def counting_session():
+        queries.append(1)
+        return real_session()
+
+    monkeypatch.setattr(dashboard_widget, "SessionScoped", counting_session)
+
+    _load(dashboard)
+    assert queries == []
+
+    dashboard.invalidate_scan_cache()
+    _load(dashboard)
+    assert queries == [1]
+
+
+def test_history_loads_in_background(dashboard):
+    """A placeholder is shown until the fetch result arrives"""
+    dashboard.load_recent_scans()
+    assert not dashboard.loading_label.isHidden()
+
+    _wait_for_history()
+    assert dashboard.loading_label.isHidden()
+    assert len(_visible_names(dashboard)) == dashboard.PAGE_SIZE
+
+
+def test_stale_history_results_are_ignored(dashboard):
+    """Only the most recent request is rendered"""
+    dashboard.load_recent_scans(0)
+    dashboard.load_recent_scans(1)
+    _wait_for_history()
+
+    assert dashboard.page == 1
+    assert _visible_names(dashboard) == ["wf1", "wf0"]
+
+
+def test_card_styles_come_from_dashboard(dashboard):
+    """Workflow cards inherit the dashboard stylesheet"""
+    assert "WorkflowCard {" in dashboard.styleSheet()
+
+
+def test_status_colors_fall_back_to_pending():
+    """Unknown statuses are painted like pending scans"""
+    colors = ScanDelegate.STATUS_COLORS
+    assert colors["completed"].name() == "#00ff00"
+    assert colors.get("unknown", colors["pending"]).name() == "#888888"
+
+
+def test_history_reads_leave_no_open_transaction(dashboard, monkeypatch):
+    """Thread sessions are kept, but each read ends its transaction"""
+    sessions = []
+    real_session = dashboard_widget.SessionScoped
+
+    def recording_session():
+        session = real_session()
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(dashboard_widget, "SessionScoped", recording_session)
+    _load(dashboard, 0)
+    _load(dashboard, 1)
+
+    assert len(sessions) == 2
+    assert not any(session.in_transaction() for session in sessions)
+
+
+def test_hidden_dashboard_defers_reload_until_shown(dashboard, qtbot, monkeypatch):
+    """load_user_data skips the query while hidden; showing reloads once"""
+    calls = []
+    real_load = dashboard.load_recent_scans
+    monkeypatch.setattr(
+        dashboard, "load_recent_scans", lambda page=0: (calls.append(page), real_load(page))
+    )
+
+    user = SimpleNamespace(id=1, username="alice")
+    dashboard.load_user_data(user)
+    assert calls == []
+
+    qtbot.addWidget(dashboard)
+    dashboard.show()
+    qtbot.waitUntil(lambda: calls == [0], timeout=1000)
+    _wait_for_history()
+
+    # Coming back to an unchanged dashboard does not query again
+    dashboard.load_user_data(user)
+    assert calls == [0]
+
+    # A finished workflow marks the history stale
+    dashboard.invalidate_scan_cache()
+    dashboard.load_user_data(user)
+    assert calls == [0, 0]
+    _wait_for_history()
+
+
+def test_workflow_cards_are_built_from_spec(dashboard):
+    """One card per spec entry, with updates re-enabled afterwards"""
+    from app.gui.dashboard_widget import WORKFLOW_CARDS, WorkflowCard
+
+    cards = dashboard.findChildren(WorkflowCard)
+    assert [card.workflow_id for card in cards] == [spec[0] for spec in WORKFLOW_CARDS]
+    assert all(card.parentWidget().updatesEnabled() for card in cards)
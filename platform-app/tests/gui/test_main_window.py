@@ -0,0 +1,82 @@
+"""Tests for lazy page construction in the main window"""
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from app.gui.main_window import MainWindow
+from app.gui.terminal_widget import TerminalWidget
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create QApplication instance for tests"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+def test_only_login_page_is_built_at_startup(qapp):
+    """Pages other than login are created on first use"""
+    window = MainWindow()
+
+    assert window._pages == {}
+    assert window.stacked_widget.count() == 1
+    assert window.stacked_widget.currentWidget() is window.login_page
+
+
+def test_pages_are_built_once(qapp):
+    """Showing a page builds it, and later accesses reuse it"""
+    window = MainWindow()
+
+    window.show_terminal()
+    terminal = window.terminal_page
+
+    assert isinstance(terminal, TerminalWidget)
+    assert window.stacked_widget.currentWidget() is terminal
+    assert window.terminal_page is terminal
+    assert window.stacked_widget.count() == 2
+
+
+def test_reports_load_after_page_switch(qapp, qtbot):
+    """The reports page is shown first and loaded on the next event-loop pass"""
+    from unittest.mock import patch
+
+    window = MainWindow()
+    window.current_user = object()
+
+    with patch.object(window.report_page, 'load_reports') as mock_load:
+        window.show_reports()
+
+        assert window.stacked_widget.currentWidget() is window.report_page
+        mock_load.assert_not_called()
+
+        qtbot.waitUntil(lambda: mock_load.called, timeout=1000)
+        mock_load.assert_called_once_with(window.current_user)
+
+
+def test_emergency_exit_dialog_requires_acknowledgement(qapp):
+    """Exit is only enabled once the checkbox is ticked, and resets per use"""
+    from unittest.mock import patch
+    from PyQt5.QtWidgets import QDialog
+
+    window = MainWindow()
+
+    with patch('app.gui.main_window.QCoreApplication.quit') as mock_quit, \
+         patch.object(QDialog, 'exec_', return_value=QDialog.Rejected):
+        window.emergency_exit()
+        dialog = window._exit_dialog
+        assert not dialog.exit_btn.isEnabled()
+
+        dialog.acknowledge.setChecked(True)
+        assert dialog.exit_btn.isEnabled()
+        mock_quit.assert_not_called()
+
+        # The same dialog is reused and starts unacknowledged again
+        window.emergency_exit()
+        assert window._exit_dialog is dialog
+        assert not dialog.acknowledge.isChecked()
+
+    with patch('app.gui.main_window.QCoreApplication.quit') as mock_quit, \
+         patch.object(QDialog, 'exec_', return_value=QDialog.Accepted):
+        window.emergency_exit()
+        mock_quit.assert_called_once()
@@ -0,0 +1,167 @@
+"""Tests for terminal output batching"""
+import pytest
+from PyQt5.QtWidgets import QApplication
+
+from app.gui.terminal_widget import TerminalWidget
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create QApplication instance for tests"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+@pytest.fixture
+def terminal(qapp):
+    """Terminal with the welcome banner cleared"""
+    widget = TerminalWidget()
+    widget.terminal_display.clear()
+    return widget
+
+
+def test_process_output_is_batched(terminal):
+    """Streamed chunks are held until the flush timer fires"""
+    terminal._queue_output("line 1\n")
+    terminal._queue_output("line 2\n")
+
+    assert terminal.terminal_display.toPlainText() == ""
+    assert terminal._flush_timer.isActive()
+
+    terminal._flush_output()
+
+    assert terminal.terminal_display.toPlainText() == "line 1\nline 2\n"
+    assert not terminal._flush_timer.isActive()
+
+
+def test_flush_keeps_order_across_colors(terminal):
+    """Interleaved stdout and stderr chunks keep their arrival order"""
+    terminal._queue_output("out 1\n")
+    terminal._queue_output("[ERROR] err\n", color="red")
+    terminal._queue_output("out 2\n")
+
+    # Direct appends flush pending output first
+    terminal.append_output("done")
+
+    assert terminal.terminal_display.toPlainText() == "out 1\n[ERROR] err\nout 2\ndone\n"
+
+
+def test_markup_in_output_is_shown_literally(terminal):
+    """Tool output is inserted as plain text, never parsed as HTML"""
+    assert not terminal.terminal_display.acceptRichText()
+
+    terminal.append_output("<b>bold</b> &amp; <br>")
+
+    assert terminal.terminal_display.toPlainText() == "<b>bold</b> &amp; <br>\n"
+
+
+def test_display_drops_oldest_lines(terminal):
+    """The display keeps at most MAX_LINES lines"""
+    for i in range(terminal.MAX_LINES + 100):
+        terminal._queue_output(f"line {i}\n")
+    terminal._flush_output()
+
+    document = terminal.terminal_display.document()
+    assert document.blockCount() == terminal.MAX_LINES
+    assert document.lastBlock().previous().text() == f"line {terminal.MAX_LINES + 99}"
+    assert not terminal.terminal_display.isUndoRedoEnabled()
+
+
+def test_output_colors(terminal):
+    """Normal output is green and errors are red"""
+    terminal.append_output("ok")
+    terminal.append_output("bad", color="red")
+
+    document = terminal.terminal_display.document()
+    ok_block = document.findBlockByNumber(0)
+    bad_block = document.findBlockByNumber(1)
+    assert ok_block.begin().fragment().charFormat().foreground().color().name() == "#00ff00"
+    assert bad_block.begin().fragment().charFormat().foreground().color().name() == "#ff0000"
+
+
+def test_return_executes_builtin_command(terminal, qtbot):
+    """Pressing Enter in the command line runs the command and clears it"""
+    from PyQt5.QtCore import Qt
+
+    qtbot.keyClicks(terminal.command_input, "help")
+    qtbot.keyClick(terminal.command_input, Qt.Key_Return)
+
+    assert terminal.command_input.text() == ""
+    assert "$ help" in terminal.terminal_display.toPlainText()
+    assert "Available Commands:" in terminal.terminal_display.toPlainText()
+
+
+def test_split_utf8_output_is_decoded_intact(terminal, monkeypatch):
+    """Chunks are shown as-is and split multi-byte characters survive"""
+    from PyQt5.QtCore import QByteArray
+
+    encoded = "héllo\n".encode('utf-8')
+    reads = iter([QByteArray(encoded[:2]), QByteArray(encoded[2:])])
+    monkeypatch.setattr(terminal.process, "readAllStandardOutput", lambda: next(reads))
+
+    terminal.on_stdout()
+    terminal.on_stdout()
+    terminal._flush_output()
+
+    assert terminal.terminal_display.toPlainText() == "héllo\n"
+
+
+@pytest.mark.parametrize("command, argv", [
+    ("ls -la", ["ls", "-la"]),
+    ('echo "a b"', ["echo", "a b"]),
+    ("nmap -p 80 example.com", ["nmap", "-p", "80", "example.com"]),
+    ("ls *.py", None),
+    ("cat a | grep b", None),
+    ("echo $HOME", None),
+    ("cd /tmp", None),
+    ("time nmap -p 80 example.com", None),
+    ("pushd /tmp", None),
+    ("FOO=1 env", None),
+    ('echo "unterminated', None),
+])
+def test_direct_argv(command, argv):
+    """Only commands without shell syntax bypass bash"""
+    from app.gui.terminal_widget import _direct_argv
+
+    assert _direct_argv(command) == argv
+
+
+def test_simple_command_runs_without_shell(terminal, qtbot):
+    """A plain command is started directly and its output shown"""
+    terminal.command_input.setText("echo direct")
+    with qtbot.waitSignal(terminal.process.finished, timeout=5000):
+        terminal.execute_command()
+
+    assert terminal.process.program() == "echo"
+    terminal._flush_output()
+    assert "direct\n" in terminal.terminal_display.toPlainText()
+
+
+def test_missing_program_is_reported(terminal, qtbot):
+    """A direct command that cannot start is retried in bash, which reports it"""
+    terminal.command_input.setText("definitely-not-a-real-tool --help")
+    with qtbot.waitSignal(terminal.process.finished, timeout=5000):
+        terminal.execute_command()
+
+    terminal._flush_output()
+    assert terminal.process.program() == "bash"
+    text = terminal.terminal_display.toPlainText()
+    assert "definitely-not-a-real-tool: command not found" in text
+    assert "Process exited with code 127" in terminal.terminal_display.toPlainText()
+
+
+def test_builtin_keyword_runs_in_bash(terminal, qtbot):
+    """Shell keywords such as time are never started directly"""
+    from app.gui.terminal_widget import _direct_argv
+
+    assert _direct_argv("time echo hi") is None
+
+    terminal.command_input.setText("command -v bash")
+    with qtbot.waitSignal(terminal.process.finished, timeout=5000):
+        terminal.execute_command()
+
+    terminal._flush_output()
+    assert terminal.process.program() == "bash"
+    assert "bash\n" in terminal.terminal_display.toPlainText()
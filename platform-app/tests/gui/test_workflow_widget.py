@@ -0,0 +1,141 @@
+"""Tests for the workflow execution widget"""
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit
+
+from app.gui.workflow_widget import TaskDelegate, TaskListModel, WorkflowWidget
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    """Create QApplication instance for tests"""
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+
+def test_log_output_is_bounded_plain_text(qapp):
+    """The execution log keeps at most MAX_LOG_LINES plain-text lines"""
+    widget = WorkflowWidget()
+    assert isinstance(widget.output_text, QPlainTextEdit)
+
+    for i in range(widget.MAX_LOG_LINES + 50):
+        widget.log_output(f"line {i}")
+    widget._flush_log()
+
+    document = widget.output_text.document()
+    assert document.blockCount() == widget.MAX_LOG_LINES
+    assert document.firstBlock().text() == "line 50"
+    assert document.lastBlock().text() == f"line {widget.MAX_LOG_LINES + 49}"
+
+
+def test_task_results_are_logged_as_one_block(qapp):
+    """Multi-line results are inserted as separate lines in one edit"""
+    widget = WorkflowWidget()
+    widget.task_model.set_tasks([("task1", "Task 1")])
+    widget.log_output("start")
+
+    widget.on_task_completed("task1", {"data": {"hosts": ["a", "b"]}})
+    widget._flush_log()
+
+    assert widget.output_text.toPlainText().splitlines() == [
+        "start",
+        "[COMPLETED] task1",
+        'Results: {',
+        '  "hosts": [',
+        '    "a",',
+        '    "b"',
+        '  ]',
+        '}',
+    ]
+
+
+def test_log_block_into_empty_log(qapp):
+    """A block written to an empty log does not start with a blank line"""
+    widget = WorkflowWidget()
+    widget.log_output_block(["one", "two"])
+    widget._flush_log()
+
+    assert widget.output_text.toPlainText() == "one\ntwo"
+
+
+def test_log_output_is_coalesced(qapp, qtbot):
+    """Lines logged in a burst are written together by the flush timer"""
+    widget = WorkflowWidget()
+    widget.log_output("one")
+    widget.log_output("two")
+
+    assert widget.output_text.document().isEmpty()
+    assert widget._log_flush_timer.isActive()
+
+    qtbot.waitUntil(lambda: widget.output_text.toPlainText() == "one\ntwo", timeout=1000)
+    assert not widget._log_flush_timer.isActive()
+
+
+def test_start_workflow_uses_factory_result(qapp, monkeypatch):
+    """Any workflow the factory knows about is started, not just web_app_full"""
+    from types import SimpleNamespace
+    from unittest.mock import MagicMock
+    from app.gui import workflow_widget
+
+    worker_cls = MagicMock()
+    monkeypatch.setattr(workflow_widget, "WorkflowWorker", worker_cls)
+    widget = WorkflowWidget()
+
+    widget.start_workflow("subdomain_enum:example.com", SimpleNamespace(id=1))
+
+    workflow = worker_cls.call_args.args[0]
+    assert workflow.target == "example.com"
+    model = widget.task_model
+    assert [model.index(row).data(Qt.UserRole) for row in range(model.rowCount())] == [
+        task.task_id for task in workflow.tasks
+    ]
+    worker_cls.return_value.start.assert_called_once()
+
+
+def test_progress_counts_completed_and_failed_tasks(qapp):
+    """Each finished task advances the progress bar once"""
+    widget = WorkflowWidget()
+    widget.task_model.set_tasks((task_id, task_id.upper()) for task_id in ("a", "b", "c", "d"))
+
+    widget.on_task_completed("a", {})
+    assert widget.progress_bar.value() == 25
+
+    widget.on_task_failed("b", "boom")
+    assert widget.progress_bar.value() == 50
+
+    # Unknown tasks do not count
+    widget.on_task_failed("zzz", "boom")
+    assert widget.progress_bar.value() == 50
+
+
+def test_task_model_tracks_status_by_id(qapp):
+    """Status updates touch only the matching row"""
+    widget = WorkflowWidget()
+    model = widget.task_model
+    model.set_tasks([("a", "Amass"), ("b", "HTTPx")])
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, roles: changed.append(top.row()))
+
+    widget.on_task_started("b", "HTTPx")
+    widget.on_task_failed("b", "timed out")
+
+    assert changed == [1, 1]
+    assert model.task_status("a") == TaskListModel.PENDING
+    assert model.task_status("b") == TaskListModel.FAILED
+    assert model.index(1).data(Qt.ToolTipRole) == "timed out"
+    assert model.task_status("zzz") is None
+
+
+def test_task_rows_are_painted_by_delegate(qapp):
+    """Rows have a uniform height and paint for every status"""
+    widget = WorkflowWidget()
+    widget.resize(1000, 600)
+    widget.task_model.set_tasks((status, status.title()) for status in TaskDelegate.STATUS_STYLES)
+    for status in TaskDelegate.STATUS_STYLES:
+        widget.task_model.set_task_status(status, status)
+
+    view = widget.task_view
+    assert view.sizeHintForRow(0) == TaskDelegate.ROW_HEIGHT
+    assert not view.viewport().grab().isNull()
@@ -0,0 +1,135 @@
+"""Tests for authentication helpers"""
+import time
+
+import bcrypt
+import jwt
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import auth
+from app.core.auth import AuthManager, TOKEN_EXPIRE_SECONDS
+from app.core.config import settings
+from app.core.database import Base
+
+
+@pytest.fixture
+def auth_manager(monkeypatch):
+    """AuthManager backed by an in-memory database"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+    monkeypatch.setattr(auth, "SessionScoped", session)
+    monkeypatch.setattr(auth, "init_database", lambda: None)
+    monkeypatch.setattr(AuthManager, "_users_exist", False)
+    yield AuthManager()
+    session.remove()
+
+
+def _fast_hash(password: str) -> str:
+    """Hash with the minimum work factor to keep tests quick"""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=4)).decode('utf-8')
+
+
+def test_verify_password_batch_preserves_order(auth_manager):
+    """Batch verification returns one result per pair, in input order"""
+    good_hash = _fast_hash("correct-horse")
+    other_hash = _fast_hash("battery-staple")
+
+    items = [
+        ("correct-horse", good_hash),
+        ("wrong-password", good_hash),
+        ("battery-staple", other_hash),
+        ("correct-horse", other_hash),
+        ("battery-staple", other_hash),
+    ]
+
+    assert auth_manager.verify_password_batch(items) == [True, False, True, False, True]
+
+
+def test_verify_password_batch_small_inputs(auth_manager):
+    """Empty and single-item batches take the serial path"""
+    pw_hash = _fast_hash("password123")
+
+    assert auth_manager.verify_password_batch([]) == []
+    assert auth_manager.verify_password_batch([("password123", pw_hash)]) == [True]
+
+
+def test_first_boot_and_register(auth_manager):
+    """First boot is reported until a user exists"""
+    assert auth_manager.is_first_boot() is True
+
+    success, _ = auth_manager.register("alice", "password123")
+    assert success is True
+    assert auth_manager.is_first_boot() is False
+
+    success, message = auth_manager.register("alice", "password456")
+    assert success is False
+    assert message == "Username already exists"
+
+
+def test_authenticate(auth_manager):
+    """Valid credentials return a usable, detached user"""
+    auth_manager.register("bob", "password123")
+
+    user = auth_manager.authenticate("bob", "password123")
+    assert user is not None
+    assert user.username == "bob"
+    assert user.last_login is not None
+
+    # A second login within the write interval keeps the stored timestamp
+    again = auth_manager.authenticate("bob", "password123")
+    assert again.last_login == user.last_login
+
+    assert auth_manager.authenticate("bob", "wrong-password") is None
+    assert auth_manager.authenticate("nobody", "password123") is None
+
+
+def test_create_token(auth_manager):
+    """Tokens carry the user id and an integer expiry"""
+    before = int(time.time())
+    token = auth_manager.create_token(42)
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+    assert payload["user_id"] == 42
+    after = int(time.time())
+    assert before + TOKEN_EXPIRE_SECONDS <= payload["exp"] <= after + TOKEN_EXPIRE_SECONDS
+
+
+def test_create_token_matches_pyjwt(auth_manager, monkeypatch):
+    """Hand-built tokens are byte-identical to PyJWT's HS256 output"""
+    monkeypatch.setattr(auth.time, "time", lambda: 1700000000.5)
+    expected = jwt.encode(
+        {'user_id': 7, 'exp': 1700000000 + TOKEN_EXPIRE_SECONDS},
+        settings.SECRET_KEY,
+        algorithm='HS256'
+    )
+
+    assert auth_manager.create_token(7) == expected
+
+
+def test_first_boot_flag_is_cached(auth_manager, monkeypatch):
+    """After a user exists, first-boot checks skip the database"""
+    auth_manager.register("carol", "password123")
+
+    # Any database access would now fail
+    monkeypatch.setattr(auth, "SessionScoped", None)
+    assert auth_manager.is_first_boot() is False
+
+
+def test_salt_pool_produces_valid_unique_salts():
+    """Pooled salts are accepted by bcrypt and never repeat across refills"""
+    pool = auth._SaltPool()
+    count = pool.BUFFER_SIZE // pool.SALT_SIZE + 10
+    salts = {pool.gensalt(rounds=4) for _ in range(count)}
+    assert len(salts) == count
+
+    salt = pool.gensalt(rounds=4)
+    assert salt.startswith(b"$2b$04$") and len(salt) == 29
+    pw_hash = bcrypt.hashpw(b"password123", salt)
+    assert bcrypt.checkpw(b"password123", pw_hash)
@@ -0,0 +1,259 @@
+"""Tests for relational population of scan results"""
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import (
+    Base, Scan, Subdomain, IP, ASN, Port, _process_subdomain_data,
+    _subdomain_items_from_results
+)
+
+
+@pytest.fixture
+def db():
+    """In-memory database session"""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    scan = Scan(workflow_name="test", target="example.com")
+    session.add(scan)
+    session.commit()
+    yield session
+    session.close()
+
+
+SUBDOMAIN_DATA = [
+    {"name": "a.example.com", "ips": ["1.1.1.1", "2.2.2.2"], "asns": ["AS1"],
+     "ports": {"80": "http Apache 2.4", "443": "https"}, "source": "amass"},
+    {"name": "b.example.com", "ips": "2.2.2.2", "asns": ["AS1", "AS2"]},
+    {"name": "a.example.com", "ips": ["1.1.1.1"]},
+    {"ips": ["3.3.3.3"]},
+    "not-a-dict",
+]
+
+
+def test_process_subdomain_data_populates_tables(db):
+    """Subdomains, IPs, ASNs and ports are created once each"""
+    _process_subdomain_data(db, 1, SUBDOMAIN_DATA)
+    db.commit()
+
+    assert {s.name for s in db.query(Subdomain)} == {"a.example.com", "b.example.com"}
+    assert {ip.address for ip in db.query(IP)} == {"1.1.1.1", "2.2.2.2"}
+    assert {a.asn_number for a in db.query(ASN)} == {"AS1", "AS2"}
+
+    sub_a = db.query(Subdomain).filter(Subdomain.name == "a.example.com").one()
+    assert sub_a.source == "amass"
+    assert {ip.address for ip in sub_a.ips} == {"1.1.1.1", "2.2.2.2"}
+    assert {a.asn_number for a in sub_a.asns} == {"AS1"}
+
+    sub_b = db.query(Subdomain).filter(Subdomain.name == "b.example.com").one()
+    assert sub_b.source == "unknown"
+    assert {a.asn_number for a in sub_b.asns} == {"AS1", "AS2"}
+
+    # Two ports on each of a.example.com's two IPs
+    ports = db.query(Port).all()
+    assert len(ports) == 4
+    http = next(p for p in ports if p.port_number == 80)
+    assert http.service == "http"
+    assert http.version == "Apache 2.4"
+
+
+def test_process_subdomain_data_is_idempotent(db):
+    """Re-processing the same data does not duplicate rows or links"""
+    _process_subdomain_data(db, 1, SUBDOMAIN_DATA)
+    db.commit()
+    _process_subdomain_data(db, 1, SUBDOMAIN_DATA)
+    db.commit()
+
+    assert db.query(Subdomain).count() == 2
+    assert db.query(IP).count() == 2
+    assert db.query(ASN).count() == 2
+    assert db.query(Port).count() == 4
+
+    sub_a = db.query(Subdomain).filter(Subdomain.name == "a.example.com").one()
+    assert len(sub_a.ips) == 2
+
+
+def test_subdomain_items_from_results(db):
+    """Subdomain entries are extracted from task outputs in SQL"""
+    scan = db.query(Scan).first()
+    scan.results = json.dumps({
+        "subfinder": {"output": {"subdomains": [{"name": "a.example.com"}, "bare-string"]}},
+        "merge": {"output": {"merged_data": [{"name": "b.example.com", "ips": ["1.1.1.1"]}]}},
+        "nmap": {"output": {"hosts": [{"ip": "1.1.1.1"}]}},
+        "broken": "not-a-dict",
+    })
+    db.commit()
+
+    items = _subdomain_items_from_results(db, scan)
+
+    assert sorted(items, key=lambda i: i["name"]) == [
+        {"name": "a.example.com"},
+        {"name": "b.example.com", "ips": ["1.1.1.1"]},
+    ]
+
+
+def test_user_scans_must_be_loaded_explicitly(db):
+    """User.scans raises on lazy load but works with selectinload"""
+    from sqlalchemy.exc import InvalidRequestError
+    from sqlalchemy.orm import selectinload
+    from app.core.database import User
+
+    user = User(username="dave", password_hash="x")
+    db.add(user)
+    db.commit()
+    db.query(Scan).first().user_id = user.id
+    db.commit()
+    db.expire_all()
+
+    with pytest.raises(InvalidRequestError):
+        db.query(User).first().scans
+
+    db.expire_all()
+    loaded = db.query(User).options(selectinload(User.scans)).first()
+    assert len(loaded.scans) == 1
+
+
+def test_migrate_existing_scans_isolates_failures(monkeypatch, tmp_path):
+    """A scan that fails to migrate does not discard the others"""
+    from sqlalchemy.pool import StaticPool
+    from app.core import database
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+    monkeypatch.chdir(tmp_path)
+
+    session = database.SessionLocal()
+    session.add_all([
+        Scan(workflow_name="test", target="good.example.com", results=json.dumps({
+            "subfinder": {"output": {"subdomains": [{"name": "a.good.example.com"}]}}
+        })),
+        Scan(workflow_name="test", target="bad.example.com", results="{not json"),
+    ])
+    session.commit()
+    session.close()
+
+    database.migrate_existing_scans()
+
+    session = database.SessionLocal()
+    assert [s.name for s in session.query(Subdomain)] == ["a.good.example.com"]
+    session.close()
+
+
+def test_init_database_dedupes_and_indexes_old_tables(monkeypatch):
+    """Tables created before the unique indexes get them, duplicates merged"""
+    from sqlalchemy import inspect
+    from sqlalchemy.pool import StaticPool
+    from app.core import database
+    from app.core.database import subdomain_ip_association
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    # Simulate an older database without the composite indexes
+    for model in (Subdomain, IP, ASN, Port):
+        for index in model.__table__.indexes:
+            index.drop(bind=engine)
+    monkeypatch.setattr(database, "engine", engine)
+
+    with engine.begin() as conn:
+        conn.execute(Scan.__table__.insert(), [
+            {"id": 1, "workflow_name": "test", "target": "example.com"}
+        ])
+        conn.execute(Subdomain.__table__.insert(), [
+            {"id": 1, "scan_id": 1, "name": "a.example.com"},
+            {"id": 2, "scan_id": 1, "name": "a.example.com"},
+        ])
+        conn.execute(IP.__table__.insert(), [
+            {"id": 1, "scan_id": 1, "address": "1.1.1.1"},
+            {"id": 2, "scan_id": 1, "address": "1.1.1.1"},
+        ])
+        conn.execute(subdomain_ip_association.insert(), [{"subdomain_id": 2, "ip_id": 2}])
+        conn.execute(Port.__table__.insert(), [
+            {"id": 1, "scan_id": 1, "ip_id": 1, "port_number": 80, "protocol": "tcp"},
+            {"id": 2, "scan_id": 1, "ip_id": 2, "port_number": 80, "protocol": "tcp"},
+        ])
+
+    database.init_database()
+
+    for model in (Subdomain, IP, ASN, Port):
+        names = {index["name"] for index in inspect(engine).get_indexes(model.__tablename__)}
+        assert {index.name for index in model.__table__.indexes} <= names
+
+    session = sessionmaker(bind=engine)()
+    assert [s.id for s in session.query(Subdomain)] == [1]
+    assert [ip.id for ip in session.query(IP)] == [1]
+    assert [(p.id, p.ip_id) for p in session.query(Port)] == [(1, 1)]
+    assert list(session.execute(subdomain_ip_association.select())) == [(1, 1)]
+
+    # Re-running migration now skips the stored rows
+    data = [{"name": "a.example.com", "ips": ["1.1.1.1"], "ports": {"80": "http"}}]
+    _process_subdomain_data(session, 1, data)
+    session.commit()
+    _process_subdomain_data(session, 1, data)
+    session.commit()
+    assert session.query(Subdomain).count() == 1
+    assert session.query(IP).count() == 1
+    assert session.query(Port).count() == 1
+    session.close()
+
+
+def test_insert_ignore_without_on_conflict(db, monkeypatch):
+    """Dialects without ON CONFLICT skip stored keys with a SELECT"""
+    from app.core import database
+
+    monkeypatch.setattr(database, "_CONFLICT_INSERTS", {})
+
+    _process_subdomain_data(db, 1, SUBDOMAIN_DATA)
+    db.commit()
+    _process_subdomain_data(db, 1, SUBDOMAIN_DATA)
+    db.commit()
+
+    assert db.query(Subdomain).count() == 2
+    assert db.query(IP).count() == 2
+    assert db.query(ASN).count() == 2
+    assert db.query(Port).count() == 4
+
+
+def test_init_database_merges_links_to_duplicate_rows(monkeypatch, caplog):
+    """A subdomain linked to every copy of an IP keeps a single link"""
+    import logging
+    from sqlalchemy.pool import StaticPool
+    from app.core import database
+    from app.core.database import subdomain_ip_association
+
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    for model in (Subdomain, IP, ASN, Port):
+        for index in model.__table__.indexes:
+            index.drop(bind=engine)
+    monkeypatch.setattr(database, "engine", engine)
+
+    with engine.begin() as conn:
+        conn.execute(Scan.__table__.insert(), [
+            {"id": 1, "workflow_name": "test", "target": "example.com"}
+        ])
+        conn.execute(Subdomain.__table__.insert(), [
+            {"id": 1, "scan_id": 1, "name": "a.example.com"}
+        ])
+        conn.execute(IP.__table__.insert(), [
+            {"id": 1, "scan_id": 1, "address": "1.1.1.1"},
+            {"id": 2, "scan_id": 1, "address": "1.1.1.1"},
+            {"id": 3, "scan_id": 1, "address": "1.1.1.1"},
+        ])
+        conn.execute(subdomain_ip_association.insert(), [
+            {"subdomain_id": 1, "ip_id": 1},
+            {"subdomain_id": 1, "ip_id": 2},
+            {"subdomain_id": 1, "ip_id": 3},
+        ])
+
+    with caplog.at_level(logging.INFO, logger="app.core.database"):
+        database.init_database()
+
+    assert "Merged 2 duplicate rows in ips" in caplog.text
+    session = sessionmaker(bind=engine)()
+    assert list(session.execute(subdomain_ip_association.select())) == [(1, 1)]
+    assert [ip.address for ip in session.query(Subdomain).one().ips] == ["1.1.1.1"]
+    session.close()
@@ -3,6 +3,7 @@ Test logging infrastructure
 """
 import pytest
 import logging
+import logging.handlers
 import os
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -28,6 +29,49 @@ def test_logging_setup(tmp_path):
         assert (tmp_path / "logs" / "tools.log").exists()
 
 
+def test_logging_is_written_by_listener(tmp_path):
+    """Records are queued and written to the files by the listener thread"""
+    with patch('app.core.logging_config.settings') as mock_settings:
+        mock_settings.LOGS_DIR = tmp_path / "logs"
+        mock_settings.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+        LoggingConfig.setup_logging(level=logging.INFO)
+
+    root_handlers = logging.getLogger().handlers
+    assert len(root_handlers) == 1
+    assert isinstance(root_handlers[0], logging.handlers.QueueHandler)
+
+    logging.getLogger("test.listener").info("queued message")
+    LoggingConfig.shutdown_logging()
+
+    assert "queued message" in (tmp_path / "logs" / "platform.log").read_text()
+
+
+def test_records_are_routed_by_logger_name(tmp_path):
+    """Workflow and tool records reach their own files as well as platform.log"""
+    with patch('app.core.logging_config.settings') as mock_settings:
+        mock_settings.LOGS_DIR = tmp_path / "logs"
+        mock_settings.LOGS_DIR.mkdir(parents=True, exist_ok=True)
+
+        LoggingConfig.setup_logging(level=logging.INFO)
+
+    get_workflow_logger(scan_id=7).info("workflow message")
+    get_tool_logger("nmap").info("tool message")
+    logging.getLogger("test.routing").info("plain message")
+    LoggingConfig.shutdown_logging()
+
+    logs = tmp_path / "logs"
+    workflows_log = (logs / "workflows.log").read_text()
+    tools_log = (logs / "tools.log").read_text()
+    platform_log = (logs / "platform.log").read_text()
+
+    assert "[scan:7 task:N/A tool:N/A] | workflow message" in workflows_log
+    assert "tool:nmap] | tool message" in tools_log
+    assert "tool message" not in workflows_log
+    assert "plain message" not in workflows_log + tools_log
+    assert all(m in platform_log for m in ("workflow message", "tool message", "plain message"))
+
+
 def test_workflow_logger_with_context():
     """Test that workflow logger includes context"""
     logger = get_workflow_logger(scan_id=123, task_id="test_task", tool="nmap")
@@ -38,6 +82,17 @@ def test_workflow_logger_with_context():
     assert logger.extra['tool'] == "nmap"
 
 
+def test_context_loggers_are_cached():
+    """Same name and context return the same adapter instance"""
+    first = get_workflow_logger(scan_id=7, task_id="cached", tool="nmap")
+    second = get_workflow_logger(scan_id=7, task_id="cached", tool="nmap")
+    other = get_workflow_logger(scan_id=8, task_id="cached", tool="nmap")
+
+    assert first is second
+    assert first is not other
+    assert other.extra['scan_id'] == 8
+
+
 def test_tool_logger_with_context():
     """Test that tool logger includes context"""
     logger = get_tool_logger(tool_name="subfinder", task_id="recon_1")
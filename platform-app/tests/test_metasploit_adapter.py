@@ -120,3 +120,42 @@ def test_metasploit_parse_output_exploit():
     assert result["session_opened"] == True
     assert "sessions" in result
     assert len(result["sessions"]) >= 1
+
+
+def test_metasploit_parse_output_session_ids():
+    """Session ids come from the 'session N opened' line itself"""
+    adapter = MetasploitAdapter()
+
+    sample_output = (
+        "[*] Meterpreter session 1 opened (10.0.0.1:4444 -> 10.0.0.5:49152)\r\n"
+        "[*] Command shell SESSION 12 Opened (10.0.0.1:4445 -> 10.0.0.6:50000)\n"
+        "[*] Session 3 closed. Reason: Died\n"
+        "[-] Exploit completed, but no session was created."
+    )
+
+    result = adapter.parse_output(sample_output, "", 0)
+
+    assert result["session_opened"] is True
+    assert [session["id"] for session in result["sessions"]] == ["1", "12"]
+    assert result["sessions"][0]["info"].endswith("10.0.0.5:49152)")
+
+
+def test_metasploit_build_command_quotes_values():
+    """Option values with spaces or quotes are quoted; plain values are not"""
+    adapter = MetasploitAdapter()
+
+    cmd = adapter.build_command({
+        "module": "auxiliary/scanner/http/http_login",
+        "rhosts": "10.0.0.1 10.0.0.2",
+        "http_password": "it's",
+        "rport": 8080,
+        "timeout": 60
+    })
+
+    assert cmd[-1] == (
+        "use auxiliary/scanner/http/http_login; "
+        "set RHOSTS '10.0.0.1 10.0.0.2'; "
+        "set HTTP_PASSWORD 'it'\"'\"'s'; "
+        "set RPORT 8080; "
+        "run; exit"
+    )
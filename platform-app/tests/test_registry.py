@@ -29,3 +29,38 @@ def test_registry_get_new_tools():
 
     metasploit = registry.get_tool("metasploit")
     assert metasploit is not None
+
+
+def test_registry_reuses_tool_instances():
+    """get_tool hands out one shared instance per tool"""
+    registry = ToolRegistry()
+
+    assert registry.get_tool("nmap") is registry.get_tool("nmap")
+    with pytest.raises(ValueError):
+        registry.get_tool("not-a-tool")
+
+    # Listed metadata is a copy of the cache
+    nmap = next(t for t in registry.list_tools() if t["name"] == "nmap")
+    nmap["metadata"]["name"] = "changed"
+    nmap_entry = next(t for t in registry.list_tools() if t["name"] == "nmap")
+    assert nmap_entry["metadata"]["name"] == "nmap"
+
+
+def test_registry_imports_adapters_on_first_use():
+    """Only the adapters a caller asks for are imported"""
+    import subprocess
+    import sys
+
+    script = (
+        "import sys\n"
+        "from app.tools.registry import ToolRegistry\n"
+        "registry = ToolRegistry()\n"
+        "registry.get_tool('httpx')\n"
+        "loaded = sorted(m for m in sys.modules if m.startswith('app.tools.adapters.'))\n"
+        "print(','.join(loaded))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == "app.tools.adapters.httpx_adapter"
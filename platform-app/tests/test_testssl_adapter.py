@@ -117,3 +117,20 @@ def test_testssl_parse_output_empty():
 
     assert result["findings"] == []
     assert result["total_findings"] == 0
+
+
+def test_testssl_parse_output_other_severities():
+    """Severities outside the default buckets are counted, and bad JSON is ignored"""
+    adapter = TestsslAdapter()
+
+    sample_output = (
+        '[{"id": "scanProblem", "finding": "timeout", "severity": "WARN"}, {"id": "cert"}]'
+    )
+
+    result = adapter.parse_output(sample_output, "", 0)
+
+    assert result["severity_counts"]["WARN"] == 1
+    assert result["severity_counts"]["INFO"] == 1
+    assert [v["id"] for v in result["vulnerabilities"]] == ["scanProblem"]
+
+    assert adapter.parse_output("[{not json", "", 0)["findings"] == []
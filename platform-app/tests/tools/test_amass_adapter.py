@@ -0,0 +1,65 @@
+from app.tools.adapters.amass_adapter import AmassAdapter
+from app.utils.result_utils import wait_for_saves
+
+def test_amass_parse_output_merges_subdomains(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    adapter = AmassAdapter()
+    output = (
+        '{"name": "a.example.com", "addresses": [{"ip": "1.1.1.1", "asn": 13335}]}\n'
+        'not json\n'
+        '\n'
+        '{"name": "a.example.com", "addresses": [{"ip": "2.2.2.2", "asn": "AS13335"}]}\r\n'
+        '{"name": "b.example.com", "source": "crtsh"}'
+    )
+
+    result = adapter.parse_output(output, "", 0)
+
+    assert result["count"] == 2
+    sub_a, sub_b = sorted(result["subdomains"], key=lambda s: s["name"])
+    assert sorted(sub_a["ips"]) == ["1.1.1.1", "2.2.2.2"]
+    assert sub_a["asns"] == ["AS13335"]
+    assert sub_b == {"name": "b.example.com", "ips": [], "asns": [], "source": "crtsh"}
+    assert wait_for_saves(timeout=5)
+    assert (tmp_path / "data/scans/example.com/parsed/amass/results.json").exists()
+
+def _run_script(monkeypatch, adapter, script):
+    """Make the adapter run a Python snippet instead of amass"""
+    import sys
+    monkeypatch.setattr(adapter, "build_command", lambda params: [sys.executable, "-c", script])
+
+def test_amass_execute_streams_stdout(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    adapter = AmassAdapter()
+    assert adapter.metadata.streams_output
+    _run_script(monkeypatch, adapter, (
+        "import sys\n"
+        "for i in range(500):\n"
+        "    print('{\"name\": \"h%d.example.com\"}' % i)\n"
+        "sys.stderr.write('done')\n"
+    ))
+
+    result = adapter.execute({"domain": "example.com"})
+
+    assert result["success"]
+    assert result["data"]["count"] == 500
+    assert result["errors"] == "done"
+    assert wait_for_saves(timeout=5)
+    raw = (tmp_path / "data/scans/example.com/raw/amass/output.json").read_text()
+    assert raw.count("\n") == 500
+
+def test_amass_execute_stream_timeout(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    adapter = AmassAdapter()
+    _run_script(monkeypatch, adapter, "import time; print('{}', flush=True); time.sleep(30)")
+
+    result = adapter.execute({"domain": "example.com", "timeout": 0.5})
+
+    assert not result["success"]
+    assert "timed out" in result["error"]
+    assert result["execution_time"] < 10
+
+def test_metadata_is_built_once_per_class(monkeypatch):
+    first = AmassAdapter()
+    monkeypatch.setattr(AmassAdapter, "get_metadata", lambda self: 1 / 0)
+
+    assert AmassAdapter().metadata is first.metadata
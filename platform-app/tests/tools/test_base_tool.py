@@ -0,0 +1,88 @@
+"""Tests for BaseTool.execute_async"""
+import asyncio
+import itertools
+import sys
+import time
+
+from app.tools.base import BaseTool, ToolCategory, ToolMetadata
+
+
+class ScriptTool(BaseTool):
+    """Runs a Python snippet given as the 'script' parameter"""
+
+    def get_metadata(self) -> ToolMetadata:
+        return ToolMetadata(
+            name="script",
+            category=ToolCategory.RECONNAISSANCE,
+            description="Python snippet",
+            executable=sys.executable
+        )
+
+    def validate_parameters(self, params):
+        return "script" in params
+
+    def build_command(self, params):
+        return [self.metadata.executable, "-c", params["script"]]
+
+    def parse_output(self, output, stderr, return_code):
+        return {"lines": output.splitlines()}
+
+
+def test_execute_async_matches_execute():
+    """Both paths return the same parsed result"""
+    tool = ScriptTool()
+    params = {"script": "import sys; print('a'); print('b'); sys.stderr.write('warn'); sys.exit(3)"}
+
+    sync_result = tool.execute(params)
+    async_result = asyncio.run(tool.execute_async(params))
+
+    for result in (sync_result, async_result):
+        assert not result["success"]
+        assert result["return_code"] == 3
+        assert result["data"] == {"lines": ["a", "b"]}
+        assert result["errors"] == "warn"
+
+
+def test_execute_async_runs_tools_concurrently():
+    """Several tools awaited together overlap instead of queueing"""
+    params = {"script": "import time; time.sleep(0.5); print('done')"}
+
+    async def run_all():
+        return await asyncio.gather(*(ScriptTool().execute_async(params) for _ in range(4)))
+
+    start = time.monotonic()
+    results = asyncio.run(run_all())
+
+    assert all(result["data"] == {"lines": ["done"]} for result in results)
+    assert time.monotonic() - start < 1.8
+
+
+def test_execute_async_errors():
+    """Timeouts, missing executables and bad params are reported like execute()"""
+    tool = ScriptTool()
+
+    timed_out = asyncio.run(
+        tool.execute_async({"script": "import time; time.sleep(30)", "timeout": 0.3})
+    )
+    assert not timed_out["success"]
+    assert "timed out after 0.3 seconds" in timed_out["error"]
+
+    tool.build_command = lambda params: ["definitely-not-a-real-tool"]
+    missing = asyncio.run(tool.execute_async({"script": ""}))
+    assert missing["tool_missing"]
+
+    assert asyncio.run(tool.execute_async({}))["error"] == "Invalid parameters"
+
+
+def test_execution_time_ignores_wall_clock_jumps(monkeypatch):
+    """Durations come from the monotonic clock, not time.time()"""
+    from app.tools import base
+
+    # A wall clock that runs backwards on every read
+    clock = itertools.count(1_000_000.0, -1000.0)
+    monkeypatch.setattr(base.time, "time", lambda: next(clock))
+
+    result = ScriptTool().execute({"script": "pass"})
+
+    assert result["success"]
+    assert 0 < result["execution_time"] < 10
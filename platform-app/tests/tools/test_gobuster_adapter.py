@@ -0,0 +1,24 @@
+from app.tools.adapters.gobuster_adapter import GobusterAdapter
+
+def test_gobuster_parse_dir_output():
+    adapter = GobusterAdapter()
+    output = (
+        "===============================================================\n"
+        "Gobuster v3.6\n"
+        "[+] Url:                     http://example.com\n"
+        "===============================================================\n"
+        "/admin                (Status: 301) [Size: 178] [--> http://example.com/admin/]\n"
+        "/index.html           (Status: 200) [Size: 10918]\n"
+        "/old (Status: 403)\n"
+        "Found: www.example.com\n"
+    )
+
+    result = adapter.parse_output(output, "", 0)
+
+    assert result["findings"] == [
+        {"path": "/admin", "status": "301", "size": "178"},
+        {"path": "/index.html", "status": "200", "size": "10918"},
+        {"path": "/old", "status": "403", "size": ""},
+    ]
+    assert result["paths"] == ["/admin", "/index.html", "/old"]
+    assert result["total"] == 3
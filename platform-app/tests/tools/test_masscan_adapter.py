@@ -40,3 +40,20 @@ def test_masscan_parse_json_output():
     assert len(result["hosts"]) == 1
     assert result["hosts"][0]["ip"] == "192.168.1.1"
     assert len(result["hosts"][0]["ports"]) == 2
+
+def test_masscan_parse_json_array_output():
+    adapter = MasscanAdapter()
+    records = [
+        {"ip": "10.0.0.1", "ports": [{"port": 22, "proto": "tcp", "status": "open"}]},
+        {"ip": "10.0.0.2", "ports": [{"port": 80, "proto": "tcp", "status": "open",
+                                      "service": {"name": "http", "banner": "nginx"}}]},
+    ]
+    well_formed = json.dumps(records, indent=1)
+    # Older masscan releases leave a trailing comma after the last record
+    trailing_comma = "[\n" + ",\n".join(json.dumps(r) for r in records) + ",\n]\n"
+
+    for output in (well_formed, trailing_comma):
+        result = adapter.parse_output(output, "", 0)
+        assert [h["ip"] for h in result["hosts"]] == ["10.0.0.1", "10.0.0.2"]
+        assert result["hosts"][1]["ports"][0]["banner"] == "nginx"
+        assert result["total_ports"] == 2
@@ -200,3 +200,242 @@ def test_nmap_parse_invalid_xml():
     assert "error" in result
     assert result["hosts"] == []
     assert result["services"] == []
+
+
+def test_nmap_parse_output_real_layout():
+    """Hostnames, MAC addresses and script output are handled as nmap emits them"""
+    adapter = NmapAdapter()
+
+    xml_output = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap">
+<scaninfo type="syn" protocol="tcp"/>
+<hosthint><status state="up"/><address addr="10.0.0.5" addrtype="ipv4"/></hosthint>
+<host>
+<status state="up"/>
+<address addr="aa:bb:cc:dd:ee:ff" addrtype="mac"/>
+<address addr="10.0.0.5" addrtype="ipv4"/>
+<hostnames><hostname name="web.example.com" type="PTR"/></hostnames>
+<ports>
+<extraports state="closed" count="998"/>
+<port protocol="tcp" portid="443"><state state="open"/><service name="https" product="nginx"/>
+<script id="ssl-cert" output="..."><table key="subject">
+<elem key="commonName">web.example.com</elem>
+</table></script>
+</port>
+</ports>
+</host>
+<runstats><finished elapsed="1.0"/></runstats>
+</nmaprun>
+"""
+
+    result = adapter.parse_output(xml_output, "", 0)
+
+    assert result["hosts"] == [{
+        "ip": "10.0.0.5",
+        "hostname": "web.example.com",
+        "ports": [{
+            "port": 443, "protocol": "tcp", "service": "https", "product": "nginx", "version": ""
+        }]
+    }]
+    assert result["ip_port_map"] == {"10.0.0.5": {"443": "https"}}
+
+
+def test_nmap_hosts_are_released_while_parsing(monkeypatch):
+    """Processed hosts are detached from the document as parsing goes"""
+    from app.tools.adapters import nmap_adapter
+
+    seen = []
+    real_iterparse = nmap_adapter.ET.iterparse
+
+    def recording_iterparse(*args, **kwargs):
+        for event, elem in real_iterparse(*args, **kwargs):
+            seen.append(elem)
+            yield event, elem
+
+    monkeypatch.setattr(nmap_adapter.ET, "iterparse", recording_iterparse)
+
+    hosts_xml = "".join(
+        f'<host><address addr="10.0.{i // 256}.{i % 256}" addrtype="ipv4"/></host>'
+        for i in range(5000)
+    )
+    sizes = []
+    for host in NmapAdapter._iter_hosts(f"<nmaprun>{hosts_xml}</nmaprun>"):
+        root = host.getparent() if nmap_adapter.HAVE_LXML else seen[0]
+        sizes.append(len(root))
+
+    # Only the chunk the parser has read ahead is ever held
+    assert len(sizes) == 5000
+    assert max(sizes) < 1250
+
+
+def test_nmap_saves_results_and_updates_subdomains(monkeypatch, tmp_path):
+    """Results are written for the domain and ports merged into subdomains.json"""
+    import json
+    monkeypatch.chdir(tmp_path)
+    final_dir = tmp_path / "data/scans/example.com/final"
+    final_dir.mkdir(parents=True)
+    (final_dir / "subdomains.json").write_text(json.dumps([
+        {"name": "www.example.com", "ips": ["10.0.0.1"]},
+        {"name": "mail.example.com", "ips": "10.0.0.9"},
+    ]))
+
+    adapter = NmapAdapter()
+    monkeypatch.setattr(adapter, "_extract_domain_from_params", lambda: "example.com")
+    xml_output = """<?xml version="1.0"?>
+<nmaprun>
+    <host>
+        <address addr="10.0.0.1" addrtype="ipv4"/>
+        <ports>
+            <port protocol="tcp" portid="443">
+                <state state="open"/>
+                <service name="https" version="1.2"/>
+            </port>
+        </ports>
+    </host>
+</nmaprun>
+"""
+
+    adapter.parse_output(xml_output, "", 0)
+    NmapAdapter.flush_subdomain_ports()
+
+    scan_dir = tmp_path / "data/scans/example.com"
+    assert (scan_dir / "raw/nmap/output.xml").read_text() == xml_output
+    assert json.loads((scan_dir / "parsed/nmap/results.json").read_text())[0]["ip"] == "10.0.0.1"
+    www, mail = json.loads((final_dir / "subdomains.json").read_text())
+    assert www["ports"] == {"443": "https 1.2"}
+    assert "ports" not in mail
+
+
+def test_nmap_subdomains_update_skips_unchanged(monkeypatch, tmp_path):
+    """An unchanged subdomains.json is neither re-read nor rewritten"""
+    import json
+    from pathlib import Path
+    monkeypatch.chdir(tmp_path)
+    subdomains_file = tmp_path / "data/scans/example.com/final/subdomains.json"
+    subdomains_file.parent.mkdir(parents=True)
+    subdomains_file.write_text(json.dumps([{"name": "www.example.com", "ips": ["10.0.0.1"]}]))
+
+    adapter = NmapAdapter()
+    ports = {"10.0.0.1": {"22": "ssh"}}
+    adapter._update_subdomains_with_ports("example.com", ports)
+    NmapAdapter.flush_subdomain_ports()
+    assert json.loads(subdomains_file.read_text())[0]["ports"] == {"22": "ssh"}
+
+    io_calls = []
+    monkeypatch.setattr(Path, "read_bytes", lambda self: io_calls.append("read"))
+    monkeypatch.setattr(Path, "write_bytes", lambda self, data: io_calls.append("write"))
+    adapter._update_subdomains_with_ports("example.com", ports)
+    NmapAdapter.flush_subdomain_ports()
+    assert io_calls == []
+
+    # New ports are merged into the cached data and written out
+    adapter._update_subdomains_with_ports("example.com", {"10.0.0.1": {"80": "http"}})
+    NmapAdapter.flush_subdomain_ports()
+    assert io_calls == ["write"]
+
+
+def test_nmap_execute_parses_stdout_bytes(monkeypatch, tmp_path):
+    """nmap's XML streams from the pipe to the parser and disk without decoding"""
+    import sys
+    monkeypatch.chdir(tmp_path)
+    adapter = NmapAdapter()
+    assert adapter.metadata.bytes_output and adapter.metadata.streams_output
+
+    # Latin-1 hostname: decoding the pipe as UTF-8 would mangle it
+    xml_output = (
+        '<?xml version="1.0" encoding="ISO-8859-1"?>\n'
+        '<nmaprun><host><address addr="10.0.0.1" addrtype="ipv4"/>'
+        '<hostnames><hostname name="caf\xe9.example.com"/></hostnames>'
+        '<ports><port protocol="tcp" portid="22">'
+        '<state state="open"/><service name="ssh"/></port></ports>'
+        '</host></nmaprun>\n'
+    ).encode('latin-1')
+    script = f"import sys; sys.stdout.buffer.write({xml_output!r}); sys.stderr.write('warn')"
+    monkeypatch.setattr(adapter, "build_command", lambda params: [sys.executable, "-c", script])
+
+    result = adapter.execute({"domain": "example.com"})
+
+    assert result["success"]
+    # Parsed while streaming; the raw XML only goes to disk
+    assert result["raw_output"] == ""
+    assert result["errors"] == "warn"
+    assert result["data"]["hosts"][0]["hostname"] == "caf\xe9.example.com"
+    assert (tmp_path / "data/scans/example.com/raw/nmap/output.xml").read_bytes() == xml_output
+
+
+def test_nmap_stream_consumes_output_after_parse_error(monkeypatch, tmp_path):
+    """Malformed XML is reported, and nmap is not left blocked on a full pipe"""
+    import sys
+    monkeypatch.chdir(tmp_path)
+    adapter = NmapAdapter()
+    # Far more than a pipe buffer after the point where parsing fails
+    script = "import sys; sys.stdout.write('<nmaprun><host></nmaprun>' + 'x' * 2_000_000)"
+    monkeypatch.setattr(adapter, "build_command", lambda params: [sys.executable, "-c", script])
+
+    result = adapter.execute({"target": "10.0.0.1", "timeout": 20})
+
+    assert result["success"]
+    assert result["data"]["error"] == "Failed to parse nmap XML output"
+    assert result["execution_time"] < 10
+
+
+def test_nmap_subdomain_port_updates_are_coalesced(monkeypatch, tmp_path):
+    """Several runs are written once, onto the file as it is at flush time"""
+    import json
+    from pathlib import Path
+    monkeypatch.chdir(tmp_path)
+    subdomains_file = tmp_path / "data/scans/example.com/final/subdomains.json"
+    subdomains_file.parent.mkdir(parents=True)
+    subdomains_file.write_text(json.dumps([{"name": "www.example.com", "ips": ["10.0.0.1"]}]))
+
+    writes = []
+    real_write_bytes = Path.write_bytes
+    monkeypatch.setattr(
+        Path, "write_bytes",
+        lambda self, data: (writes.append(self), real_write_bytes(self, data))
+    )
+
+    adapter = NmapAdapter()
+    adapter._update_subdomains_with_ports("example.com", {"10.0.0.1": {"22": "ssh"}})
+    # Another writer replaces the file between nmap runs
+    subdomains_file.write_text(json.dumps([
+        {"name": "www.example.com", "ips": ["10.0.0.1"]},
+        {"name": "api.example.com", "ips": ["10.0.0.2"]},
+    ]))
+    adapter._update_subdomains_with_ports(
+        "example.com", {"10.0.0.1": {"80": "http"}, "10.0.0.2": {"443": "https"}}
+    )
+    assert writes == []
+
+    NmapAdapter.flush_subdomain_ports()
+
+    assert len(writes) == 1
+    www, api = json.loads(subdomains_file.read_text())
+    assert www["ports"] == {"22": "ssh", "80": "http"}
+    assert api["ports"] == {"443": "https"}
+
+
+def test_nmap_domain_is_scoped_to_each_run(monkeypatch, tmp_path):
+    """Concurrent runs on one adapter instance each see their own domain"""
+    import asyncio
+    import sys
+    monkeypatch.chdir(tmp_path)
+    adapter = NmapAdapter()
+    script = "import time; time.sleep(0.3); print('<nmaprun/>')"
+    monkeypatch.setattr(adapter, "build_command", lambda params: [sys.executable, "-c", script])
+    seen = []
+    monkeypatch.setattr(
+        adapter, "_build_result",
+        lambda *args: seen.append(adapter._extract_domain_from_params()) or {}
+    )
+
+    async def run_both():
+        await asyncio.gather(
+            adapter.execute_async({"domain": "a.example"}),
+            adapter.execute_async({"domain": "b.example"}),
+        )
+
+    asyncio.run(run_both())
+
+    assert sorted(seen) == ["a.example", "b.example"]
+    assert adapter._extract_domain_from_params() is None
@@ -0,0 +1,14 @@
+from pathlib import Path
+
+from app.tools.adapters.nuclei_adapter import NucleiAdapter
+
+def test_nuclei_url_lists_share_scratch_dir():
+    adapter = NucleiAdapter()
+    first = adapter.build_command({"urls": ["http://a.example.com", "http://b.example.com"]})
+    second = adapter.build_command({"urls": ["http://c.example.com"]})
+
+    first_list = Path(first[first.index("-list") + 1])
+    second_list = Path(second[second.index("-list") + 1])
+    assert first_list != second_list
+    assert first_list.parent == second_list.parent
+    assert first_list.read_text() == "http://a.example.com\nhttp://b.example.com"
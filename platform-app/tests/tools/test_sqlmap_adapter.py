@@ -0,0 +1,43 @@
+from app.tools.adapters.sqlmap_adapter import SqlmapAdapter
+
+def test_sqlmap_parse_output():
+    adapter = SqlmapAdapter()
+    output = (
+        "Parameter: id (GET) is vulnerable. Do you want to keep testing the others? [y/N] N\n"
+        "    Type: UNION query\n"
+        "    Type: time-based blind\n"
+        "    Type: boolean-based blind\n"
+        "Parameter: q (POST) is vulnerable. Do you want to keep testing the others? [y/N] N\n"
+        "available databases [2]:\n"
+        "[*] information_schema\n"
+        "[*] shop\n"
+        "\n"
+    )
+
+    result = adapter.parse_output(output, "", 0)
+
+    assert [v["parameter"] for v in result["vulnerabilities"]] == ["id", "q"]
+    assert result["vulnerable"] is True
+    # Report order, not order of appearance
+    assert result["injection_types"] == ["Boolean-based blind", "Time-based blind", "UNION query"]
+    assert result["databases"] == ["information_schema", "shop"]
+
+def test_sqlmap_parse_databases_block():
+    adapter = SqlmapAdapter()
+    output = (
+        "[*] starting @ 12:00:00\n"
+        "[12:00:05] [INFO] fetching database names\n"
+        "available databases [3]:\r\n"
+        "[*] information_schema\r\n"
+        "[12:00:06] [WARNING] reflective value(s) found\n"
+        "  [*] my db  \n"
+        "[*] \n"
+        "[*] shop"
+    )
+
+    databases = adapter.parse_output(output, "", 0)["databases"]
+    assert databases == ["information_schema", "my db", "shop"]
+    # Only bracketed lines directly after the header belong to the list
+    empty = adapter.parse_output("available databases [1]:\n\n[*] shutting down\n", "", 0)
+    assert empty["databases"] == []
+    assert adapter.parse_output("[*] ending @ 12:00:09\n", "", 0)["databases"] == []
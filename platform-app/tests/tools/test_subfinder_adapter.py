@@ -0,0 +1,25 @@
+"""Tests for Subfinder adapter parsing"""
+from app.tools.adapters.subfinder_adapter import SubfinderAdapter
+
+
+def test_subfinder_parse_output_merges_hosts(monkeypatch):
+    """Repeated hosts are merged into one entry with unique IPs"""
+    adapter = SubfinderAdapter()
+    monkeypatch.setattr(adapter, "_save_results", lambda *args: None)
+
+    output = "\n".join([
+        '{"host":"www.example.com","ip":"1.1.1.1","source":"crtsh"}',
+        '{"host":"api.example.com","source":"dnsdumpster"}',
+        'not json',
+        '{"host":"www.example.com","ip":["1.1.1.1","2.2.2.2"],"source":"virustotal"}',
+        '{"ip":"3.3.3.3"}',
+    ])
+
+    result = adapter.parse_output(output, "", 0)
+
+    assert result["count"] == 2
+    www, api = result["subdomains"]
+    assert www["name"] == "www.example.com"
+    assert www["ips"] == ["1.1.1.1", "2.2.2.2"]
+    assert www["source"] == "crtsh"
+    assert api == {"name": "api.example.com", "ips": [], "source": "dnsdumpster"}
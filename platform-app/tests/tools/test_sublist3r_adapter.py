@@ -26,3 +26,15 @@ def test_sublist3r_parse_output():
     assert "subdomains" in result
     assert len(result["subdomains"]) == 3
     assert result["subdomains"][0]["name"] == "www.example.com"
+
+def test_sublist3r_parse_output_dedupes_in_order(monkeypatch):
+    adapter = Sublist3rAdapter()
+    monkeypatch.setattr(adapter, "_save_results", lambda *args: None)
+    output = (
+        "[-] Enumerating subdomains now\nwww.example.com\nmail.example.com\n"
+        "  www.example.com  \n\napi.example.com\n"
+    )
+    result = adapter.parse_output(output, "", 0)
+    assert [s["name"] for s in result["subdomains"]] == [
+        "www.example.com", "mail.example.com", "api.example.com"
+    ]
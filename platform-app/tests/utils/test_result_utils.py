@@ -1,11 +1,16 @@
 import pytest
+import json
 from app.utils.result_utils import (
+    collapse_covered_subdomains,
     deduplicate_subdomains,
     merge_subdomain_lists,
     save_list_to_file,
     load_list_from_file,
     extract_ips_from_results,
-    extract_subdomains_from_results
+    extract_subdomains_from_results,
+    save_results,
+    save_results_async,
+    wait_for_saves
 )
 
 def test_deduplicate_subdomains():
@@ -22,6 +27,24 @@ def test_deduplicate_subdomains():
     www_entry = next(s for s in result if s["name"] == "www.example.com")
     assert set(www_entry["ips"]) == {"1.1.1.1", "3.3.3.3"}
 
+def test_deduplicate_subdomains_merges_in_order():
+    subdomains = [
+        {"name": "www.example.com", "ips": ["1.1.1.1"], "source": "amass"},
+        {"name": "www.example.com", "ips": ["3.3.3.3", "1.1.1.1"], "source": "subfinder"},
+        {"name": "www.example.com", "ips": ["2.2.2.2"], "source": "amass"},
+        {"name": "mail.example.com", "ips": ["4.4.4.4"]},
+    ]
+
+    result = deduplicate_subdomains(subdomains, merge_ips=True)
+
+    assert result == [
+        {"name": "www.example.com", "ips": ["1.1.1.1", "3.3.3.3", "2.2.2.2"],
+         "source": "amass,subfinder"},
+        {"name": "mail.example.com", "ips": ["4.4.4.4"]},
+    ]
+    # Inputs are left untouched
+    assert subdomains[0] == {"name": "www.example.com", "ips": ["1.1.1.1"], "source": "amass"}
+
 def test_merge_subdomain_lists():
     list1 = [{"name": "www.example.com", "ips": ["1.1.1.1"], "source": "amass"}]
     list2 = [{"name": "mail.example.com", "ips": ["2.2.2.2"], "source": "subfinder"}]
@@ -128,3 +151,109 @@ def test_extract_subdomains_from_results_custom_key():
 
     subdomains = extract_subdomains_from_results(results, key="domains")
     assert subdomains == ["www.example.com", "mail.example.com"]
+
+def test_save_results_async(tmp_path):
+    import io
+    parsed = [{"name": "www.example.com"}]
+    raw = io.StringIO("line1\nline2\n")
+
+    future = save_results_async(
+        raw, tmp_path / "raw" / "out.json", parsed, tmp_path / "parsed" / "results.json"
+    )
+    # Later changes do not leak into the queued write
+    parsed.append({"name": "late.example.com"})
+
+    assert wait_for_saves(timeout=5)
+    assert future.result() is True
+    assert raw.closed
+    assert (tmp_path / "raw" / "out.json").read_text() == "line1\nline2\n"
+    parsed_text = (tmp_path / "parsed" / "results.json").read_text()
+    assert json.loads(parsed_text) == [{"name": "www.example.com"}]
+
+def test_save_results_async_recreates_removed_dirs(tmp_path):
+    import shutil
+    raw_file = tmp_path / "scans" / "raw" / "out.json"
+    parsed_file = tmp_path / "scans" / "parsed" / "results.json"
+
+    assert save_results_async("first", raw_file, [], parsed_file).result() is True
+    shutil.rmtree(tmp_path / "scans")
+
+    assert save_results_async("second", raw_file, [1], parsed_file).result() is True
+    assert raw_file.read_text() == "second"
+    assert json.loads(parsed_file.read_text()) == [1]
+
+def test_save_results_creates_dirs_once(tmp_path, monkeypatch):
+    from pathlib import Path
+    raw_file = tmp_path / "scans" / "raw" / "tool" / "output.txt"
+    parsed_file = tmp_path / "scans" / "parsed" / "tool" / "results.json"
+    assert save_results("run 0\n", raw_file, {"run": 0}, parsed_file) is True
+
+    # Later saves to the same directories make no mkdir calls
+    mkdirs = []
+    monkeypatch.setattr(Path, "mkdir", lambda self, *a, **kw: mkdirs.append(self))
+    assert save_results("run 1\n", raw_file, {"run": 1}, parsed_file) is True
+
+    assert mkdirs == []
+    assert raw_file.read_text() == "run 1\n"
+    assert json.loads(parsed_file.read_text()) == {"run": 1}
+
+
+def test_merge_subdomain_lists_accepts_generators():
+    lists = (
+        (entry for entry in sublist)
+        for sublist in (
+            [{"name": "a.example.com", "ips": ["1.1.1.1"]}],
+            [{"name": "a.example.com", "ips": ["2.2.2.2"]}, {"name": "b.example.com", "ips": []}],
+        )
+    )
+
+    result = merge_subdomain_lists(lists)
+
+    assert result == [
+        {"name": "a.example.com", "ips": ["1.1.1.1", "2.2.2.2"]},
+        {"name": "b.example.com", "ips": []},
+    ]
+
+
+def test_collapse_covered_subdomains():
+    names = [
+        "a.b.example.com",
+        "example.com",
+        "example-cdn.com",
+        "x.example-cdn.com",
+        "b.example.com",
+        "other.org",
+        "example.com",
+    ]
+
+    assert collapse_covered_subdomains(names) == ["example.com", "example-cdn.com", "other.org"]
+
+
+def test_collapse_covered_subdomains_keeps_lookalike_siblings():
+    """A name is only covered at a label boundary"""
+    names = ["api.example.com", "api-v2.example.com", "v1.api.example.com"]
+
+    assert collapse_covered_subdomains(names) == ["api.example.com", "api-v2.example.com"]
+
+
+def test_merge_subdomain_lists_collapse_covered():
+    list1 = [{"name": "dev.example.com", "ips": ["1.1.1.1"]}]
+    list2 = [
+        {"name": "api.dev.example.com", "ips": ["2.2.2.2"]},
+        {"name": "www.example.com", "ips": []},
+    ]
+
+    assert len(merge_subdomain_lists([list1, list2])) == 3
+    assert merge_subdomain_lists([list1, list2], collapse_covered=True) == [
+        {"name": "dev.example.com", "ips": ["1.1.1.1"]},
+        {"name": "www.example.com", "ips": []},
+    ]
+
+
+def test_save_results_logs_failures(tmp_path, caplog):
+    """A failed write returns False and says why"""
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+
+    assert save_results("raw", blocker / "raw.txt", {}, tmp_path / "parsed.json") is False
+    assert "Failed to save results" in caplog.text
@@ -145,6 +145,8 @@ def test_execute_processor_task_integration(
 
     # Directly call _execute_processor_task with our mock processor
     result = worker._execute_processor_task(task_def, mock_processor)
+    # Task record updates are written by the scheduler in batches
+    worker._flush_task_updates()
 
     # Verify success
     assert result is True
@@ -234,6 +236,8 @@ def test_execute_processor_task_failure(
     # Execute failing processor task
     task_def = workflow.tasks[0]
     result = worker._execute_processor_task(task_def, mock_processor)
+    # Task record updates are written by the scheduler in batches
+    worker._flush_task_updates()
 
     # Verify failure
     assert result is False
@@ -298,6 +302,8 @@ def test_execute_processor_task_exception(
     # Execute task that raises exception
     task_def = workflow.tasks[0]
     result = worker._execute_processor_task(task_def, mock_processor)
+    # Task record updates are written by the scheduler in batches
+    worker._flush_task_updates()
 
     # Verify failure
     assert result is False
@@ -356,3 +362,62 @@ def test_processor_routing():
     assert workflow.tasks[1].task_type == TaskType.WEB_CRAWL
     assert workflow.tasks[2].task_type == TaskType.EXPLOIT_LOOKUP
     assert workflow.tasks[3].task_type == TaskType.JSON_AGGREGATE
+
+
+def test_scan_results_json_matches_task_results():
+    """Results serialized per task join into the same object json.dumps built"""
+    from app.workflows.schemas import TaskResult, TaskStatus
+
+    workflow = WorkflowDefinition(
+        workflow_id="test_results",
+        name="Test Results",
+        target="example.com",
+        tasks=[WorkflowTask(task_id="dummy", name="Dummy", tool="echo", task_type=TaskType.TOOL)]
+    )
+    worker = WorkflowWorker(workflow, user_id=1)
+    worker._store_result(TaskResult(
+        task_id="a", status=TaskStatus.COMPLETED, output={"hosts": ["é.example.com"]}
+    ))
+    worker._store_result(TaskResult(task_id="b", status=TaskStatus.FAILED, errors=["boom"]))
+
+    expected = json.dumps({k: v.dict() for k, v in worker.task_results.items()})
+    assert json.loads(worker._scan_results_json()) == json.loads(expected)
+    assert list(json.loads(worker._scan_results_json())) == ["a", "b"]
+
+
+def test_substitute_parameters_resolves_references():
+    """References are resolved at any depth; plain values pass through"""
+    from app.workflows.schemas import TaskResult, TaskStatus
+
+    workflow = WorkflowDefinition(
+        workflow_id="test_substitution",
+        name="Test Substitution",
+        target="example.com",
+        tasks=[WorkflowTask(task_id="dummy", name="Dummy", tool="echo", task_type=TaskType.TOOL)]
+    )
+    worker = WorkflowWorker(workflow, user_id=1)
+    worker._store_result(TaskResult(
+        task_id="recon",
+        status=TaskStatus.COMPLETED,
+        output={"subdomains": {"unique": ["a.example.com"]}, "count": 1}
+    ))
+
+    params = worker._substitute_parameters({
+        "targets": "${recon.subdomains.unique}",
+        "whole": "${recon}",
+        "missing_path": "${recon.nope}",
+        "missing_task": "${other.subdomains}",
+        "plain": "$HOME",
+        "nested": {"count": "${recon.count}"},
+        "items": [{"count": "${recon.count}"}, "${recon.count}", 3],
+    })
+
+    assert params == {
+        "targets": ["a.example.com"],
+        "whole": {"subdomains": {"unique": ["a.example.com"]}, "count": 1},
+        "missing_path": [],
+        "missing_task": [],
+        "plain": "$HOME",
+        "nested": {"count": 1},
+        "items": [{"count": 1}, "${recon.count}", 3],
+    }
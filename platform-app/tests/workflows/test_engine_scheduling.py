@@ -0,0 +1,136 @@
+"""Tests for concurrent task scheduling in WorkflowWorker"""
+import threading
+import time
+
+from app.workflows.engine import WorkflowWorker
+from app.workflows.schemas import WorkflowDefinition, WorkflowTask, TaskType
+
+
+def _workflow(max_parallel_tasks=5):
+    """Three independent probes and a task that depends on two of them"""
+    return WorkflowDefinition(
+        workflow_id="test_scheduling",
+        name="Test Scheduling",
+        target="example.com",
+        max_parallel_tasks=max_parallel_tasks,
+        tasks=[
+            WorkflowTask(task_id="amass", name="Amass", tool="amass", task_type=TaskType.TOOL),
+            WorkflowTask(task_id="httpx", name="HTTPx", tool="httpx", task_type=TaskType.TOOL),
+            WorkflowTask(
+                task_id="gobuster", name="Gobuster", tool="gobuster", task_type=TaskType.TOOL
+            ),
+            WorkflowTask(
+                task_id="merge",
+                name="Merge",
+                task_type=TaskType.MERGE,
+                depends_on=["amass", "httpx"]
+            ),
+        ]
+    )
+
+
+def _run(worker, fail=()):
+    """Run the scheduler with a fake task executor that records overlap"""
+    lock = threading.Lock()
+    state = {"running": set(), "peak": 0, "order": [], "overlaps": []}
+
+    def fake_execute(task_def):
+        with lock:
+            state["running"].add(task_def.task_id)
+            state["peak"] = max(state["peak"], len(state["running"]))
+            state["order"].append(task_def.task_id)
+            state["overlaps"].append(set(state["running"]))
+        time.sleep(0.05)
+        with lock:
+            state["running"].discard(task_def.task_id)
+        return task_def.task_id not in fail
+
+    worker._execute_task = fake_execute
+    worker._execute_workflow()
+    return state
+
+
+def test_independent_tasks_overlap(monkeypatch):
+    """Ready tasks share the pool and dependents wait for their inputs"""
+    monkeypatch.setattr("app.workflows.engine.os.cpu_count", lambda: 4)
+    state = _run(WorkflowWorker(_workflow(), user_id=1))
+
+    assert state["peak"] == 3
+    assert state["order"][-1] == "merge"
+
+
+def test_max_parallel_tasks_limits_pool(monkeypatch):
+    """max_parallel_tasks=1 keeps the workflow sequential"""
+    monkeypatch.setattr("app.workflows.engine.os.cpu_count", lambda: 4)
+    state = _run(WorkflowWorker(_workflow(max_parallel_tasks=1), user_id=1))
+
+    assert state["peak"] == 1
+    assert len(state["order"]) == 4
+
+
+def test_failed_dependency_skips_dependents():
+    """Dependents of a failed task are reported as failed without running"""
+    worker = WorkflowWorker(_workflow(), user_id=1)
+    skipped = []
+    worker.task_failed.connect(lambda task_id, error: skipped.append(task_id))
+
+    state = _run(worker, fail={"httpx"})
+
+    assert "merge" not in state["order"]
+    assert skipped == ["merge"]
+
+
+def test_serial_only_tools_run_alone(monkeypatch):
+    """A tool without parallel support never overlaps other tasks"""
+    monkeypatch.setattr("app.workflows.engine.os.cpu_count", lambda: 4)
+    worker = WorkflowWorker(_workflow(), user_id=1)
+    monkeypatch.setattr(worker, "_supports_parallel", lambda task: task.task_id != "httpx")
+
+    state = _run(worker)
+
+    assert state["peak"] == 2
+    assert all(running == {"httpx"} for running in state["overlaps"] if "httpx" in running)
+
+
+def test_failure_skips_transitive_dependents():
+    """Tasks further downstream of a failure are skipped too"""
+    workflow = _workflow(max_parallel_tasks=1)
+    workflow.tasks.append(WorkflowTask(
+        task_id="report",
+        name="Report",
+        task_type=TaskType.MERGE,
+        depends_on=["merge"]
+    ))
+    worker = WorkflowWorker(workflow, user_id=1)
+    skipped = []
+    worker.task_failed.connect(lambda task_id, error: skipped.append(task_id))
+
+    state = _run(worker, fail={"amass"})
+
+    assert state["order"] == ["amass", "httpx", "gobuster"]
+    assert skipped == ["merge", "report"]
+
+
+def test_ready_tasks_start_by_priority(monkeypatch):
+    """Higher priority ready tasks start first, ties in definition order"""
+    monkeypatch.setattr("app.workflows.engine.os.cpu_count", lambda: 4)
+    workflow = _workflow(max_parallel_tasks=1)
+    workflow.tasks[2].priority = 5
+
+    state = _run(WorkflowWorker(workflow, user_id=1))
+
+    assert state["order"] == ["gobuster", "amass", "httpx", "merge"]
+
+
+def test_heavy_scanners_run_alone(monkeypatch):
+    """nmap and masscan never overlap with other tasks"""
+    monkeypatch.setattr("app.workflows.engine.os.cpu_count", lambda: 4)
+    workflow = _workflow()
+    workflow.tasks[1].tool = "nmap"
+    workflow.tasks[2].tool = "masscan"
+
+    state = _run(WorkflowWorker(workflow, user_id=1))
+
+    for overlap in state["overlaps"]:
+        if overlap & {"httpx", "gobuster"}:
+            assert len(overlap) == 1